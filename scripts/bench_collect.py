@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Benchmark collect_data.py phase by phase on synthetic Cricsheet data.
+
+Fully offline: a seeded generator writes Cricsheet-schema ZIPs
+({format}_json.zip with info / registry / innings → overs → deliveries)
+and a people.csv into scripts/bench_data/, once per (matches, formats,
+seed). Each run then times the phases collect_data.main() runs:
+
+    load_people_register → process_all_matches → classify_roles
+                         → assign_trophies → filter_and_output
+
+Every run happens in a fresh subprocess, so peak RSS is that run's own.
+Each phase records wall time, CPU time (pool workers' CPU separately, as
+child_cpu_s) and the RSS high-water mark when it ended. That mark only
+ever grows, so it shows where peak memory was reached, not what each
+phase used by itself. process_all_matches also records matches/s and
+deliveries/s. Results are written as JSON.
+--compare takes an earlier results file: any phase whose median wall time
+grew by more than --tolerance (and at least 10 ms) is reported as a
+regression, and the exit status is 1.
+
+Usage:
+    python scripts/bench_collect.py [--matches 300] [--formats tests,odis,t20s,ipl]
+                                    [--repeat 3] [--workers 1] [--stream]
+                                    [--engine python|numpy] [--out bench.json]
+                                    [--compare baseline.json] [--tolerance 0.1]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:     # Windows: no peak RSS
+    resource = None
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BENCH_DIR = SCRIPT_DIR / "bench_data"
+BENCH_VERSION = 2
+MIN_REGRESSION_S = 0.01     # ignore slowdowns smaller than this (timer noise on tiny phases)
+
+FORMATS = ("tests", "odis", "t20s", "ipl")
+PHASES = ("load_people_register", "process_all_matches", "classify_roles",
+          "assign_trophies", "filter_and_output")
+
+# ── Synthetic Cricsheet data ──
+
+COUNTRIES = ["India", "Australia", "England", "South Africa", "New Zealand",
+             "Pakistan", "Sri Lanka", "West Indies", "Bangladesh", "Afghanistan"]
+IPL_TEAMS = ["Mumbai Indians", "Chennai Super Kings", "Royal Challengers Bangalore",
+             "Kolkata Knight Riders", "Delhi Capitals", "Sunrisers Hyderabad",
+             "Rajasthan Royals", "Punjab Kings", "Gujarat Titans", "Lucknow Super Giants"]
+FINALS = {
+    "tests": "ICC World Test Championship",
+    "odis":  "ICC Cricket World Cup",
+    "t20s":  "ICC World Twenty20",
+    "ipl":   "Indian Premier League",
+}
+INNINGS = {"tests": 4, "odis": 2, "t20s": 2, "ipl": 2}
+OVERS = {"tests": (60, 110), "odis": (40, 50), "t20s": (16, 20), "ipl": (16, 20)}
+SQUAD = 30
+WICKET_KINDS = ["bowled", "caught", "caught", "caught", "lbw", "run out",
+                "stumped", "caught and bowled"]
+RUNS = [0, 0, 0, 1, 1, 1, 2, 3, 4, 4, 6]
+
+
+def _squads(rng):
+    """{country: [(name, cricsheet id), ...]}"""
+    squads = {}
+    n = 0
+    for country in COUNTRIES:
+        squad = []
+        for _ in range(SQUAD):
+            n += 1
+            squad.append((f"{chr(65 + n % 26)}{chr(65 + n // 26 % 26)} Player{n}",
+                          f"{rng.getrandbits(32):08x}"))
+        squads[country] = squad
+    return squads
+
+
+def _innings(rng, fmt, team, batting, bowling):
+    overs = []
+    out = 0
+    for o in range(rng.randint(*OVERS[fmt])):
+        bowler = bowling[6 + o % 5][0]
+        deliveries = []
+        for _ in range(6):
+            if out >= 10:
+                break
+            striker = batting[min(out, 10)][0]
+            runs = rng.choice(RUNS)
+            d = {"batter": striker, "bowler": bowler, "non_striker": batting[min(out + 1, 10)][0],
+                 "runs": {"batter": runs, "extras": 0, "total": runs}}
+            if rng.random() < 0.03:
+                d["extras"] = {"wides": 1}
+                d["runs"] = {"batter": 0, "extras": 1, "total": 1}
+            elif rng.random() < 0.035:
+                kind = rng.choice(WICKET_KINDS)
+                wicket = {"kind": kind, "player_out": striker}
+                if kind == "stumped":
+                    wicket["fielders"] = [{"name": bowling[0][0]}]     # the keeper
+                elif kind in ("caught", "run out"):
+                    wicket["fielders"] = [{"name": rng.choice(bowling)[0]}]
+                d["wickets"] = [wicket]
+                out += 1
+            deliveries.append(d)
+        overs.append({"over": o, "deliveries": deliveries})
+        if out >= 10:
+            break
+    return {"team": team, "overs": overs}
+
+
+def synthetic_match(rng, fmt, squads, ipl_squads):
+    """One Cricsheet-schema match; returns (match dict, deliveries)."""
+    teams, pool = (IPL_TEAMS, ipl_squads) if fmt == "ipl" else (COUNTRIES, squads)
+    t1, t2 = rng.sample(teams, 2)
+    # Keep squad order, so batting order and the keeper (first) stay stable
+    xi1 = sorted(rng.sample(pool[t1], 11), key=pool[t1].index)
+    xi2 = sorted(rng.sample(pool[t2], 11), key=pool[t2].index)
+    innings = [_innings(rng, fmt, *((t1, xi1, xi2) if k % 2 == 0 else (t2, xi2, xi1)))
+               for k in range(INNINGS[fmt])]
+    year = rng.randint(2008, 2024)
+    info = {
+        "dates": [f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"],
+        "gender": "male",
+        "match_type": {"tests": "Test", "odis": "ODI", "t20s": "T20", "ipl": "T20"}[fmt],
+        "teams": [t1, t2],
+        "players": {t1: [p[0] for p in xi1], t2: [p[0] for p in xi2]},
+        "registry": {"people": {name: pid for name, pid in xi1 + xi2}},
+        "outcome": {"winner": rng.choice([t1, t2])},
+    }
+    if rng.random() < 0.02:
+        info["event"] = {"name": FINALS[fmt], "stage": "Final"}
+    match = {"meta": {"data_version": "1.1.0", "revision": 1}, "info": info, "innings": innings}
+    return match, sum(len(o["deliveries"]) for inn in innings for o in inn["overs"])
+
+
+def generate_fixture(path, matches, formats, seed):
+    """Write the ZIPs + people.csv into `path`; returns the fixture's meta."""
+    rng = random.Random(seed)
+    squads = _squads(rng)
+    everyone = [p for squad in squads.values() for p in squad]
+    ipl_squads = {team: rng.sample(everyone, 25) for team in IPL_TEAMS}
+
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / "people.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["identifier", "name", "unique_name", "key_cricinfo"])
+        for k, (name, pid) in enumerate(everyone):
+            writer.writerow([pid, name, name, str(100000 + k)])
+
+    deliveries = {}
+    for fmt in formats:
+        deliveries[fmt] = 0
+        with zipfile.ZipFile(path / f"{fmt}_json.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+            for k in range(matches):
+                match, n = synthetic_match(rng, fmt, squads, ipl_squads)
+                deliveries[fmt] += n
+                zf.writestr(f"{1000000 + k}.json", json.dumps(match, indent=2))
+            zf.writestr("README.txt", "Synthetic Cricsheet data for bench_collect.py\n")
+
+    meta = {
+        "seed": seed,
+        "matches": {fmt: matches for fmt in formats},
+        "deliveries": deliveries,
+        "bytes": sum((path / f"{fmt}_json.zip").stat().st_size for fmt in formats),
+    }
+    with open(path / "fixture.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_fixture(matches, formats, seed):
+    path = BENCH_DIR / f"{'-'.join(formats)}-{matches}-s{seed}"
+    meta_path = path / "fixture.json"
+    if meta_path.exists():
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return path, json.load(f)
+    print(f"  Generating fixture in {path} ...")
+    t0 = time.time()
+    meta = generate_fixture(path, matches, formats, seed)
+    print(f"  ✓ {sum(meta['deliveries'].values()):,} deliveries, "
+          f"{meta['bytes'] / (1024 * 1024):.1f} MB zipped ({time.time() - t0:.1f}s)")
+    return path, meta
+
+
+# ── One timed run (in its own process) ──
+
+def _rss_high_water_mb():
+    """Peak RSS so far (this process or any finished child), in MB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1 if sys.platform == "darwin" else 1024     # bytes on macOS, KiB elsewhere
+    return round(max(usage, children) * scale / (1024 * 1024), 1)
+
+
+def run_once(data_dir, workers, stream, engine):
+    """Run every phase once; returns {phase: metrics}."""
+    import collect_data as cd
+
+    metrics = {}
+
+    @contextlib.contextmanager
+    def phase(name):
+        log = io.StringIO()
+        wall, cpu, times0 = time.perf_counter(), time.process_time(), os.times()
+        with contextlib.redirect_stdout(log):
+            yield
+        times1 = os.times()
+        metrics[name] = {
+            "wall_s": round(time.perf_counter() - wall, 4),
+            "cpu_s": round(time.process_time() - cpu, 4),
+            "child_cpu_s": round((times1.children_user - times0.children_user)
+                                 + (times1.children_system - times0.children_system), 4),
+            "rss_high_water_mb": _rss_high_water_mb(),
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with phase("load_people_register"):
+            people = cd.load_people_register(data_dir)
+        with phase("process_all_matches"):
+            players, finals = cd.process_all_matches(data_dir, people, workers=workers,
+                                                     cache_dir=None, stream=stream, engine=engine)
+        with phase("classify_roles"):
+            cd.classify_roles(players)
+        with phase("assign_trophies"):
+            cd.assign_trophies(players, finals)
+        with phase("filter_and_output"):
+            cd.filter_and_output(players, people, 0, Path(tmp) / "players.json")
+    return metrics
+
+
+# ── Reporting ──
+
+def summarize(runs, meta):
+    summary = {}
+    for name in PHASES:
+        walls = [r[name]["wall_s"] for r in runs]
+        rss = [r[name]["rss_high_water_mb"] for r in runs
+               if r[name]["rss_high_water_mb"] is not None]
+        summary[name] = {
+            "wall_min_s": min(walls),
+            "wall_median_s": round(statistics.median(walls), 4),
+            "cpu_median_s": round(statistics.median(r[name]["cpu_s"] for r in runs), 4),
+            "child_cpu_median_s": round(statistics.median(r[name]["child_cpu_s"]
+                                                          for r in runs), 4),
+            "rss_high_water_mb": max(rss) if rss else None,
+        }
+    wall = summary["process_all_matches"]["wall_median_s"]
+    summary["process_all_matches"]["matches_per_s"] = round(sum(meta["matches"].values()) / wall, 1)
+    summary["process_all_matches"]["deliveries_per_s"] = round(
+        sum(meta["deliveries"].values()) / wall)
+    return summary
+
+
+def compare(summary, baseline, tolerance):
+    """Print per-phase deltas against a baseline; returns the regressed phases."""
+    print(f"\n  {'phase':<24}{'baseline':>10}{'now':>10}{'change':>9}")
+    regressed = []
+    for name in PHASES:
+        old = baseline["summary"].get(name, {}).get("wall_median_s")
+        new = summary[name]["wall_median_s"]
+        if not old:
+            print(f"  {name:<24}{'-':>10}{new:>10.3f}")
+            continue
+        change = new / old - 1
+        flag = ""
+        if change > tolerance and new - old > MIN_REGRESSION_S:
+            flag = "  [REGRESSION]"
+            regressed.append(name)
+        print(f"  {name:<24}{old:>10.3f}{new:>10.3f}{change:>+9.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collect_data.py phases offline")
+    parser.add_argument("--matches", type=int, default=300,
+                        help="Synthetic matches per format (default: 300)")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help="Formats to generate (default: tests,odis,t20s,ipl)")
+    parser.add_argument("--seed", type=int, default=1, help="Fixture seed (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (default: 3)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="collect_data --workers (default: 1)")
+    parser.add_argument("--stream", action="store_true", help="collect_data --stream")
+    parser.add_argument("--engine", choices=("python", "numpy"), default="python",
+                        help="collect_data --engine (default: python)")
+    parser.add_argument("--out", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed median slowdown per phase for --compare (default: 0.10)")
+    parser.add_argument("--run-once", type=Path, help=argparse.SUPPRESS)  # child process
+    args = parser.parse_args()
+
+    if args.run_once:
+        metrics = run_once(args.run_once, args.workers, args.stream, args.engine)
+        print(json.dumps(metrics))
+        return
+
+    formats = [f for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+
+    print("=" * 60)
+    print("  collect_data.py phase benchmark")
+    print("=" * 60)
+    data_dir, meta = load_fixture(args.matches, formats, args.seed)
+
+    runs = []
+    for k in range(args.repeat):
+        cmd = [sys.executable, str(Path(__file__).resolve()), "--run-once", str(data_dir),
+               "--workers", str(args.workers), "--engine", args.engine]
+        if args.stream:
+            cmd.append("--stream")
+        result = subprocess.run(cmd, cwd=SCRIPT_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stdout[-2000:], result.stderr[-2000:])
+            sys.exit(1)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        total = sum(m["wall_s"] for m in runs[-1].values())
+        print(f"  Run {k + 1}/{args.repeat}: {total:.2f}s")
+
+    summary = summarize(runs, meta)
+    print(f"\n  {'phase':<24}{'median':>9}{'min':>9}{'cpu':>9}{'wkr cpu':>9}"
+          f"{'rss hwm':>9}")
+    for name in PHASES:
+        s = summary[name]
+        rss = f"{s['rss_high_water_mb']:.0f}" if s["rss_high_water_mb"] is not None else "-"
+        print(f"  {name:<24}{s['wall_median_s']:>9.3f}{s['wall_min_s']:>9.3f}"
+              f"{s['cpu_median_s']:>9.3f}{s['child_cpu_median_s']:>9.3f}{rss:>9}")
+    print("  (cpu: main process; wkr cpu: pool workers; rss hwm: running peak RSS, MB)")
+    pm = summary["process_all_matches"]
+    print(f"\n  Throughput: {pm['matches_per_s']:,.0f} matches/s, "
+          f"{pm['deliveries_per_s']:,.0f} deliveries/s")
+
+    results = {
+        "version": BENCH_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": {"matches": args.matches, "formats": formats, "seed": args.seed,
+                   "repeat": args.repeat, "workers": args.workers, "stream": args.stream,
+                   "engine": args.engine},
+        "fixture": meta,
+        "runs": runs,
+        "summary": summary,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"  Results: {args.out}")
+
+    regressed = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != results["params"]:
+            print("  [WARN] baseline was run with different parameters")
+        regressed = compare(summary, baseline, args.tolerance)
+    print("=" * 60)
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Split public/players.json into content-hashed shards plus a manifest.
+
+A daily grid only touches the players that fit its cells, so clients and
+prerenderers can fetch just the shards they need instead of the whole file:
+
+    core.{hash}.json             every deck-eligible player (fits at least one
+                                 pooled category), with teammates cut down to
+                                 the ids that teammate:* cells ask about
+    country-{slug}.{hash}.json   full records of one country's players
+    team-{abbr}.{hash}.json      full records of one IPL franchise's players
+    index.{hash}.json            inverted index: validator key → players
+
+public/data/bundles.json maps "core", "index", "country:India", "team:MI", ...
+(the same keys categories.ts validates against) to {file, sha256, bytes,
+players}.
+
+A shard's name changes whenever its bytes do, so shards can be cached
+immutably; only bundles.json needs revalidating. Shards no longer listed
+are removed.
+
+The index turns cell checks into set intersections. Players are numbered by
+their position in players.json ("ids"); each key in "bitmaps" is a base64
+bitset over those positions (bit i = byte i >> 3, bit i & 7). Every pooled
+validator key and every team/country/role/trophy/category seen is indexed.
+For any other threshold, "stats" holds each stat field sorted ascending
+({values, players}): binary-search the threshold in values and take the
+players from there on.
+
+Run it after every stage that rewrites public/players.json.
+
+Usage:
+    python scripts/build_bundles.py [--players public/players.json] [--out public/data]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+from categories import CategoryIndex, index_keys, load_pools, validate, validator_keys
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = SCRIPT_DIR.parent / "public"
+PLAYERS_PATH = PUBLIC_DIR / "players.json"
+BUNDLES_DIR = PUBLIC_DIR / "data"
+MANIFEST_NAME = "bundles.json"
+BUNDLES_VERSION = 1
+HASH_CHARS = 12
+
+_SHARD_RE = re.compile(r"^[a-z0-9-]+\.[0-9a-f]{%d}\.json$" % HASH_CHARS)
+
+
+def slugify(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def core_record(player, teammate_ids):
+    """A player trimmed to what cards and the pooled validators read."""
+    record = dict(player)
+    record["teammates"] = [t for t in player["teammates"] if t in teammate_ids]
+    return record
+
+
+def index_payload(index):
+    """The JSON form of a CategoryIndex (see the module docstring)."""
+    size = (len(index.ids) + 7) // 8
+    return {
+        "version": BUNDLES_VERSION,
+        "ids": index.ids,
+        "bitmaps": {key: base64.b64encode(mask.to_bytes(size, "little")).decode("ascii")
+                    for key, mask in index.bitmaps.items()},
+        "stats": {field: {"values": values, "players": order}
+                  for field, (values, order) in index.stats.items()},
+    }
+
+
+def write_shard(out_dir, stem, payload, players):
+    """Write one shard under its content hash; returns its manifest entry."""
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"{stem}.{digest[:HASH_CHARS]}.json"
+    path = out_dir / name
+    if not path.exists() or path.read_bytes() != data:
+        tmp = path.with_name(name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return {"file": name, "sha256": digest, "bytes": len(data), "players": players}
+
+
+def build_bundles(players, out_dir, pools):
+    """Write every shard and the manifest; returns the manifest."""
+    keys = validator_keys(pools)
+    teammate_ids = {k.split(":", 1)[1] for k in keys if k.startswith("teammate:")}
+
+    core = [core_record(p, teammate_ids) for p in players
+            if any(validate(p, key) for key in keys)]
+
+    by_country = defaultdict(list)
+    by_team = defaultdict(list)
+    for p in players:
+        by_country[p["country"]].append(p)
+        for team in p["iplTeams"]:
+            by_team[team].append(p)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = CategoryIndex(players, index_keys(players, pools))
+    shards = {
+        "core": write_shard(out_dir, "core", core, len(core)),
+        "index": write_shard(out_dir, "index", index_payload(index), len(players)),
+    }
+    for country in sorted(by_country):
+        group = by_country[country]
+        shards[f"country:{country}"] = write_shard(out_dir, f"country-{slugify(country)}",
+                                                   group, len(group))
+    for team in sorted(by_team):
+        group = by_team[team]
+        shards[f"team:{team}"] = write_shard(out_dir, f"team-{slugify(team)}", group, len(group))
+
+    manifest = {
+        "version": BUNDLES_VERSION,
+        "players": len(players),
+        "shards": shards,
+    }
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    tmp.replace(out_dir / MANIFEST_NAME)
+
+    # Drop shards from earlier runs that the manifest no longer points at
+    live = {entry["file"] for entry in shards.values()}
+    for path in out_dir.iterdir():
+        if _SHARD_RE.match(path.name) and path.name not in live:
+            path.unlink()
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split players.json into hashed shards + manifest")
+    parser.add_argument("--players", type=Path, default=PLAYERS_PATH,
+                        help="Player file to split (default: public/players.json)")
+    parser.add_argument("--out", type=Path, default=BUNDLES_DIR,
+                        help="Output directory (default: public/data)")
+    args = parser.parse_args()
+
+    print(f"Loading players from {args.players}")
+    with open(args.players, "r", encoding="utf-8") as f:
+        players = json.load(f)
+    pools = load_pools()
+    print(f"  {len(players)} players, {len(validator_keys(pools))} validator keys")
+
+    manifest = build_bundles(players, args.out, pools)
+    shards = manifest["shards"]
+    full = sum(e["bytes"] for k, e in shards.items() if k.startswith("country:"))
+    core = shards["core"]
+    index = shards["index"]
+
+    print(f"\n{'='*40}")
+    print(f"Shards:          {len(shards)} in {args.out}")
+    print(f"Core:            {core['players']} players, {core['bytes'] / 1024:.0f} KB")
+    print(f"All countries:   {full / 1024:.0f} KB")
+    print(f"Index:           {index['bytes'] / 1024:.0f} KB")
+    print(f"Largest shard:   {max(e['bytes'] for e in shards.values()) / 1024:.0f} KB")
+    print(f"{'='*40}")
+
+
+if __name__ == "__main__":
+    main()
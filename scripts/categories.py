@@ -0,0 +1,192 @@
+"""
+Grid categories for the Python pipeline stages.
+
+The category pools are read straight from src/data/categories.ts, so the
+two never drift. validate() is a port of validate() in
+src/lib/gameEngine.ts and has to be kept in step with it by hand.
+"""
+
+import json
+import re
+from bisect import bisect_left
+from pathlib import Path
+
+CATEGORIES_TS = Path(__file__).resolve().parent.parent / "src" / "data" / "categories.ts"
+
+_POOL_RE = re.compile(r"export const (\w+): GridCategory\[\] = \[(.*?)\n\];", re.S)
+_OBJECT_RE = re.compile(r"\{([^{}]*)\}")
+_FIELD_RE = re.compile(r'(\w+):\s*("(?:[^"\\]|\\.)*"|\[[^\]]*\])')
+_SPREAD_RE = re.compile(r"\.\.\.(\w+)")
+
+
+def load_pools(path: Path = CATEGORIES_TS) -> dict[str, list[dict]]:
+    """Every `export const X: GridCategory[]` in categories.ts, by name."""
+    source = path.read_text(encoding="utf-8")
+    pools: dict[str, list[dict]] = {}
+    for name, body in _POOL_RE.findall(source):
+        pool = []
+        # Spreads (IPL_CATEGORY_POOL = [...IPL_EASY_POOL, ...]) reuse earlier pools
+        for spread in _SPREAD_RE.findall(body):
+            pool.extend(pools.get(spread, []))
+        for obj in _OBJECT_RE.findall(body):
+            fields = {key: json.loads(value) for key, value in _FIELD_RE.findall(obj)}
+            if "validatorKey" in fields:
+                pool.append(fields)
+        pools[name] = pool
+    return pools
+
+
+def validator_keys(pools: dict[str, list[dict]]) -> list[str]:
+    """All distinct validator keys across the pools, in first-seen order."""
+    return list(dict.fromkeys(cat["validatorKey"] for pool in pools.values() for cat in pool))
+
+
+# ── Validation (port of gameEngine.ts) ──
+
+_IPL_TEAMS_RE = re.compile(r"^iplTeams>=(\d+)$")
+_STAT_RE = re.compile(r"^(\w+)>=(\d+)$")
+
+
+def split_combo(body: str) -> list[str]:
+    """Split "team:MI+country:India" into its parts ('+' only separates after a 'type:')."""
+    parts = []
+    current = ""
+    for ch in body:
+        if ch == "+" and ":" in current:
+            parts.append(current)
+            current = ""
+            continue
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def validate_single(player: dict, key: str) -> bool:
+    if key == "overseas":
+        return player["country"] != "India" and len(player.get("iplTeams") or []) > 0
+    match = _IPL_TEAMS_RE.match(key)
+    if match:
+        return len(player.get("iplTeams") or []) >= int(match.group(1))
+
+    kind, _, value = key.partition(":")
+    if kind == "team":
+        return value in player["iplTeams"]
+    if kind == "country":
+        return player["country"] == value
+    if kind == "stat":
+        match = _STAT_RE.match(value)
+        if not match:
+            return False
+        return (player["stats"].get(match.group(1)) or 0) >= int(match.group(2))
+    if kind == "role":
+        # "Batsman" matches both "Batsman" and "WK-Bat"
+        if value == "Batsman":
+            return player["primaryRole"] in ("Batsman", "WK-Bat")
+        return player["primaryRole"] == value
+    if kind == "trophy":
+        return value in player["trophies"]
+    if kind == "teammate":
+        return player["id"] != value and value in player["teammates"]
+    if kind == "category":
+        return value in (player.get("categories") or [])
+    return False
+
+
+def validate(player: dict, key: str) -> bool:
+    """Does `player` fit the cell with this validatorKey?"""
+    if key.startswith("combo:"):
+        return all(validate_single(player, part) for part in split_combo(key[len("combo:"):]))
+    return validate_single(player, key)
+
+
+# ── Inverted index ──
+
+class CategoryIndex:
+    """
+    Which players fit which cells, as bitmaps over player positions.
+
+    A bitmap is a Python int: bit i set means players[i] fits. Keys are
+    precomputed for `keys`; anything else (other stat thresholds, combos of
+    indexed keys, ...) is answered from the sorted stat columns or by
+    intersecting parts, and scanned only as a last resort.
+    """
+
+    def __init__(self, players: list[dict], keys: list[str]):
+        self.players = players
+        self.ids = [p["id"] for p in players]
+        self.all = (1 << len(players)) - 1
+        self.bitmaps: dict[str, int] = {}
+        for key in keys:
+            self.bitmaps[key] = self._scan(key)
+
+        # stat field → (values ascending, player positions in the same order)
+        self.stats: dict[str, tuple[list[int], list[int]]] = {}
+        fields = dict.fromkeys(f for p in players for f in p["stats"])
+        for field in fields:
+            column = [p["stats"].get(field) or 0 for p in players]
+            order = sorted(range(len(players)), key=column.__getitem__)
+            self.stats[field] = ([column[i] for i in order], order)
+
+    def _scan(self, key: str) -> int:
+        mask = 0
+        for i, p in enumerate(self.players):
+            if validate(p, key):
+                mask |= 1 << i
+        return mask
+
+    def at_least(self, field: str, threshold: int) -> int:
+        """Bitmap of players with stats[field] >= threshold (binary search)."""
+        if field not in self.stats:
+            return self.all if threshold <= 0 else 0
+        values, order = self.stats[field]
+        mask = 0
+        for i in order[bisect_left(values, threshold):]:
+            mask |= 1 << i
+        return mask
+
+    def members(self, key: str) -> int:
+        """Bitmap of players that validate(player, key) holds for."""
+        mask = self.bitmaps.get(key)
+        if mask is not None:
+            return mask
+        if key.startswith("combo:"):
+            mask = self.all
+            for part in split_combo(key[len("combo:"):]):
+                mask &= self.members(part)
+        elif key.startswith("stat:") and _STAT_RE.match(key[len("stat:"):]):
+            field, threshold = _STAT_RE.match(key[len("stat:"):]).groups()
+            mask = self.at_least(field, int(threshold))
+        else:
+            mask = self._scan(key)
+        self.bitmaps[key] = mask
+        return mask
+
+    def count(self, key: str) -> int:
+        return self.members(key).bit_count()
+
+    def positions(self, mask: int) -> list[int]:
+        """Player positions set in a bitmap, ascending."""
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(low.bit_length() - 1)
+            mask ^= low
+        return out
+
+
+def index_keys(players: list[dict], pools: dict[str, list[dict]]) -> list[str]:
+    """Every pooled validator key plus a key per team, country, role, trophy and category seen."""
+    keys = validator_keys(pools)
+    keys.append("overseas")
+    most_teams = max((len(p["iplTeams"]) for p in players), default=0)
+    keys.extend(f"iplTeams>={n}" for n in range(1, most_teams + 1))
+    for kind, values in (
+        ("team", {t for p in players for t in p["iplTeams"]}),
+        ("country", {p["country"] for p in players}),
+        ("role", {p["primaryRole"] for p in players}),
+        ("trophy", {t for p in players for t in p["trophies"]}),
+        ("category", {c for p in players for c in p.get("categories") or []}),
+    ):
+        keys.extend(f"{kind}:{v}" for v in sorted(values))
+    return list(dict.fromkeys(keys))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Count how many players fit every pair (and optionally triple) of grid cells.
+
+Each validatorKey in the category pools becomes a CategoryIndex bitmap over
+public/players.json; a pair's count is the popcount of the two bitmaps
+ANDed. That is exactly how many players a combo:a+b validator would accept,
+so empty and near-empty combos show up here before they reach a live grid.
+
+Flagged (below --min-count, default 4 — the per-cell minimum buildCoverDeck
+tries to deal):
+  - combo: validators already in categories.ts
+  - single categories
+  - pairs / triples, which are also written out as the vetted list of
+    viable combos to draw from (--out). Left out of that list: combos the
+    validator can't express, combos that repeat a part, and nested ones,
+    where one cell's players all fit another and the combo adds nothing
+    over the narrower cell.
+
+Usage:
+    python scripts/category_coverage.py [--pool FULL_CATEGORY_POOL] [--min-count 4]
+                                        [--triples] [--out coverage.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+from categories import CategoryIndex, load_pools, split_combo, validator_keys
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PLAYERS_PATH = SCRIPT_DIR.parent / "public" / "players.json"
+MIN_COUNT = 4
+
+
+def combo_key(keys):
+    """
+    The combo: validator accepting exactly the players fitting every key, or
+    None if splitCombo() would cut it differently (a '+' inside a value, as
+    in "category:50+ Century Makers") or a part repeats.
+    """
+    parts = []
+    for key in keys:
+        parts.extend(split_combo(key[len("combo:"):]) if key.startswith("combo:") else [key])
+    if len(set(parts)) < len(parts):
+        return None
+    body = "+".join(parts)
+    return "combo:" + body if split_combo(body) == parts else None
+
+
+def coverage(index, keys, triples=False):
+    """Single counts, the pair matrix, and triple counts (if asked) for `keys`."""
+    masks = [index.members(k) for k in keys]
+    singles = [m.bit_count() for m in masks]
+    n = len(keys)
+    pairs = [[0] * n for _ in range(n)]
+    for i in range(n):
+        pairs[i][i] = singles[i]
+        for j in range(i + 1, n):
+            pairs[i][j] = pairs[j][i] = (masks[i] & masks[j]).bit_count()
+
+    triple_counts = {}
+    if triples:
+        for i, j in combinations(range(n), 2):
+            if not pairs[i][j]:
+                continue    # every triple containing an empty pair is empty too
+            both = masks[i] & masks[j]
+            for k in range(j + 1, n):
+                triple_counts[(i, j, k)] = (both & masks[k]).bit_count()
+    return singles, pairs, triple_counts
+
+
+def nested(masks, members):
+    """True if one member's players all fit another member too."""
+    return any(masks[i] & masks[j] in (masks[i], masks[j])
+               for i, j in combinations(members, 2))
+
+
+def viable_combos(keys, counts):
+    """{combo key: count} for index tuples that make expressible combos."""
+    out = {}
+    for members, count in counts.items():
+        key = combo_key([keys[i] for i in members])
+        if key:
+            out[key] = count
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise / triple category coverage matrix")
+    parser.add_argument("--pool", help="Only this pool from categories.ts (default: all pools)")
+    parser.add_argument("--min-count", type=int, default=MIN_COUNT,
+                        help=f"Flag anything fewer players fit (default: {MIN_COUNT})")
+    parser.add_argument("--triples", action="store_true", help="Also count every triple")
+    parser.add_argument("--players", type=Path, default=PLAYERS_PATH,
+                        help="Player file (default: public/players.json)")
+    parser.add_argument("--out", type=Path, help="Write the matrix and viable combos as JSON")
+    args = parser.parse_args()
+
+    pools = load_pools()
+    if args.pool:
+        if args.pool not in pools:
+            print(f"ERROR: no pool {args.pool!r} in categories.ts ({', '.join(pools)})")
+            sys.exit(1)
+        pools = {args.pool: pools[args.pool]}
+    keys = validator_keys(pools)
+
+    print(f"Loading players from {args.players}")
+    with open(args.players, "r", encoding="utf-8") as f:
+        players = json.load(f)
+
+    t0 = time.time()
+    index = CategoryIndex(players, keys)
+    t1 = time.time()
+    singles, pairs, triples = coverage(index, keys, args.triples)
+    t2 = time.time()
+    print(f"  {len(players)} players, {len(keys)} validator keys "
+          f"(index {t1 - t0:.2f}s, counts {t2 - t1:.3f}s)")
+
+    low = args.min_count
+    masks = [index.members(k) for k in keys]
+    thin_singles = [(k, c) for k, c in zip(keys, singles)
+                    if not k.startswith("combo:") and c < low]
+    thin_combos = [(k, c) for k, c in zip(keys, singles) if k.startswith("combo:") and c < low]
+    n = len(keys)
+    pair_list = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    full_pairs = [(i, j) for i, j in pair_list if pairs[i][j] >= low]
+    unnested_pairs = [p for p in full_pairs if not nested(masks, p)]
+    viable_pairs = viable_combos(keys, {p: pairs[p[0]][p[1]] for p in unnested_pairs})
+    empty_pairs = sum(1 for i, j in pair_list if not pairs[i][j])
+    full_triples = [t for t, c in triples.items() if c >= low]
+    unnested_triples = [t for t in full_triples if not nested(masks, t)]
+    viable_triples = viable_combos(keys, {t: triples[t] for t in unnested_triples})
+
+    if thin_singles:
+        print(f"\nCategories with fewer than {low} players:")
+        for key, count in thin_singles:
+            print(f"  {count:>4}  {key}")
+    if thin_combos:
+        print(f"\nExisting combos with fewer than {low} players:")
+        for key, count in thin_combos:
+            print(f"  {count:>4}  {key}")
+    near = sorted(((pairs[i][j], keys[i], keys[j]) for i, j in pair_list
+                   if 0 < pairs[i][j] < low))
+    if near:
+        print(f"\nNear-empty pairs (1..{low - 1} players), tightest first:")
+        for count, a, b in near[:20]:
+            print(f"  {count:>4}  {a}  +  {b}")
+        if len(near) > 20:
+            print(f"  ... {len(near) - 20} more")
+
+    if args.out:
+        report = {
+            "players": len(players),
+            "min_count": low,
+            "keys": keys,
+            "singles": singles,
+            "pairs": pairs,
+            "viable_pairs": viable_pairs,
+        }
+        if args.triples:
+            report["viable_triples"] = viable_triples
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+
+    print(f"\n{'='*40}")
+    print(f"Pairs:           {len(pair_list)} ({empty_pairs} empty, "
+          f"{len(pair_list) - empty_pairs - len(full_pairs)} near-empty, "
+          f"{len(full_pairs) - len(unnested_pairs)} nested, "
+          f"{len(unnested_pairs) - len(viable_pairs)} unexpressible/repeated, "
+          f"{len(viable_pairs)} viable)")
+    if args.triples:
+        print(f"Triples:         {len(viable_triples)} viable of "
+              f"{n * (n - 1) * (n - 2) // 6} ({len(full_triples) - len(unnested_triples)} "
+              f"nested, {len(unnested_triples) - len(viable_triples)} unexpressible/repeated)")
+    print(f"Thin categories: {len(thin_singles) + len(thin_combos)} "
+          f"({len(thin_combos)} existing combos)")
+    if args.out:
+        print(f"Output:          {args.out}")
+    print(f"{'='*40}")
+
+
+if __name__ == "__main__":
+    main()
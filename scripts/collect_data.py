@@ -6,27 +6,40 @@ Downloads and processes Cricsheet open-source cricket data to build
 a comprehensive 500+ player database for the Cricket Bingo game.
 
 Data Source : https://cricsheet.org  (Open Data, CC-BY-4.0)
-Output      : ../src/data/players.json
+Output      : ../src/data/players.json  (+ players.bin, teammate_contexts.json)
 
 Usage:
     python collect_data.py                   # Full run (download + process)
     python collect_data.py --skip-download   # Re-process without re-downloading
     python collect_data.py --quick           # Dev mode: process only 200 matches per format
+    python collect_data.py --workers 8       # Parse matches on a pool of 8 processes
+    python collect_data.py --profile         # Per-phase timings / counters → profile.json
+
+Parsed matches are cached per ZIP entry in cricsheet_data/match_cache/, so
+reruns only parse new or changed matches (--no-cache to re-parse everything).
 """
 
 import argparse
 import csv
+import hashlib
 import json
 import os
 import re
+import struct
 import sys
+import threading
 import time
 import zipfile
+from array import array
 from collections import defaultdict
+from contextlib import contextmanager
 from io import TextIOWrapper
+from email.utils import formatdate
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
 from pathlib import Path
-from urllib.error import URLError
-from urllib.request import urlretrieve
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
 
 # Fix Windows console encoding for Unicode output
 if sys.platform == "win32":
@@ -220,54 +233,218 @@ BOWLER_WICKET_KINDS = frozenset({
 #  PLAYER DATA ACCUMULATOR
 # ════════════════════════════════════════════════════════════════
 
-class PlayerData:
-    """Mutable accumulator for one player's career data across all formats."""
-
-    __slots__ = (
-        "cricsheet_id", "name", "country",
-        "ipl_teams", "formats_played", "_role",
-        "test_runs", "test_wickets", "test_matches", "test_balls_bowled", "test_innings_scores",
-        "odi_runs",  "odi_wickets",  "odi_matches",  "odi_balls_bowled",  "odi_innings_scores",
-        "t20i_runs", "t20i_wickets", "t20i_matches", "t20i_balls_bowled", "t20i_innings_scores",
-        "ipl_runs",  "ipl_wickets",  "ipl_matches",  "ipl_balls_bowled",  "ipl_innings_scores",
-        "teammates_set", "stumpings_effected", "trophies",
-    )
-
-    def __init__(self, cricsheet_id: str, name: str, country: str):
-        self.cricsheet_id = cricsheet_id
-        self.name = name
-        self.country = country
-        self.ipl_teams: set[str] = set()
-        self.formats_played: set[str] = set()
+FORMAT_KEYS = ("test", "odi", "t20i", "ipl")
 
-        # Per-format flat fields (avoid nested dicts for speed)
-        for fmt in ("test", "odi", "t20i", "ipl"):
-            setattr(self, f"{fmt}_runs", 0)
-            setattr(self, f"{fmt}_wickets", 0)
-            setattr(self, f"{fmt}_matches", set())       # set of match_ids
-            setattr(self, f"{fmt}_balls_bowled", 0)
-            setattr(self, f"{fmt}_innings_scores", [])    # list of ints (per-innings runs)
 
-        self.teammates_set: set[str] = set()              # cricsheet_ids
-        self.stumpings_effected: int = 0
-        self.trophies: set[str] = set()
-        self._role: str = "Batsman"                       # default, overwritten in Phase 4
+class PlayerStore:
+    """
+    Columnar accumulator for every player's career data across all formats.
 
-    # Convenience helpers for adding stats
-    def add_batting_runs(self, fmt_key: str, runs: int):
-        setattr(self, f"{fmt_key}_runs", getattr(self, f"{fmt_key}_runs") + runs)
+    Each player gets an integer index (in order of first appearance); per-format
+    counters live in one array per stat, so the per-delivery hot path is a dict
+    lookup plus an array increment. Matches and centuries are plain counters.
 
-    def add_wicket(self, fmt_key: str):
-        setattr(self, f"{fmt_key}_wickets", getattr(self, f"{fmt_key}_wickets") + 1)
+    Behaves as a read-only mapping of cricsheet_id → PlayerData row view.
+    """
 
-    def add_ball_bowled(self, fmt_key: str):
-        setattr(self, f"{fmt_key}_balls_bowled", getattr(self, f"{fmt_key}_balls_bowled") + 1)
+    def __init__(self):
+        self.index: dict[str, int] = {}                   # cricsheet_id → row
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.countries: list[str] = []
+        self.ipl_teams: list[set[str]] = []
+        self.formats_played: list[set[str]] = []
+        self.teammates: list[int] = []                    # bitset over rows
+        self.trophies: list[set[str]] = []
+        self.roles: list[str] = []
+        self.stumpings = array("i")
+
+        # Per-format columns: column[fmt_key][row]
+        self.runs = {fmt: array("i") for fmt in FORMAT_KEYS}
+        self.wickets = {fmt: array("i") for fmt in FORMAT_KEYS}
+        self.balls = {fmt: array("i") for fmt in FORMAT_KEYS}
+        self.matches = {fmt: array("i") for fmt in FORMAT_KEYS}
+        self.centuries = {fmt: array("i") for fmt in FORMAT_KEYS}
+
+        # Every XI fielded, as (context, member rows): a context is an
+        # interned (team, format, season) triple like ("MI", "IPL", "2019")
+        self.contexts: dict[tuple[str, str, str], int] = {}
+        self.xi_context = array("i")
+        self.xi_start = array("i", [0])                   # offsets into xi_rows
+        self.xi_rows = array("i")
+
+    def add(self, cricsheet_id: str, name: str = "", country: str = "") -> int:
+        """Return the row for cricsheet_id, appending a blank one if it is new."""
+        i = self.index.get(cricsheet_id)
+        if i is not None:
+            return i
+        i = self.index[cricsheet_id] = len(self.ids)
+        self.ids.append(cricsheet_id)
+        self.names.append(name)
+        self.countries.append(country)
+        self.ipl_teams.append(set())
+        self.formats_played.append(set())
+        self.teammates.append(0)
+        self.trophies.append(set())
+        self.roles.append("Batsman")                      # default, overwritten in Phase 4
+        self.stumpings.append(0)
+        for column in (self.runs, self.wickets, self.balls, self.matches, self.centuries):
+            for fmt in FORMAT_KEYS:
+                column[fmt].append(0)
+        return i
+
+    def add_xi(self, context: tuple[str, str, str], rows: list[int]):
+        """Record one XI fielded in `context` (rows are player indices)."""
+        c = self.contexts.get(context)
+        if c is None:
+            c = self.contexts[context] = len(self.contexts)
+        self.xi_context.append(c)
+        self.xi_rows.extend(rows)
+        self.xi_start.append(len(self.xi_rows))
+
+    def merge(self, other: "PlayerStore", known_only: bool = False, exclude=()):
+        """Fold another partial store into this one.
+
+        `other` must cover matches that come *after* the ones already in
+        `self`, so first-seen fields (name, country) keep their current value.
+        With known_only, rows for players not already in `self` are dropped;
+        pids in `exclude` are always skipped.
+        """
+        # other's row → our row (None for rows that are dropped)
+        rows: list[int | None] = []
+        for j, pid in enumerate(other.ids):
+            i = self.index.get(pid)
+            if i is None and not known_only and pid not in exclude:
+                i = self.add(pid, other.names[j], other.countries[j])
+            rows.append(None if pid in exclude else i)
+
+        for j, i in enumerate(rows):
+            if i is None:
+                continue
+            if not self.countries[i]:
+                self.countries[i] = other.countries[j]
+            self.ipl_teams[i] |= other.ipl_teams[j]
+            self.formats_played[i] |= other.formats_played[j]
+            if other.teammates[j]:
+                # Teammate bits are row numbers: renumber them into our rows
+                mask = 0
+                for k in iter_bits(other.teammates[j]):
+                    if rows[k] is not None:
+                        mask |= 1 << rows[k]
+                self.teammates[i] |= mask
+            self.trophies[i] |= other.trophies[j]
+            self.stumpings[i] += other.stumpings[j]
+            for mine, theirs in ((self.runs, other.runs), (self.wickets, other.wickets),
+                                 (self.balls, other.balls), (self.matches, other.matches),
+                                 (self.centuries, other.centuries)):
+                for fmt in FORMAT_KEYS:
+                    mine[fmt][i] += theirs[fmt][j]
+
+        other_contexts = list(other.contexts)
+        for x, c in enumerate(other.xi_context):
+            members = other.xi_rows[other.xi_start[x]:other.xi_start[x + 1]]
+            self.add_xi(other_contexts[c], [rows[k] for k in members if rows[k] is not None])
+
+    def context_edges(self, rows: dict[int, int]) -> dict[tuple[int, int], set[int]]:
+        """
+        Teammate edges among a subset of players, with the contexts each
+        pair shared an XI in. `rows` maps store row → output number; edges
+        are keyed (a, b) with a < b in output numbering.
+        """
+        edges: dict[tuple[int, int], set[int]] = defaultdict(set)
+        for x, c in enumerate(self.xi_context):
+            members = sorted({rows[k] for k in self.xi_rows[self.xi_start[x]:self.xi_start[x + 1]]
+                              if k in rows})
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    edges[a, b].add(c)
+        return edges
+
+    def teammate_ids(self, cricsheet_id: str) -> list[str]:
+        return [self.ids[k] for k in iter_bits(self.teammates[self.index[cricsheet_id]])]
+
+    def common_teammates(self, *cricsheet_ids: str) -> list[str]:
+        """Players who have shared an XI with every one of the given players."""
+        mask = -1
+        for pid in cricsheet_ids:
+            mask &= self.teammates[self.index[pid]]
+        return [self.ids[k] for k in iter_bits(mask)] if cricsheet_ids else []
+
+    # Mapping interface (cricsheet_id → PlayerData)
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, cricsheet_id) -> bool:
+        return cricsheet_id in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __getitem__(self, cricsheet_id: str) -> "PlayerData":
+        return PlayerData(self, self.index[cricsheet_id])
+
+    def keys(self):
+        return list(self.ids)
+
+    def values(self):
+        return [PlayerData(self, i) for i in range(len(self.ids))]
+
+    def items(self):
+        return [(pid, PlayerData(self, i)) for i, pid in enumerate(self.ids)]
+
+
+def iter_bits(mask: int):
+    """Yield the positions of the set bits of a non-negative int, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _column(name: str, fmt: str | None = None) -> property:
+    """Property reading (and writing) one PlayerStore column at the view's row."""
+    if fmt is None:
+        def fget(self):
+            return getattr(self._store, name)[self._i]
+
+        def fset(self, value):
+            getattr(self._store, name)[self._i] = value
+    else:
+        def fget(self):
+            return getattr(self._store, name)[fmt][self._i]
+
+        def fset(self, value):
+            getattr(self._store, name)[fmt][self._i] = value
+    return property(fget, fset)
 
-    def record_innings_score(self, fmt_key: str, score: int):
-        getattr(self, f"{fmt_key}_innings_scores").append(score)
 
-    def add_match(self, fmt_key: str, match_id: str):
-        getattr(self, f"{fmt_key}_matches").add(match_id)
+class PlayerData:
+    """Row view onto one player in a PlayerStore."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: PlayerStore, i: int):
+        self._store = store
+        self._i = i
+
+    cricsheet_id = property(lambda self: self._store.ids[self._i])
+    name = _column("names")
+    country = _column("countries")
+    ipl_teams = _column("ipl_teams")
+    formats_played = _column("formats_played")
+    teammates_mask = _column("teammates")
+    trophies = _column("trophies")
+    stumpings_effected = _column("stumpings")
+    _role = _column("roles")
+
+    test_runs, test_wickets, test_matches, test_balls_bowled, test_centuries = (
+        _column(c, "test") for c in ("runs", "wickets", "matches", "balls", "centuries"))
+    odi_runs, odi_wickets, odi_matches, odi_balls_bowled, odi_centuries = (
+        _column(c, "odi") for c in ("runs", "wickets", "matches", "balls", "centuries"))
+    t20i_runs, t20i_wickets, t20i_matches, t20i_balls_bowled, t20i_centuries = (
+        _column(c, "t20i") for c in ("runs", "wickets", "matches", "balls", "centuries"))
+    ipl_runs, ipl_wickets, ipl_matches, ipl_balls_bowled, ipl_centuries = (
+        _column(c, "ipl") for c in ("runs", "wickets", "matches", "balls", "centuries"))
 
     # Aggregated properties
     @property
@@ -280,56 +457,147 @@ class PlayerData:
 
     @property
     def total_intl_matches(self) -> int:
-        return len(self.test_matches) + len(self.odi_matches) + len(self.t20i_matches)
+        return self.test_matches + self.odi_matches + self.t20i_matches
 
     @property
     def total_balls_bowled(self) -> int:
         return self.test_balls_bowled + self.odi_balls_bowled + self.t20i_balls_bowled
 
     @property
-    def centuries(self) -> int:
-        """International centuries (Test + ODI + T20I)."""
-        return sum(
-            1 for s in (self.test_innings_scores + self.odi_innings_scores + self.t20i_innings_scores)
-            if s >= 100
-        )
+    def teammates_set(self) -> set[str]:
+        return set(self._store.teammate_ids(self.cricsheet_id))
 
     @property
-    def ipl_centuries(self) -> int:
-        return sum(1 for s in self.ipl_innings_scores if s >= 100)
+    def centuries(self) -> int:
+        """International centuries (Test + ODI + T20I)."""
+        return self.test_centuries + self.odi_centuries + self.t20i_centuries
 
 
 # ════════════════════════════════════════════════════════════════
 #  PHASE 1 — DOWNLOAD
 # ════════════════════════════════════════════════════════════════
 
+# Each download keeps a sidecar <file>.meta with the validators (ETag,
+# Last-Modified) it was served with, so reruns send a conditional request
+# and only re-fetch archives that changed. Bytes land in <file>.part first;
+# an interrupted download resumes from there with a Range request, and
+# the result is only moved into place once complete (and, for ZIPs, intact).
+
+def _say(line: str):
+    # One write per line, so lines from concurrent downloads don't interleave
+    sys.stdout.write(line + "\n")
+
+
+def _zip_ok(path: Path) -> bool:
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            return zf.testzip() is None
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def _file_ok(path: Path) -> bool:
+    return path.exists() and (path.suffix != ".zip" or _zip_ok(path))
+
+
+def _read_meta(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
 def download_file(url: str, dest: Path, label: str) -> bool:
-    """Download a URL to a local file with progress reporting."""
-    if dest.exists():
-        size_mb = dest.stat().st_size / (1024 * 1024)
-        print(f"  [SKIP] {label} already exists ({size_mb:.1f} MB)")
-        return True
+    """
+    Fetch a URL to a local file, resuming partial downloads and skipping
+    the transfer when the server says our copy is still current.
+    """
+    meta_path = dest.with_name(dest.name + ".meta")
+    part = dest.with_name(dest.name + ".part")
+    meta = _read_meta(meta_path)
+    have = _file_ok(dest)
+
+    headers = {"User-Agent": "CricketBingo/1.0"}
+    validator = None
+    if have:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        elif not meta:
+            headers["If-Modified-Since"] = formatdate(dest.stat().st_mtime, usegmt=True)
+
+    # Resume a partial download, but only if it is still the same file
+    offset = part.stat().st_size if part.exists() else 0
+    if offset:
+        part_meta = _read_meta(part.with_name(part.name + ".meta"))
+        validator = part_meta.get("etag") or part_meta.get("last_modified")
+        if validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        else:
+            offset = 0
 
-    print(f"  [DOWN] {label} ...")
     try:
-        def _report(block_num, block_size, total_size):
-            downloaded = block_num * block_size
-            if total_size > 0:
-                pct = min(downloaded / total_size * 100, 100)
-                mb = downloaded / (1024 * 1024)
-                sys.stdout.write(f"\r         {mb:.1f} MB ({pct:.0f}%)")
-                sys.stdout.flush()
-
-        urlretrieve(url, str(dest), reporthook=_report)
-        print()  # newline after progress
-        return True
+        with urlopen(Request(url, headers=headers), timeout=60) as resp:
+            status = resp.status
+            if status == 206:
+                mode = "ab"
+            else:
+                mode, offset = "wb", 0
+            fresh = {
+                "url":           url,
+                "etag":          resp.headers.get("ETag", ""),
+                "last_modified": resp.headers.get("Last-Modified", ""),
+            }
+            with open(part.with_name(part.name + ".meta"), "w", encoding="utf-8") as f:
+                json.dump(fresh, f)
+
+            expected = resp.headers.get("Content-Length")
+            received = 0
+            with open(part, mode) as f:
+                while True:
+                    block = resp.read(1 << 16)
+                    if not block:
+                        break
+                    f.write(block)
+                    received += len(block)
+            if expected is not None and received < int(expected):
+                _say(f"  [ERR]  {label}: connection dropped at "
+                     f"{(offset + received) / (1024 * 1024):.1f} MB (will resume)")
+                return have
+    except HTTPError as e:
+        if e.code == 304:
+            size_mb = dest.stat().st_size / (1024 * 1024)
+            _say(f"  [SKIP] {label} unchanged ({size_mb:.1f} MB)")
+            return True
+        if e.code == 416:
+            # Our partial file is past the end: start over next time
+            part.unlink(missing_ok=True)
+        _say(f"  [ERR]  Failed to download {label}: {e}")
+        return have
     except (URLError, OSError) as e:
-        print(f"\n  [ERR]  Failed to download {label}: {e}")
-        return False
+        _say(f"  [ERR]  Failed to download {label}: {e}")
+        return have
+
+    if dest.suffix == ".zip" and not _zip_ok(part):
+        _say(f"  [ERR]  {label}: downloaded archive is corrupt, discarding")
+        part.unlink(missing_ok=True)
+        return have
 
+    os.replace(part, dest)
+    os.replace(part.with_name(part.name + ".meta"), meta_path)
+    size_mb = dest.stat().st_size / (1024 * 1024)
+    how = "resumed" if offset else "downloaded"
+    _say(f"  [DOWN] {label} {how} ({size_mb:.1f} MB)")
+    return True
+
+
+def download_all(data_dir: Path, skip: bool = False, workers: int = 5, base_url: str | None = None):
+    """Download all Cricsheet data files concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
 
-def download_all(data_dir: Path, skip: bool = False):
-    """Download all Cricsheet data files."""
     if skip:
         print("\n>> Skipping downloads (--skip-download)")
         return
@@ -337,14 +605,20 @@ def download_all(data_dir: Path, skip: bool = False):
     print("\n>> Phase 1: Downloading Cricsheet data")
     data_dir.mkdir(parents=True, exist_ok=True)
 
-    # People register
-    download_file(PEOPLE_CSV_URL, data_dir / "people.csv", "People register")
-    time.sleep(1)  # throttle
-
-    # Match data ZIPs
+    # People register + match data ZIPs
+    jobs = [(PEOPLE_CSV_URL, data_dir / "people.csv", "People register")]
     for key, url in CRICSHEET_ZIPS.items():
-        download_file(url, data_dir / f"{key}_json.zip", f"{key.upper()} matches")
-        time.sleep(2)  # throttle between large downloads
+        jobs.append((url, data_dir / f"{key}_json.zip", f"{key.upper()} matches"))
+    if base_url:
+        jobs = [(base_url.rstrip("/") + urlsplit(url).path, dest, label)
+                for url, dest, label in jobs]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        ok = list(pool.map(lambda job: download_file(*job), jobs))
+
+    for (_, dest, label), good in zip(jobs, ok):
+        if not good and dest.suffix == ".zip":
+            print(f"  [WARN] No usable copy of {dest.name}; {label} will be skipped")
 
 
 # ════════════════════════════════════════════════════════════════
@@ -382,143 +656,139 @@ def load_people_register(data_dir: Path) -> dict[str, dict]:
 #  PHASE 3 — PROCESS MATCHES
 # ════════════════════════════════════════════════════════════════
 
+# Work counters and sub-phase timers ("..._s" keys) for --profile; see
+# PhaseProfiler. None unless profiling, so the hot paths only pay an
+# `is not None` check.
+_counters: defaultdict | None = None
+
+
+@contextmanager
+def _timed(key: str):
+    """Add the block's wall time to the --profile timer `key`."""
+    prof = _counters
+    if prof is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    yield
+    prof[key] += time.perf_counter() - t0
+
+
 def get_or_create_player(
-    players: dict[str, PlayerData],
+    players: PlayerStore,
     pid: str,
     display_name: str,
     people: dict[str, dict],
-) -> PlayerData:
-    """Get existing PlayerData or create a new one."""
-    if pid in players:
-        return players[pid]
+) -> int:
+    """Get an existing player's row or create a new one."""
+    i = players.index.get(pid)
+    if i is not None:
+        return i
 
     # Use name from people register (slightly more canonical), fallback to display_name
     info = people.get(pid, {})
     name = info.get("name") or display_name
     # Country is set later from international match team names
-    p = PlayerData(pid, name, "")
-    players[pid] = p
-    return p
+    return players.add(pid, name, "")
 
 
-def process_match(
-    match_data: dict,
+# Map ZIP key → stats attribute prefix
+_FMT_KEY_MAP = {"tests": "test", "odis": "odi", "t20s": "t20i", "ipl": "ipl"}
+
+
+def match_playing_xis(info: dict) -> list[tuple[str, list[tuple[str, str]]]]:
+    """Resolve a match's playing XIs → [(team_name, [(pid, display_name), ...]), ...]."""
+    registry = info.get("registry", {}).get("people", {})
+    players_by_team: dict[str, list[str]] = info.get("players", {})
+    xis = []
+    for team_name, name_list in players_by_team.items():
+        members = []
+        for display_name in name_list:
+            pid = registry.get(display_name)
+            if pid:
+                members.append((pid, display_name))
+        xis.append((team_name, members))
+    return xis
+
+
+def register_playing_xis(
+    xis: list[tuple[str, list[tuple[str, str]]]],
     match_id: str,
-    format_key: str,        # "tests", "odis", "t20is", "ipl"
-    players: dict[str, PlayerData],
+    format_key: str,
+    players: PlayerStore,
     people: dict[str, dict],
-    finals: list,
-):
+    season: str = "",
+) -> dict[str, list[str]]:
     """
-    Process one match JSON file.
-
-    Updates `players` in-place with stats, teammates, IPL teams.
-    Appends to `finals` if this match is a tournament final.
+    Register one match's XIs: create players, track matches / IPL teams /
+    country, and link teammates (recording the team / format / season
+    context they shared). Returns { team_name: [pid, ...] }.
     """
-    # Map ZIP key → stats attribute prefix
-    _FMT_KEY_MAP = {"tests": "test", "odis": "odi", "t20s": "t20i", "ipl": "ipl"}
     fmt_key = _FMT_KEY_MAP.get(format_key, format_key)
-
-    info = match_data.get("info", {})
-    innings_list = match_data.get("innings", [])
-
-    # ── Registry: display_name → cricsheet_id ────────────────
-    registry = info.get("registry", {}).get("people", {})
-
-    # ── Playing XIs ──────────────────────────────────────────
-    players_by_team: dict[str, list[str]] = info.get("players", {})
+    prof = _counters
+    if prof is not None:
+        t0 = time.perf_counter()
 
     # Is this an international match? (team names = country names)
     is_international = format_key in ("tests", "odis", "t20s")
 
     # 1) Register players and track matches / IPL teams / country
+    matches = players.matches[fmt_key]
+    counted: set[int] = set()
     team_pid_map: dict[str, list[str]] = {}  # team_name → [pid, ...]
-    for team_name, name_list in players_by_team.items():
+    for team_name, members in xis:
         pids_in_team = []
-        for display_name in name_list:
-            pid = registry.get(display_name)
-            if not pid:
-                continue
-            p = get_or_create_player(players, pid, display_name, people)
-            p.add_match(fmt_key, match_id)
-            p.formats_played.add(fmt_key)
+        for pid, display_name in members:
+            i = get_or_create_player(players, pid, display_name, people)
+            if i not in counted:
+                counted.add(i)
+                matches[i] += 1
+            players.formats_played[i].add(fmt_key)
 
             # Set country from international team name (first time wins)
-            if is_international and not p.country:
-                p.country = team_name
+            if is_international and not players.countries[i]:
+                players.countries[i] = team_name
 
             # IPL franchise tracking
             if format_key == "ipl":
                 abbr = IPL_TEAM_MAP.get(team_name)
                 if abbr:
-                    p.ipl_teams.add(abbr)
+                    players.ipl_teams[i].add(abbr)
 
             pids_in_team.append(pid)
         team_pid_map[team_name] = pids_in_team
 
-    # 2) Teammate relationships (within same team XI in same match)
+    # 2) Teammate relationships (within same team XI in same match):
+    #    OR the whole XI's bitset into each member, minus their own bit
+    index, teammates = players.index, players.teammates
     for team_name, pids in team_pid_map.items():
-        for i, pid1 in enumerate(pids):
-            for pid2 in pids[i + 1:]:
-                if pid1 in players:
-                    players[pid1].teammates_set.add(pid2)
-                if pid2 in players:
-                    players[pid2].teammates_set.add(pid1)
-
-    # 3) Ball-by-ball stats
-    for innings_data in innings_list:
-        # Track per-batter runs in this innings for century detection
-        innings_batter_runs: dict[str, int] = defaultdict(int)
-
-        overs = innings_data.get("overs", [])
-        for over_data in overs:
-            for delivery in over_data.get("deliveries", []):
-                batter_name = delivery.get("batter")
-                bowler_name = delivery.get("bowler")
-                batter_pid = registry.get(batter_name) if batter_name else None
-                bowler_pid = registry.get(bowler_name) if bowler_name else None
-
-                runs_obj = delivery.get("runs", {})
-                batter_runs = runs_obj.get("batter", 0)
-
-                # Batting runs
-                if batter_pid and batter_pid in players:
-                    players[batter_pid].add_batting_runs(fmt_key, batter_runs)
-                    innings_batter_runs[batter_pid] += batter_runs
-
-                # Ball bowled
-                if bowler_pid and bowler_pid in players:
-                    players[bowler_pid].add_ball_bowled(fmt_key)
-
-                # Wickets
-                for wkt in delivery.get("wickets", []):
-                    kind = wkt.get("kind", "")
-
-                    # Bowler-credited wickets
-                    if kind in BOWLER_WICKET_KINDS:
-                        if bowler_pid and bowler_pid in players:
-                            players[bowler_pid].add_wicket(fmt_key)
-
-                    # Stumping → fielder is the WK
-                    if kind == "stumped":
-                        fielders = wkt.get("fielders", [])
-                        for f in fielders:
-                            fname = f.get("name") if isinstance(f, dict) else f
-                            if fname:
-                                fpid = registry.get(fname)
-                                if fpid and fpid in players:
-                                    players[fpid].stumpings_effected += 1
-
-        # Record innings scores for century detection
-        for pid, total in innings_batter_runs.items():
-            if pid in players:
-                players[pid].record_innings_score(fmt_key, total)
-
-    # 4) Trophy: check if this is a tournament final
+        rows = [index[pid] for pid in pids]
+        xi_mask = 0
+        for i in rows:
+            xi_mask |= 1 << i
+        for i in rows:
+            teammates[i] |= xi_mask & ~(1 << i)
+        team_label = IPL_TEAM_MAP.get(team_name, team_name) if format_key == "ipl" else team_name
+        players.add_xi((team_label, FORMAT_NAMES.get(format_key, format_key), season), rows)
+        if prof is not None:
+            prof["xis"] += 1
+            prof["teammate_pairs"] += len(rows) * (len(rows) - 1)
+
+    if prof is not None:
+        prof["register_xis_s"] += time.perf_counter() - t0
+    return team_pid_map
+
+
+def match_season(info: dict) -> str:
+    """Season of a match, as the year of its first day ("" if undated)."""
+    return (info.get("dates") or [""])[0][:4]
+
+
+def tournament_final(info: dict, team_pid_map: dict[str, list[str]]) -> dict | None:
+    """Return the finals entry if this match won a tracked trophy, else None."""
     event = info.get("event", {})
     event_name = event.get("name", "")
     stage = event.get("stage", "").lower() if isinstance(event.get("stage"), str) else ""
-    match_number = event.get("match_number", "")
 
     outcome = info.get("outcome", {})
     winner = outcome.get("winner", "")
@@ -528,63 +798,1092 @@ def process_match(
             if re.search(pattern, event_name, re.IGNORECASE):
                 # Collect winning team's playing XI
                 winning_pids = team_pid_map.get(winner, [])
-                finals.append({
+                return {
                     "trophy": trophy_key,
                     "event":  event_name,
                     "winner": winner,
                     "pids":   winning_pids,
-                    "year":   info.get("dates", [""])[0][:4],
-                })
-                break
+                    "year":   match_season(info),
+                }
+    return None
 
 
-def process_all_matches(
-    data_dir: Path,
+def process_deliveries(
+    deliveries: list[dict],
+    registry: dict[str, str],
+    fmt_key: str,
+    players: PlayerStore,
+    innings_batter_runs: dict[str, int],
+    strays: PlayerStore | None = None,
+):
+    """Accumulate batting, bowling and stumping stats for one over's deliveries."""
+    index = players.index
+    runs, balls, wickets = players.runs[fmt_key], players.balls[fmt_key], players.wickets[fmt_key]
+    prof = _counters
+    if prof is not None:
+        t0 = time.perf_counter()
+
+    for delivery in deliveries:
+        batter_name = delivery.get("batter")
+        bowler_name = delivery.get("bowler")
+        batter_pid = registry.get(batter_name) if batter_name else None
+        bowler_pid = registry.get(bowler_name) if bowler_name else None
+        bowler_i = index.get(bowler_pid) if bowler_pid else None
+
+        runs_obj = delivery.get("runs", {})
+        batter_runs = runs_obj.get("batter", 0)
+
+        # Batting runs
+        if batter_pid:
+            i = index.get(batter_pid)
+            if i is not None:
+                runs[i] += batter_runs
+                innings_batter_runs[batter_pid] += batter_runs
+            elif strays is not None:
+                strays.runs[fmt_key][strays.add(batter_pid)] += batter_runs
+                innings_batter_runs[batter_pid] += batter_runs
+
+        # Ball bowled
+        if bowler_i is not None:
+            balls[bowler_i] += 1
+        elif bowler_pid and strays is not None:
+            strays.balls[fmt_key][strays.add(bowler_pid)] += 1
+
+        # Wickets
+        for wkt in delivery.get("wickets", []):
+            kind = wkt.get("kind", "")
+
+            # Bowler-credited wickets
+            if kind in BOWLER_WICKET_KINDS:
+                if bowler_i is not None:
+                    wickets[bowler_i] += 1
+                elif bowler_pid and strays is not None:
+                    strays.wickets[fmt_key][strays.add(bowler_pid)] += 1
+
+            # Stumping → fielder is the WK
+            if kind == "stumped":
+                fielders = wkt.get("fielders", [])
+                for f in fielders:
+                    fname = f.get("name") if isinstance(f, dict) else f
+                    if fname:
+                        fpid = registry.get(fname)
+                        if fpid and fpid in index:
+                            players.stumpings[index[fpid]] += 1
+                        elif fpid and strays is not None:
+                            strays.stumpings[strays.add(fpid)] += 1
+
+    if prof is not None:
+        prof["delivery_loop_s"] += time.perf_counter() - t0
+        prof["deliveries"] += len(deliveries)
+        prof["wickets"] += sum(len(d.get("wickets", ())) for d in deliveries)
+
+
+def record_innings_scores(
+    innings_batter_runs: dict[str, int],
+    fmt_key: str,
+    players: PlayerStore,
+    strays: PlayerStore | None = None,
+):
+    """Count centuries from each batter's innings total."""
+    for pid, total in innings_batter_runs.items():
+        if total < 100:
+            continue
+        if pid in players.index:
+            players.centuries[fmt_key][players.index[pid]] += 1
+        elif strays is not None:
+            strays.centuries[fmt_key][strays.index[pid]] += 1
+
+
+def process_match(
+    match_data: dict,
+    match_id: str,
+    format_key: str,        # "tests", "odis", "t20is", "ipl"
+    players: PlayerStore,
     people: dict[str, dict],
-    quick: bool = False,
-) -> tuple[dict[str, PlayerData], list]:
-    """Process all match ZIPs and return (players_dict, finals_list)."""
-    print("\n>> Phase 3: Processing match files")
+    finals: list,
+    strays: PlayerStore | None = None,
+):
+    """
+    Process one match JSON file.
+
+    Updates `players` in-place with stats, teammates, IPL teams.
+    Appends to `finals` if this match is a tournament final.
+
+    Deliveries credited to someone who is not (yet) in `players` are
+    dropped, unless `strays` is given — then they are accumulated there,
+    so a partial built on a worker can be merged exactly (see merge_partial).
+    """
+    fmt_key = _FMT_KEY_MAP.get(format_key, format_key)
+
+    info = match_data.get("info", {})
+    innings_list = match_data.get("innings", [])
+
+    # ── Registry: display_name → cricsheet_id ────────────────
+    registry = info.get("registry", {}).get("people", {})
+
+    # 1) + 2) Playing XIs, matches, country, IPL teams, teammates
+    team_pid_map = register_playing_xis(
+        match_playing_xis(info), match_id, format_key, players, people, match_season(info))
+
+    # 3) Ball-by-ball stats
+    for innings_data in innings_list:
+        # Track per-batter runs in this innings for century detection
+        innings_batter_runs: dict[str, int] = defaultdict(int)
+
+        for over_data in innings_data.get("overs", []):
+            process_deliveries(over_data.get("deliveries", []), registry, fmt_key,
+                               players, innings_batter_runs, strays)
+
+        record_innings_scores(innings_batter_runs, fmt_key, players, strays)
+
+    # 4) Trophy: check if this is a tournament final
+    final = tournament_final(info, team_pid_map)
+    if final:
+        finals.append(final)
+
+
+# ── Streaming match reader ──────────────────────────────────────
+# Walks a match file as  info → innings → overs  without ever holding the
+# whole delivery tree: only the value currently being decoded (the info
+# block, or a single over) is materialised. Peak memory stays flat however
+# long the match is.
+
+_STREAM_CHUNK = 64 * 1024
+_json_decoder = json.JSONDecoder()
+
+
+class _MatchStream:
+    """Minimal pull parser over a text stream for the Cricsheet match layout."""
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(_STREAM_CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, msg: str):
+        raise json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            self._error(f"Expecting {ch!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number (or anything) ending exactly at the buffer edge may continue
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def key(self) -> str:
+        k = self.value()
+        if not isinstance(k, str):
+            self._error("Expecting property name")
+        self.expect(":")
+        return k
+
+    def members(self):
+        """Iterate the keys of an object; caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            yield self.key()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                self._error("Expecting ',' delimiter")
+
+    def items(self):
+        """Iterate the elements of an array; caller consumes each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                self._error("Expecting ',' delimiter")
+
+
+def iter_match_events(fp):
+    """
+    Yield ("info", info) / ("innings", None) / ("over", over) / ("innings_end", None)
+    events for one match file.
+
+    Cricsheet writes "info" before "innings"; should a file ever put the
+    innings first, they are decoded whole and replayed after the info block.
+    """
+    stream = _MatchStream(fp)
+    seen_info = False
+    held_innings = None
+    for key in stream.members():
+        if key == "info":
+            seen_info = True
+            yield "info", stream.value()
+            for innings_data in held_innings or []:
+                yield "innings", None
+                for over_data in innings_data.get("overs", []):
+                    yield "over", over_data
+                yield "innings_end", None
+        elif key == "innings" and not seen_info:
+            held_innings = stream.value()
+        elif key == "innings":
+            for _ in stream.items():
+                yield "innings", None
+                for inn_key in stream.members():
+                    if inn_key == "overs":
+                        for _ in stream.items():
+                            yield "over", stream.value()
+                    else:
+                        stream.value()
+                yield "innings_end", None
+        else:
+            stream.value()
+
+
+def process_match_stream(
+    fp,
+    match_id: str,
+    format_key: str,
+    players: PlayerStore,
+    people: dict[str, dict],
+    finals: list,
+    strays: PlayerStore | None = None,
+) -> dict | None:
+    """
+    Streaming equivalent of process_match for an open text stream.
+
+    Returns the match info, or None if the match was skipped (non-male
+    cricket) — in which case the deliveries are never read.
+    """
+    fmt_key = _FMT_KEY_MAP.get(format_key, format_key)
+    info = None
+    registry: dict[str, str] = {}
+    team_pid_map: dict[str, list[str]] = {}
+    innings_batter_runs: dict[str, int] = defaultdict(int)
+
+    for event, payload in iter_match_events(fp):
+        if event == "over":
+            process_deliveries(payload.get("deliveries", []), registry, fmt_key,
+                               players, innings_batter_runs, strays)
+        elif event == "innings":
+            innings_batter_runs = defaultdict(int)
+        elif event == "innings_end":
+            record_innings_scores(innings_batter_runs, fmt_key, players, strays)
+        elif event == "info":
+            info = payload
+            # Filter to male cricket only
+            if info.get("gender", "male") != "male":
+                return None
+            registry = info.get("registry", {}).get("people", {})
+            team_pid_map = register_playing_xis(
+                match_playing_xis(info), match_id, format_key, players, people,
+                match_season(info))
+
+    if info is None:
+        info = {}
+    final = tournament_final(info, team_pid_map)
+    if final:
+        finals.append(final)
+    return info
+
+
+def _read_match(zf: zipfile.ZipFile, entry_name: str) -> dict:
+    """Decompress and decode one match file from an open ZIP."""
+    prof = _counters
+    if prof is None:
+        with zf.open(entry_name) as f:
+            return json.loads(f.read())
+
+    t0 = time.perf_counter()
+    with zf.open(entry_name) as f:
+        raw = f.read()
+    t1 = time.perf_counter()
+    match_data = json.loads(raw)
+    prof["zip_read_s"] += t1 - t0
+    prof["json_loads_s"] += time.perf_counter() - t1
+    prof["matches_read"] += 1
+    prof["json_bytes"] += len(raw)
+    return match_data
+
+
+def process_zip_entry(
+    zf: zipfile.ZipFile,
+    entry_name: str,
+    format_key: str,
+    players: PlayerStore,
+    people: dict[str, dict],
+    finals: list,
+    strays: PlayerStore | None = None,
+    stream: bool = False,
+) -> bool:
+    """
+    Parse and process one match file from an open ZIP.
+
+    Returns False if the match was skipped (non-male cricket).
+    Parse errors propagate to the caller.
+    """
+    # Use filename (without ext) as match ID
+    match_id = Path(entry_name).stem
+
+    if stream:
+        # Stream into a one-match partial so a file that turns out to be
+        # malformed halfway through leaves no trace in the totals
+        part = PlayerStore()
+        part_strays = PlayerStore()
+        part_finals: list[dict] = []
+        with zf.open(entry_name) as f:
+            info = process_match_stream(TextIOWrapper(f, encoding="utf-8"), match_id,
+                                        format_key, part, people, part_finals, part_strays)
+        if info is None:
+            return False
+        if strays is not None:
+            # Caller is itself building a partial: pass strays through untouched
+            players.merge(part_strays, known_only=True)
+            strays.merge(part_strays, exclude=players.index)
+            merge_partial(players, finals, part, PlayerStore(), part_finals)
+        else:
+            merge_partial(players, finals, part, part_strays, part_finals)
+        return True
+
+    match_data = _read_match(zf, entry_name)
+
+    # Filter to male cricket only
+    gender = match_data.get("info", {}).get("gender", "male")
+    if gender != "male":
+        return False
+
+    process_match(match_data, match_id, format_key, players, people, finals, strays)
+    return True
+
+
+def merge_partial(
+    players: PlayerStore,
+    finals: list,
+    part_players: PlayerStore,
+    part_strays: PlayerStore,
+    part_finals: list,
+):
+    """
+    Fold a partial accumulator (built over a contiguous run of matches)
+    into the running totals.
+
+    Partials must be merged in match order. Strays are applied first,
+    against the players known *before* this run — exactly the deliveries
+    a serial pass would have credited.
+    """
+    players.merge(part_strays, known_only=True)
+    players.merge(part_players)
+    finals.extend(part_finals)
+
+
+# Per-worker copy of the people register (set once by the pool initializer)
+_worker_people: dict[str, dict] = {}
+
+
+def _init_worker(people: dict[str, dict], profile: bool = False):
+    global _worker_people, _counters
+    _worker_people = people
+    _counters = defaultdict(int) if profile else None
+
+
+def _take_counters() -> dict | None:
+    """Hand over (and reset) this process's --profile counters, e.g. from a pool worker."""
+    global _counters
+    if _counters is None:
+        return None
+    taken, _counters = dict(_counters), defaultdict(int)
+    return taken
+
+
+def _add_counters(counters: dict | None):
+    """
+    Fold a pool worker's counters into ours. Its timers are kept apart (as
+    "workers:..."): summed over processes they can exceed the phase's wall time.
+    """
+    if counters and _counters is not None:
+        for key, value in counters.items():
+            _counters["workers:" + key if key.endswith("_s") else key] += value
+
+
+def _process_chunk(zip_path: str, format_key: str, entry_names: list[str], stream: bool = False):
+    """Worker: process a contiguous slice of one ZIP into a partial accumulator."""
+    players = PlayerStore()
+    strays = PlayerStore()
+    finals: list[dict] = []
+    count = 0
+    errors: list[str] = []
+
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        for entry_name in entry_names:
+            try:
+                if process_zip_entry(zf, entry_name, format_key, players,
+                                     _worker_people, finals, strays, stream):
+                    count += 1
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                errors.append(f"{entry_name}: {e}")
+
+    return players, strays, finals, count, errors, _take_counters()
+
+
+def _process_all_parallel(
+    zip_jobs: list[tuple[str, Path, list[str]]],
+    people: dict[str, dict],
+    workers: int,
+    stream: bool = False,
+) -> tuple[PlayerStore, list, int]:
+    """Fan ZIP entries out to a process pool and merge partials in order."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Contiguous slices, several per worker so uneven match sizes balance out
+    tasks: list[tuple[str, str, list[str]]] = []
+    for format_key, zip_path, json_files in zip_jobs:
+        if not json_files:
+            tasks.append((str(zip_path), format_key, []))
+            continue
+        n_chunks = min(len(json_files), workers * 4)
+        step = -(-len(json_files) // n_chunks)
+        for start in range(0, len(json_files), step):
+            tasks.append((str(zip_path), format_key, json_files[start:start + step]))
+
+    players = PlayerStore()
+    finals: list[dict] = []
+    total_matches = 0
+    fmt_count: dict[str, int] = defaultdict(int)
+    fmt_errors: dict[str, int] = defaultdict(int)
+    fmt_tasks_left: dict[str, int] = defaultdict(int)
+    for _, format_key, _ in tasks:
+        fmt_tasks_left[format_key] += 1
+
+    print(f"\n  Processing {sum(len(j[2]) for j in zip_jobs):,} match files "
+          f"in {len(tasks)} chunks on {workers} workers ...")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(people, _counters is not None)) as pool:
+        results = pool.map(_process_chunk, *zip(*tasks), [stream] * len(tasks))
+        for (_, format_key, _), (part_players, part_strays, part_finals, count, errors,
+                                 counters) in zip(tasks, results):
+            merge_partial(players, finals, part_players, part_strays, part_finals)
+            _add_counters(counters)
+            fmt_count[format_key] += count
+            for err in errors:
+                fmt_errors[format_key] += 1
+                if fmt_errors[format_key] <= 3:
+                    print(f"    [ERR] {err}")
+
+            fmt_tasks_left[format_key] -= 1
+            if fmt_tasks_left[format_key] == 0:
+                total_matches += fmt_count[format_key]
+                n_err = fmt_errors[format_key]
+                suffix = f" ({n_err} errors)" if n_err else ""
+                print(f"  ✓ {FORMAT_NAMES[format_key]}: {fmt_count[format_key]:,} matches processed{suffix}")
+
+    return players, finals, total_matches
+
+
+# ── Incremental match cache ─────────────────────────────────────
+# One JSON file per format ZIP, keyed by entry name. Each entry stores the
+# entry's CRC-32 plus that match's contribution (XIs, per-player delivery
+# stats, finals), so reruns only parse new or changed matches and rebuild
+# the aggregate from the cached records. Bump MATCH_CACHE_VERSION whenever
+# process_match changes what it counts.
+
+MATCH_CACHE_VERSION = 4
+
+
+@contextmanager
+def _match_counts():
+    """
+    Count one match on the side while it is parsed for the cache. The
+    yielded counters end up in the record (see _match_record) and reach
+    --profile only when the record is applied, so a cold cache doesn't
+    count its XIs twice. Timers are this run's work and pass straight on.
+    """
+    global _counters
+    outer, _counters = _counters, defaultdict(int)
+    try:
+        yield _counters
+    finally:
+        counts, _counters = _counters, outer
+        if outer is not None:
+            for key, value in counts.items():
+                if key.endswith("_s"):
+                    outer[key] += value
+
+
+def build_match_record(match_data: dict, match_id: str, format_key: str) -> dict:
+    """Capture one match's contribution in a compact, JSON-serialisable form."""
+    part = PlayerStore()
+    strays = PlayerStore()
+    finals: list[dict] = []
+    with _match_counts() as counts:
+        process_match(match_data, match_id, format_key, part, {}, finals, strays)
+    return _match_record(match_data.get("info", {}), format_key, part, strays, finals, counts)
+
+
+def _match_record(
+    info: dict,
+    format_key: str,
+    part: PlayerStore,
+    strays: PlayerStore,
+    finals: list[dict],
+    counts: dict,
+) -> dict:
+    fmt_key = _FMT_KEY_MAP.get(format_key, format_key)
+
+    # pid → [runs, wickets, balls bowled, stumpings, centuries]
+    stats: dict[str, list] = {}
+    for store in (part, strays):
+        for i, pid in enumerate(store.ids):
+            row = [
+                store.runs[fmt_key][i],
+                store.wickets[fmt_key][i],
+                store.balls[fmt_key][i],
+                store.stumpings[i],
+                store.centuries[fmt_key][i],
+            ]
+            if any(row):
+                stats[pid] = row
+
+    xis = match_playing_xis(info)
+    return {
+        "xi":     [[team, [list(m) for m in members]] for team, members in xis],
+        "season": match_season(info),
+        "stats":  stats,
+        "finals": finals,
+        "counts": [counts["deliveries"], counts["wickets"]],   # for --profile
+    }
+
+
+def _add_stats_row(players: PlayerStore, i: int, fmt_key: str, row: list):
+    runs, wickets, balls, stumpings, centuries = row
+    players.runs[fmt_key][i] += runs
+    players.wickets[fmt_key][i] += wickets
+    players.balls[fmt_key][i] += balls
+    players.stumpings[i] += stumpings
+    players.centuries[fmt_key][i] += centuries
+
+
+def apply_match_record(
+    record: dict,
+    match_id: str,
+    format_key: str,
+    players: PlayerStore,
+    people: dict[str, dict],
+    finals: list,
+):
+    """Replay a cached match record — same effect as process_match on the original JSON."""
+    fmt_key = _FMT_KEY_MAP.get(format_key, format_key)
+    xi_pids = {pid for _, members in record["xi"] for pid, _ in members}
+
+    register_playing_xis(record["xi"], match_id, format_key, players, people, record["season"])
+    if _counters is not None:
+        deliveries, wickets = record["counts"]
+        _counters["deliveries"] += deliveries
+        _counters["wickets"] += wickets
+
+    # Deliveries by someone outside both XIs only count if they are already known
+    for pid, row in record["stats"].items():
+        if pid in xi_pids or pid in players:
+            _add_stats_row(players, players.index[pid], fmt_key, row)
+
+    finals.extend(record["finals"])
+
+
+def _build_cache_entry(
+    zf: zipfile.ZipFile,
+    entry_name: str,
+    crc: int,
+    format_key: str,
+    stream: bool = False,
+) -> dict:
+    """Parse one ZIP entry into its cache entry (match record, skip or error)."""
+    match_id = Path(entry_name).stem
+    try:
+        if stream:
+            part = PlayerStore()
+            strays = PlayerStore()
+            finals: list[dict] = []
+            with zf.open(entry_name) as f, _match_counts() as counts:
+                info = process_match_stream(TextIOWrapper(f, encoding="utf-8"), match_id,
+                                            format_key, part, {}, finals, strays)
+            if info is None:
+                return {"crc": crc, "skip": True}
+            record = _match_record(info, format_key, part, strays, finals, counts)
+            return {"crc": crc, "match": record}
+
+        match_data = _read_match(zf, entry_name)
+        if match_data.get("info", {}).get("gender", "male") != "male":
+            return {"crc": crc, "skip": True}
+        record = build_match_record(match_data, match_id, format_key)
+        return {"crc": crc, "match": record}
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        return {"crc": crc, "error": str(e)}
+
+
+def _build_cache_chunk(
+    zip_path: str,
+    format_key: str,
+    entries: list[tuple[str, int]],
+    stream: bool = False,
+) -> tuple[list[dict], dict | None]:
+    """Worker: build cache entries for a slice of one ZIP (plus its --profile counters)."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        built = [_build_cache_entry(zf, name, crc, format_key, stream) for name, crc in entries]
+    return built, _take_counters()
+
+
+def _load_match_cache(path: Path) -> dict[str, dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MATCH_CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _save_match_cache(path: Path, entries: dict[str, dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MATCH_CACHE_VERSION, "entries": entries}, f,
+                  ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _process_all_cached(
+    zip_jobs: list[tuple[str, Path, list[str]]],
+    people: dict[str, dict],
+    cache_dir: Path,
+    quick: bool,
+    workers: int,
+    stream: bool = False,
+) -> tuple[PlayerStore, list, int]:
+    """Rebuild the aggregate from cached match records, parsing only new/changed entries."""
+    players = PlayerStore()
+    finals: list[dict] = []
+    total_matches = 0
+    max_per_format = 200 if quick else None
+
+    for format_key, zip_path, json_files in zip_jobs:
+        fmt_label = FORMAT_NAMES[format_key]
+        print(f"\n  Processing {fmt_label} matches from {zip_path.name} ...")
+
+        cache_path = cache_dir / f"{format_key}.json"
+        cached = _load_match_cache(cache_path)
+
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            crcs = {zi.filename: zi.CRC for zi in zf.infolist()}
+            fresh: dict[str, dict] = {}
+
+            def is_cached(name: str) -> bool:
+                return name in cached and cached[name].get("crc") == crcs[name]
+
+            # Parse all stale entries up front on the pool (not in --quick mode,
+            # which only needs the first few hundred)
+            stale = [(n, crcs[n]) for n in json_files if not is_cached(n)]
+            if workers > 1 and not quick and len(stale) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                step = -(-len(stale) // min(len(stale), workers * 4))
+                chunks = [stale[i:i + step] for i in range(0, len(stale), step)]
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=({}, _counters is not None)) as pool:
+                    for chunk, (built, counters) in zip(chunks, pool.map(
+                            _build_cache_chunk, [str(zip_path)] * len(chunks),
+                            [format_key] * len(chunks), chunks, [stream] * len(chunks))):
+                        for (name, _), entry in zip(chunk, built):
+                            fresh[name] = entry
+                        _add_counters(counters)
+
+            count = 0
+            errors = 0
+            for entry_name in json_files:
+                if max_per_format and count >= max_per_format:
+                    break
+
+                entry = fresh.get(entry_name)
+                if entry is None:
+                    if is_cached(entry_name):
+                        entry = cached[entry_name]
+                        if _counters is not None:
+                            _counters["cache_hits"] += 1
+                    else:
+                        entry = fresh[entry_name] = _build_cache_entry(
+                            zf, entry_name, crcs[entry_name], format_key, stream)
+
+                if "error" in entry:
+                    errors += 1
+                    if errors <= 3:
+                        print(f"    [ERR] {entry_name}: {entry['error']}")
+                    continue
+                if entry.get("skip"):
+                    continue
+
+                apply_match_record(entry["match"], Path(entry_name).stem, format_key,
+                                   players, people, finals)
+                count += 1
 
-    players: dict[str, PlayerData] = {}
+                # Progress
+                if count % 500 == 0:
+                    print(f"    ... {count:,} / {len(json_files):,} processed")
+
+        # Keep still-valid entries for matches that are still in the ZIP
+        entries = {}
+        for name in json_files:
+            if name in fresh:
+                entries[name] = fresh[name]
+            elif is_cached(name):
+                entries[name] = cached[name]
+        if fresh or len(entries) != len(cached):
+            _save_match_cache(cache_path, entries)
+
+        total_matches += count
+        suffix = f" ({errors} errors)" if errors else ""
+        print(f"  ✓ {fmt_label}: {count:,} matches processed{suffix}"
+              f" — {len(fresh):,} parsed, rest from cache")
+
+    return players, finals, total_matches
+
+
+# ── Delivery-table engine (NumPy) ───────────────────────────────
+# Alternative to the per-delivery counters: walk every match once, appending
+# each delivery to integer-coded columns, then derive all per-player
+# delivery stats with grouped NumPy reductions. XIs, matches, countries,
+# teammates and finals are still registered per match as usual.
+#
+# A delivery only counts for a player who was already in `players` when it
+# was bowled — i.e. whose first XI appearance is at or before that match —
+# which is exactly what the per-delivery engine credits.
+
+class DeliveryTable:
+    """Integer-coded delivery, wicket and stumping tables for a whole run."""
+
+    def __init__(self):
+        self.pids: dict[str, int] = {}                    # cricsheet_id → player code
+        self.first_match: dict[int, int] = {}             # player code → first XI match
+        self.kinds: dict[str, int] = {}                   # dismissal kind → code
+        self.innings_fmt = array("b")                     # innings → format code
+        self.n_matches = 0
+
+        # One row per delivery
+        self.match = array("i")
+        self.fmt = array("b")
+        self.innings = array("i")
+        self.batter = array("i")                          # player code, -1 if none
+        self.bowler = array("i")
+        self.runs = array("i")                            # batter runs
+
+        # One row per wicket / per stumping fielder, pointing at its delivery
+        self.wkt_delivery = array("i")
+        self.wkt_kind = array("b")
+        self.stumping_delivery = array("i")
+        self.stumping_fielder = array("i")
+
+    def code(self, pid: str | None) -> int:
+        if not pid:
+            return -1
+        c = self.pids.get(pid)
+        if c is None:
+            c = self.pids[pid] = len(self.pids)
+        return c
+
+    def kind_code(self, kind: str) -> int:
+        c = self.kinds.get(kind)
+        if c is None:
+            c = self.kinds[kind] = len(self.kinds)
+        return c
+
+    def add_match(
+        self,
+        match_data: dict,
+        match_id: str,
+        format_key: str,
+        players: PlayerStore,
+        people: dict[str, dict],
+        finals: list,
+    ):
+        """Register one match's XIs and append its deliveries to the table."""
+        fmt = FORMAT_KEYS.index(_FMT_KEY_MAP.get(format_key, format_key))
+        info = match_data.get("info", {})
+        registry = info.get("registry", {}).get("people", {})
+        m = self.n_matches
+        self.n_matches += 1
+
+        new_from = len(players)
+        team_pid_map = register_playing_xis(
+            match_playing_xis(info), match_id, format_key, players, people, match_season(info))
+        for pid in players.ids[new_from:]:
+            self.first_match[self.code(pid)] = m
+
+        prof = _counters
+        if prof is not None:
+            t0, rows_from, wkts_from = time.perf_counter(), len(self.match), len(self.wkt_delivery)
+        for innings_data in match_data.get("innings", []):
+            inn = len(self.innings_fmt)
+            self.innings_fmt.append(fmt)
+            for over_data in innings_data.get("overs", []):
+                for delivery in over_data.get("deliveries", []):
+                    batter_name = delivery.get("batter")
+                    bowler_name = delivery.get("bowler")
+                    row = len(self.match)
+                    self.match.append(m)
+                    self.fmt.append(fmt)
+                    self.innings.append(inn)
+                    self.batter.append(self.code(registry.get(batter_name) if batter_name else None))
+                    self.bowler.append(self.code(registry.get(bowler_name) if bowler_name else None))
+                    self.runs.append(delivery.get("runs", {}).get("batter", 0))
+
+                    for wkt in delivery.get("wickets", []):
+                        kind = wkt.get("kind", "")
+                        self.wkt_delivery.append(row)
+                        self.wkt_kind.append(self.kind_code(kind))
+                        if kind == "stumped":
+                            for f in wkt.get("fielders", []):
+                                fname = f.get("name") if isinstance(f, dict) else f
+                                fpid = registry.get(fname) if fname else None
+                                if fpid:
+                                    self.stumping_delivery.append(row)
+                                    self.stumping_fielder.append(self.code(fpid))
+        if prof is not None:
+            prof["delivery_loop_s"] += time.perf_counter() - t0
+            prof["deliveries"] += len(self.match) - rows_from
+            prof["wickets"] += len(self.wkt_delivery) - wkts_from
+
+        final = tournament_final(info, team_pid_map)
+        if final:
+            finals.append(final)
+
+    def aggregate(self, players: PlayerStore):
+        """Fill the delivery-stat columns of `players` from the table."""
+        import numpy as np
+
+        n = max(len(self.pids), 1)
+        n_fmt = len(FORMAT_KEYS)
+
+        def col(a, dtype=np.int64):
+            return np.frombuffer(a, dtype=a.typecode).astype(dtype) if len(a) else np.zeros(0, dtype)
+
+        match, fmt, innings = col(self.match), col(self.fmt), col(self.innings)
+        batter, bowler, runs = col(self.batter), col(self.bowler), col(self.runs)
+
+        # First match each code was in `players` (never → past the last match)
+        first = np.full(n, self.n_matches, dtype=np.int64)
+        if self.first_match:
+            first[np.fromiter(self.first_match.keys(), np.int64)] = \
+                np.fromiter(self.first_match.values(), np.int64)
+
+        def credited(who, when):
+            return (who >= 0) & (first[np.maximum(who, 0)] <= when)
+
+        def per_player(who, fmt_codes, weights=None):
+            key = who * n_fmt + fmt_codes
+            counts = np.bincount(key, weights=weights, minlength=n * n_fmt)
+            return counts.round().astype(np.int64).reshape(n, n_fmt)
+
+        bat_ok = credited(batter, match)
+        bowl_ok = credited(bowler, match)
+        runs_by = per_player(batter[bat_ok], fmt[bat_ok], runs[bat_ok])
+        balls_by = per_player(bowler[bowl_ok], fmt[bowl_ok])
+
+        # Bowler-credited wickets
+        wd, wk = col(self.wkt_delivery), col(self.wkt_kind)
+        bowler_kinds = np.array([c for k, c in self.kinds.items() if k in BOWLER_WICKET_KINDS] or [-1])
+        w_ok = np.isin(wk, bowler_kinds) & bowl_ok[wd]
+        wickets_by = per_player(bowler[wd[w_ok]], fmt[wd[w_ok]])
+
+        # Stumpings
+        sd, sf = col(self.stumping_delivery), col(self.stumping_fielder)
+        s_ok = credited(sf, match[sd])
+        stumpings_by = np.bincount(sf[s_ok], minlength=n)
+
+        # Centuries: group credited deliveries by (innings, batter)
+        key = innings[bat_ok] * n + batter[bat_ok]
+        groups, inverse = np.unique(key, return_inverse=True)
+        totals = np.bincount(inverse, weights=runs[bat_ok])
+        hundreds = groups[totals >= 100]
+        innings_fmt = col(self.innings_fmt)
+        centuries_by = per_player(hundreds % n, innings_fmt[hundreds // n])
+
+        rows = np.fromiter((self.pids[pid] for pid in players.ids), np.int64, len(players))
+        for f, fmt_key in enumerate(FORMAT_KEYS):
+            players.runs[fmt_key] = array("i", runs_by[rows, f].tolist())
+            players.balls[fmt_key] = array("i", balls_by[rows, f].tolist())
+            players.wickets[fmt_key] = array("i", wickets_by[rows, f].tolist())
+            players.centuries[fmt_key] = array("i", centuries_by[rows, f].tolist())
+        players.stumpings = array("i", stumpings_by[rows].tolist())
+
+
+def _process_all_numpy(
+    zip_jobs: list[tuple[str, Path, list[str]]],
+    people: dict[str, dict],
+    quick: bool,
+) -> tuple[PlayerStore, list, int]:
+    """Build the delivery table over all ZIPs, then aggregate it in one pass."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("ERROR: --engine numpy needs NumPy. Run: python3 -m pip install numpy")
+        sys.exit(1)
+
+    players = PlayerStore()
     finals: list[dict] = []
+    table = DeliveryTable()
     total_matches = 0
     max_per_format = 200 if quick else None
 
+    for format_key, zip_path, json_files in zip_jobs:
+        fmt_label = FORMAT_NAMES[format_key]
+        print(f"\n  Processing {fmt_label} matches from {zip_path.name} ...")
+
+        count = 0
+        errors = 0
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            for entry_name in json_files:
+                if max_per_format and count >= max_per_format:
+                    break
+                try:
+                    match_data = _read_match(zf, entry_name)
+                    if match_data.get("info", {}).get("gender", "male") != "male":
+                        continue
+                    table.add_match(match_data, Path(entry_name).stem, format_key,
+                                    players, people, finals)
+                    count += 1
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    errors += 1
+                    if errors <= 3:
+                        print(f"    [ERR] {entry_name}: {e}")
+
+                if count % 500 == 0 and count > 0:
+                    print(f"    ... {count:,} / {len(json_files):,} processed")
+
+        total_matches += count
+        suffix = f" ({errors} errors)" if errors else ""
+        print(f"  ✓ {fmt_label}: {count:,} matches processed{suffix}")
+
+    print(f"\n  Aggregating {len(table.match):,} deliveries ...")
+    with _timed("aggregate_s"):
+        table.aggregate(players)
+    return players, finals, total_matches
+
+
+def process_all_matches(
+    data_dir: Path,
+    people: dict[str, dict],
+    quick: bool = False,
+    workers: int = 1,
+    cache_dir: Path | None = None,
+    stream: bool = False,
+    engine: str = "python",
+) -> tuple[PlayerStore, list]:
+    """
+    Process all match ZIPs and return (players_dict, finals_list).
+
+    With workers > 1 the matches are processed on a process pool; the
+    result is identical to the serial run. --quick always runs serially
+    (its per-format cap depends on processing order).
+
+    With a cache_dir, per-match results are cached there and only new or
+    changed ZIP entries (by name + CRC) are parsed again.
+
+    With stream=True each match file is walked incrementally (see
+    iter_match_events) instead of being loaded whole with json.loads.
+
+    engine="numpy" collects a delivery table and aggregates it with NumPy
+    (see DeliveryTable); it always runs serially and bypasses the cache.
+    """
+    print("\n>> Phase 3: Processing match files")
+
+    zip_jobs: list[tuple[str, Path, list[str]]] = []
     for format_key in ["tests", "odis", "t20s", "ipl"]:
         zip_path = data_dir / f"{format_key}_json.zip"
         if not zip_path.exists():
             print(f"  [WARN] {zip_path.name} not found, skipping")
             continue
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            json_files = [n for n in zf.namelist() if n.endswith(".json")]
+        zip_jobs.append((format_key, zip_path, json_files))
 
+    if engine == "numpy":
+        players, finals, total_matches = _process_all_numpy(zip_jobs, people, quick)
+        print(f"\n  Total: {total_matches:,} matches | {len(players):,} unique players found")
+        return players, finals
+
+    if cache_dir is not None:
+        players, finals, total_matches = _process_all_cached(
+            zip_jobs, people, cache_dir, quick, workers, stream)
+        print(f"\n  Total: {total_matches:,} matches | {len(players):,} unique players found")
+        return players, finals
+
+    if workers > 1 and not quick:
+        players, finals, total_matches = _process_all_parallel(zip_jobs, people, workers, stream)
+        print(f"\n  Total: {total_matches:,} matches | {len(players):,} unique players found")
+        return players, finals
+
+    players = PlayerStore()
+    finals: list[dict] = []
+    total_matches = 0
+    max_per_format = 200 if quick else None
+
+    for format_key, zip_path, json_files in zip_jobs:
         fmt_label = FORMAT_NAMES[format_key]
         print(f"\n  Processing {fmt_label} matches from {zip_path.name} ...")
 
         count = 0
         errors = 0
+        total_in_zip = len(json_files)
 
         with zipfile.ZipFile(zip_path, "r") as zf:
-            json_files = [n for n in zf.namelist() if n.endswith(".json")]
-            total_in_zip = len(json_files)
-
             for entry_name in json_files:
                 if max_per_format and count >= max_per_format:
                     break
 
                 try:
-                    with zf.open(entry_name) as f:
-                        raw = f.read()
-                        match_data = json.loads(raw)
-
-                    # Use filename (without ext) as match ID
-                    match_id = Path(entry_name).stem
-
-                    # Filter to male cricket only
-                    gender = match_data.get("info", {}).get("gender", "male")
-                    if gender != "male":
+                    if not process_zip_entry(zf, entry_name, format_key, players, people,
+                                             finals, stream=stream):
                         continue
-
-                    process_match(match_data, match_id, format_key, players, people, finals)
                     count += 1
 
                 except (json.JSONDecodeError, KeyError, TypeError) as e:
@@ -608,28 +1907,37 @@ def process_all_matches(
 #  PHASE 4 — POST-PROCESSING
 # ════════════════════════════════════════════════════════════════
 
-def _name_matches(player_name: str, patterns: list[str]) -> bool:
-    """Check if any pattern matches the player name as a whole-word boundary."""
-    name_lower = player_name.lower()
-    for pat in patterns:
-        if pat in _SPINNER_BLACKLIST:
-            continue
-        pat_lower = pat.lower()
-        # Use word-boundary matching to avoid "Warne" matching "Warner"
-        if re.search(r'\b' + re.escape(pat_lower) + r'\b', name_lower):
-            return True
-    return False
+def _compile_name_patterns(patterns: list[str]) -> re.Pattern:
+    """
+    Compile a curated name list into one whole-word alternation regex over
+    lowercased names, with blacklisted entries dropped up front.
+    """
+    alternatives = sorted({re.escape(pat.lower()) for pat in patterns
+                           if pat not in _SPINNER_BLACKLIST}, key=len, reverse=True)
+    if not alternatives:
+        return re.compile(r"(?!)")
+    # Use word-boundary matching to avoid "Warne" matching "Warner"
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+
 
+_SPINNER_RE = _compile_name_patterns(KNOWN_SPINNERS)
+_WICKETKEEPER_RE = _compile_name_patterns(KNOWN_WICKETKEEPERS)
 
-def classify_roles(players: dict[str, PlayerData]):
+
+def _name_matches(player_name: str, pattern: re.Pattern) -> bool:
+    """Check if any curated name matches the player name as a whole word."""
+    return pattern.search(player_name.lower()) is not None
+
+
+def classify_roles(players: PlayerStore):
     """Assign primaryRole to each player based on stats + curated lists."""
     print("\n>> Phase 4a: Classifying player roles")
 
     role_counts: dict[str, int] = defaultdict(int)
 
     for p in players.values():
-        is_spinner = _name_matches(p.name, KNOWN_SPINNERS)
-        is_wk = p.stumpings_effected >= 3 or _name_matches(p.name, KNOWN_WICKETKEEPERS)
+        is_spinner = _name_matches(p.name, _SPINNER_RE)
+        is_wk = p.stumpings_effected >= 3 or _name_matches(p.name, _WICKETKEEPER_RE)
         total_wkts = p.total_wickets + p.ipl_wickets
         total_balls = p.total_balls_bowled + p.ipl_balls_bowled
 
@@ -673,7 +1981,7 @@ def classify_roles(players: dict[str, PlayerData]):
         print(f"    {role}: {cnt}")
 
 
-def assign_trophies(players: dict[str, PlayerData], finals: list[dict]):
+def assign_trophies(players: PlayerStore, finals: list[dict]):
     """Assign trophy keys to players who were in winning XIs of tournament finals."""
     print("\n>> Phase 4b: Assigning trophies")
 
@@ -735,18 +2043,178 @@ def _classify_espn_role(role_str: str) -> str | None:
     return None
 
 
+ESPN_API_URL = "https://hs-consumer-api.espncricinfo.com"
+ESPN_PLAYER_PATH = "/v1/pages/player/home?playerId={}"
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, reason: str, retry_after: float | None = None):
+        super().__init__(f"HTTP {status} {reason}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class EspnFetcher:
+    """
+    Fetch ESPNcricinfo player pages on a thread pool.
+
+    Requests go through a shared token bucket and reuse one keep-alive
+    connection per thread. Transient failures (connection errors, 429,
+    5xx) are retried with exponential backoff. Responses are cached on
+    disk by a hash of key_cricinfo and reused until they are `ttl` seconds old.
+    """
+
+    RETRIES = 3
+    BACKOFF = 1.0           # seconds, doubled per attempt
+
+    def __init__(
+        self,
+        base_url: str = ESPN_API_URL,
+        rate: float = 2.0,
+        cache_dir: Path | None = None,
+        ttl: float = 30 * 86400,
+        timeout: float = 10,
+    ):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.bucket = _TokenBucket(rate, burst=max(1, int(rate)))
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+
+    # ── on-disk cache ──
+    def _cache_path(self, cricinfo_id: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(cricinfo_id.encode("utf-8")).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def cached(self, cricinfo_id: str) -> dict | None:
+        path = self._cache_path(cricinfo_id)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get("key") != cricinfo_id or time.time() - entry.get("fetched", 0) > self.ttl:
+            return None
+        return entry["data"]
+
+    def _store(self, cricinfo_id: str, data: dict):
+        path = self._cache_path(cricinfo_id)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": cricinfo_id, "fetched": time.time(), "data": data}, f,
+                      ensure_ascii=False)
+        os.replace(tmp, path)
+
+    # ── HTTP ──
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = HTTPSConnection if self.scheme == "https" else HTTPConnection
+            conn = self._local.conn = cls(self.netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _get(self, path: str) -> dict:
+        conn = self._connection()
+        try:
+            conn.request("GET", self.prefix + path,
+                         headers={"User-Agent": "CricketBingo/1.0", "Connection": "keep-alive"})
+            resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, HTTPException):
+            self._drop_connection()
+            raise
+        if resp.will_close:
+            self._drop_connection()
+        if resp.status != 200:
+            retry_after = resp.getheader("Retry-After")
+            raise _HTTPError(resp.status, resp.reason,
+                             float(retry_after) if retry_after and retry_after.isdigit() else None)
+        return json.loads(body.decode("utf-8"))
+
+    def fetch(self, cricinfo_id: str) -> dict:
+        """Player page JSON for one key_cricinfo, from cache or the API."""
+        data = self.cached(cricinfo_id)
+        if data is not None:
+            return data
+
+        path = ESPN_PLAYER_PATH.format(cricinfo_id)
+        for attempt in range(self.RETRIES + 1):
+            self.bucket.acquire()
+            try:
+                data = self._get(path)
+                break
+            except _HTTPError as e:
+                if (e.status != 429 and e.status < 500) or attempt == self.RETRIES:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else self.BACKOFF * 2 ** attempt
+            except (OSError, HTTPException):
+                if attempt == self.RETRIES:
+                    raise
+                delay = self.BACKOFF * 2 ** attempt
+            time.sleep(delay)
+
+        self._store(cricinfo_id, data)
+        return data
+
+
 def enrich_from_espncricinfo(
-    players: dict[str, PlayerData],
+    players: PlayerStore,
     people: dict[str, dict],
     selected_pids: list[str],
-    throttle: float = 0.5,
+    rate: float = 2.0,
+    workers: int = 8,
+    cache_dir: Path | None = None,
+    ttl_days: float = 30,
+    base_url: str = ESPN_API_URL,
 ):
     """
     Fetch full names, countries, and playing roles from ESPNcricinfo
     for players that have a key_cricinfo ID in the people register.
+
+    Pages are fetched concurrently (at most `rate` requests/second) and
+    cached under cache_dir for ttl_days; updates are applied in order.
     """
-    from urllib.request import Request, urlopen
-    from urllib.error import HTTPError, URLError
+    from concurrent.futures import ThreadPoolExecutor
 
     print("\n>> Phase 4c: Enriching player data from ESPNcricinfo")
 
@@ -760,64 +2228,73 @@ def enrich_from_espncricinfo(
 
     print(f"  Players with ESPNcricinfo IDs: {len(to_enrich)} / {len(selected_pids)}")
 
+    fetcher = EspnFetcher(base_url, rate=rate, cache_dir=cache_dir, ttl=ttl_days * 86400)
+    from_cache = sum(1 for _, cid in to_enrich if fetcher.cached(cid) is not None)
+    if from_cache:
+        print(f"  Cached responses: {from_cache} (fetching {len(to_enrich) - from_cache})")
+
+    def fetch(cricinfo_id: str):
+        try:
+            return fetcher.fetch(cricinfo_id), None
+        except Exception as e:
+            return None, e
+
     enriched = 0
     errors = 0
     name_updates = 0
     country_updates = 0
     role_updates = 0
 
-    for i, (pid, cricinfo_id) in enumerate(to_enrich):
-        url = f"https://hs-consumer-api.espncricinfo.com/v1/pages/player/home?playerId={cricinfo_id}"
-        try:
-            req = Request(url, headers={"User-Agent": "CricketBingo/1.0"})
-            with urlopen(req, timeout=10) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-
-            player_info = data.get("player", {})
-            p = players[pid]
-
-            # Full name
-            full_name = player_info.get("longName", "") or player_info.get("name", "")
-            if full_name and len(full_name) > len(p.name):
-                p.name = full_name
-                name_updates += 1
-
-            # Country
-            country_name = player_info.get("country", "")
-            if not isinstance(country_name, str):
-                # Sometimes it's an object
-                country_name = ""
-            # Try from countryTeamName field
-            if not country_name:
-                country_name = player_info.get("countryTeamName", "")
-            if country_name and not p.country:
-                p.country = country_name
-                country_updates += 1
-
-            # Playing role
-            playing_role = player_info.get("playingRole", "")
-            mapped_role = _classify_espn_role(playing_role)
-            if mapped_role:
-                p._role = mapped_role
-                role_updates += 1
-
-            enriched += 1
-
-        except (HTTPError, URLError, json.JSONDecodeError, KeyError, TimeoutError) as e:
-            errors += 1
-            if errors <= 5:
-                print(f"    [ERR] {pid} (cricinfo={cricinfo_id}): {e}")
-        except Exception as e:
-            errors += 1
-            if errors <= 5:
-                print(f"    [ERR] {pid}: {type(e).__name__}: {e}")
-
-        # Progress
-        if (i + 1) % 50 == 0:
-            print(f"    ... {i + 1} / {len(to_enrich)} enriched")
-
-        # Throttle
-        time.sleep(throttle)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(fetch, [cid for _, cid in to_enrich])
+        for i, ((pid, cricinfo_id), (data, err)) in enumerate(zip(to_enrich, results)):
+            try:
+                if err is not None:
+                    raise err
+
+                player_info = data.get("player", {})
+                p = players[pid]
+
+                # Full name
+                full_name = player_info.get("longName", "") or player_info.get("name", "")
+                if full_name and len(full_name) > len(p.name):
+                    p.name = full_name
+                    name_updates += 1
+
+                # Country
+                country_name = player_info.get("country", "")
+                if not isinstance(country_name, str):
+                    # Sometimes it's an object
+                    country_name = ""
+                # Try from countryTeamName field
+                if not country_name:
+                    country_name = player_info.get("countryTeamName", "")
+                if country_name and not p.country:
+                    p.country = country_name
+                    country_updates += 1
+
+                # Playing role
+                playing_role = player_info.get("playingRole", "")
+                mapped_role = _classify_espn_role(playing_role)
+                if mapped_role:
+                    p._role = mapped_role
+                    role_updates += 1
+
+                enriched += 1
+
+            except (_HTTPError, HTTPException, URLError, json.JSONDecodeError, KeyError,
+                    TimeoutError, OSError) as e:
+                errors += 1
+                if errors <= 5:
+                    print(f"    [ERR] {pid} (cricinfo={cricinfo_id}): {e}")
+            except Exception as e:
+                errors += 1
+                if errors <= 5:
+                    print(f"    [ERR] {pid}: {type(e).__name__}: {e}")
+
+            # Progress
+            if (i + 1) % 50 == 0:
+                print(f"    ... {i + 1} / {len(to_enrich)} enriched")
 
     print(f"  Enriched: {enriched} | Errors: {errors}")
     print(f"  Name updates: {name_updates} | Country updates: {country_updates} | Role updates: {role_updates}")
@@ -844,8 +2321,279 @@ def _load_name_map() -> dict[str, str]:
     return {}
 
 
+TEAMMATE_CONTEXTS_FILE = "teammate_contexts.json"
+
+
+def write_teammate_contexts(
+    players: PlayerStore,
+    selected: list[PlayerData],
+    output: list[dict],
+    path: Path,
+):
+    """
+    Write the (team, format, season) contexts behind every selected teammate
+    pair as a compact, integer-coded sidecar to players.json:
+
+        contexts  [[team, format, season], ...]
+        players   [player id, ...]               (players.json order)
+        edges     [[a, b, ctx, ctx, ...], ...]   (a < b index players)
+    """
+    rows = {players.index[p.cricsheet_id]: n for n, p in enumerate(selected)}
+    edges = players.context_edges(rows)
+
+    # Number contexts by sort order so the file doesn't depend on match order
+    keys = list(players.contexts)
+    used = sorted({c for ctxs in edges.values() for c in ctxs}, key=lambda c: keys[c])
+    renumber = {c: n for n, c in enumerate(used)}
+
+    data = {
+        "contexts": [list(keys[c]) for c in used],
+        "players":  [rec["id"] for rec in output],
+        "edges":    [[a, b, *sorted(renumber[c] for c in ctxs)]
+                     for (a, b), ctxs in sorted(edges.items())],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    size_kb = path.stat().st_size / 1024
+    print(f"  ✓ Wrote {len(data['edges']):,} teammate edges over "
+          f"{len(data['contexts']):,} contexts to {path.name} ({size_kb:.0f} KB)")
+
+
+# ── players.bin ──
+# A compact columnar twin of players.json for clients. Layout (decoder:
+# src/lib/playersBin.ts); every integer is an unsigned LEB128 varint
+# unless noted:
+#
+#   file     "CBPL"  version:u8  P  strings  C  column × C
+#   strings  n  (byte length, UTF-8 bytes) × n    — every string, interned
+#   column   name:str  kind:u8  body              — name is a dotted path,
+#                                                   e.g. "stats.testRuns"
+#   str      index into strings
+#
+#   kind 1  STRING     P × (str + 1), 0 = field absent
+#   kind 2  INT32      zero-pad to a 4-byte file offset, then P × int32 LE
+#   kind 3  BITSET     n  str × n  (names),  P × mask; bit i set → names[i],
+#                      decoded in names order
+#   kind 4  STRLIST    P × (count, str × count)
+#   kind 5  ADJACENCY  P × rank (position of the player's "id" in sorted id
+#                      order), then P × (count, first rank, rank deltas …);
+#                      each rank decodes to the "id" of the player holding it
+#
+# Records decode with their keys in column order, so decode(encode(x))
+# reproduces filter_and_output's JSON exactly.
+
+PLAYERS_BIN_MAGIC = b"CBPL"
+PLAYERS_BIN_VERSION = 1
+BIN_STRING, BIN_INT32, BIN_BITSET, BIN_STRLIST, BIN_ADJACENCY = 1, 2, 3, 4, 5
+
+
+def _put_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _flatten(record: dict, prefix: str, fields: dict[str, dict], row: int):
+    for key, value in record.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            _flatten(value, name + ".", fields, row)
+        else:
+            fields.setdefault(name, {})[row] = value
+
+
+def encode_players_bin(records: list[dict]) -> bytes:
+    """Encode player records (as written to players.json) as players.bin."""
+    n = len(records)
+    fields: dict[str, dict[int, object]] = {}
+    for row, rec in enumerate(records):
+        _flatten(rec, "", fields, row)
+
+    strings: dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        i = strings.get(text)
+        if i is None:
+            i = strings[text] = len(strings)
+        return i
+
+    ids = fields.get("id", {})
+    rank_of = {pid: r for r, pid in enumerate(sorted(ids.values()))}
+    if len(rank_of) != n or len(ids) != n:
+        rank_of = {}                        # ids missing or repeated: no adjacency lists
+
+    columns: list[tuple[str, int, list]] = []
+    for name, values in fields.items():
+        col = [values.get(row) for row in range(n)]
+        if all(v is None or isinstance(v, str) for v in col):
+            columns.append((name, BIN_STRING, [0 if v is None else intern(v) + 1 for v in col]))
+        elif all(type(v) is int and -2**31 <= v < 2**31 for v in col):
+            columns.append((name, BIN_INT32, col))
+        elif all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in col):
+            if rank_of and all(x in rank_of for v in col for x in v) and all(
+                    all(rank_of[a] < rank_of[b] for a, b in zip(v, v[1:])) for v in col):
+                columns.append((name, BIN_ADJACENCY, [[rank_of[x] for x in v] for v in col]))
+                continue
+            names = sorted({x for v in col for x in v})
+            bit = {x: i for i, x in enumerate(names)}
+            if len(names) <= 31 and all(
+                    all(bit[a] < bit[b] for a, b in zip(v, v[1:])) for v in col):
+                masks = [sum(1 << bit[x] for x in v) for v in col]
+                columns.append((name, BIN_BITSET, ([intern(x) for x in names], masks)))
+            else:
+                columns.append((name, BIN_STRLIST, [[intern(x) for x in v] for v in col]))
+        else:
+            raise ValueError(f"players.bin: can't encode field {name!r}")
+    for name, _, _ in columns:
+        intern(name)
+
+    out = bytearray(PLAYERS_BIN_MAGIC)
+    out.append(PLAYERS_BIN_VERSION)
+    _put_varint(out, n)
+    _put_varint(out, len(strings))
+    for text in strings:
+        raw = text.encode("utf-8")
+        _put_varint(out, len(raw))
+        out += raw
+
+    _put_varint(out, len(columns))
+    for name, kind, data in columns:
+        _put_varint(out, strings[name])
+        out.append(kind)
+        if kind == BIN_STRING:
+            for v in data:
+                _put_varint(out, v)
+        elif kind == BIN_INT32:
+            out += bytes(-len(out) % 4)
+            out += struct.pack(f"<{n}i", *data)
+        elif kind == BIN_BITSET:
+            names, masks = data
+            _put_varint(out, len(names))
+            for i in names:
+                _put_varint(out, i)
+            for m in masks:
+                _put_varint(out, m)
+        elif kind == BIN_STRLIST:
+            for v in data:
+                _put_varint(out, len(v))
+                for i in v:
+                    _put_varint(out, i)
+        else:  # BIN_ADJACENCY
+            for pid in (fields["id"][row] for row in range(n)):
+                _put_varint(out, rank_of[pid])
+            for v in data:
+                _put_varint(out, len(v))
+                prev = 0
+                for r in v:
+                    _put_varint(out, r - prev)
+                    prev = r
+    return bytes(out)
+
+
+def decode_players_bin(buf: bytes) -> list[dict]:
+    """Inverse of encode_players_bin (reference decoder for the spec above)."""
+    if buf[:4] != PLAYERS_BIN_MAGIC or buf[4] != PLAYERS_BIN_VERSION:
+        raise ValueError("not a players.bin v1 file")
+    n, pos = _get_varint(buf, 5)
+    n_strings, pos = _get_varint(buf, pos)
+    strings = []
+    for _ in range(n_strings):
+        size, pos = _get_varint(buf, pos)
+        strings.append(buf[pos:pos + size].decode("utf-8"))
+        pos += size
+
+    records: list[dict] = [{} for _ in range(n)]
+    adjacency: list[tuple[list[str], list[list[int]]]] = []
+    n_columns, pos = _get_varint(buf, pos)
+    for _ in range(n_columns):
+        name_i, pos = _get_varint(buf, pos)
+        kind = buf[pos]
+        pos += 1
+        values: list = []
+        if kind == BIN_STRING:
+            for _ in range(n):
+                v, pos = _get_varint(buf, pos)
+                values.append(strings[v - 1] if v else None)
+        elif kind == BIN_INT32:
+            pos += -pos % 4
+            values = list(struct.unpack_from(f"<{n}i", buf, pos))
+            pos += 4 * n
+        elif kind == BIN_BITSET:
+            count, pos = _get_varint(buf, pos)
+            names = []
+            for _ in range(count):
+                v, pos = _get_varint(buf, pos)
+                names.append(strings[v])
+            for _ in range(n):
+                mask, pos = _get_varint(buf, pos)
+                values.append([x for i, x in enumerate(names) if mask >> i & 1])
+        elif kind == BIN_STRLIST:
+            for _ in range(n):
+                count, pos = _get_varint(buf, pos)
+                v = []
+                for _ in range(count):
+                    i, pos = _get_varint(buf, pos)
+                    v.append(strings[i])
+                values.append(v)
+        elif kind == BIN_ADJACENCY:
+            ranks = []
+            for _ in range(n):
+                r, pos = _get_varint(buf, pos)
+                ranks.append(r)
+            for _ in range(n):
+                count, pos = _get_varint(buf, pos)
+                v, r = [], 0
+                for _ in range(count):
+                    d, pos = _get_varint(buf, pos)
+                    r += d
+                    v.append(r)
+                values.append(v)
+            adjacency.append((ranks, values))     # ids resolved once all columns are read
+        else:
+            raise ValueError(f"players.bin: unknown column kind {kind}")
+
+        *parents, leaf = strings[name_i].split(".")
+        for rec, v in zip(records, values):
+            if v is None:
+                continue
+            for key in parents:
+                rec = rec.setdefault(key, {})
+            rec[leaf] = v
+
+    for ranks, lists in adjacency:
+        by_rank = [""] * n
+        for rec, r in zip(records, ranks):
+            by_rank[r] = rec["id"]
+        for v in lists:
+            v[:] = [by_rank[r] for r in v]
+    return records
+
+
+def write_players_bin(output: list[dict], path: Path):
+    """Write players.bin next to players.json and check it decodes back to the same records."""
+    data = encode_players_bin(output)
+    if decode_players_bin(data) != output:
+        raise ValueError("players.bin does not round-trip to players.json")
+    with open(path, "wb") as f:
+        f.write(data)
+    print(f"  ✓ Wrote {path.name} ({len(data) / 1024:.0f} KB, round-trip verified)")
+
+
 def filter_and_output(
-    players: dict[str, PlayerData],
+    players: PlayerStore,
     people: dict[str, dict],
     min_players: int,
     output_path: Path,
@@ -860,17 +2608,20 @@ def filter_and_output(
     # Eligibility: at least 5 international matches OR 10 IPL matches
     eligible = [
         p for p in players.values()
-        if (p.total_intl_matches >= 5 or len(p.ipl_matches) >= 10)
+        if (p.total_intl_matches >= 5 or p.ipl_matches >= 10)
         and p.country != "Unknown"
         and hasattr(p, "_role")
     ]
 
     # Sort by significance: total international matches + IPL matches
-    eligible.sort(key=lambda p: p.total_intl_matches + len(p.ipl_matches), reverse=True)
+    eligible.sort(key=lambda p: p.total_intl_matches + p.ipl_matches, reverse=True)
 
     # Take top N (at least min_players)
     selected = eligible[:max(min_players, len(eligible))]
     selected_ids = {p.cricsheet_id for p in selected}
+    selected_mask = 0
+    for pid in selected_ids:
+        selected_mask |= 1 << players.index[pid]
 
     print(f"  Eligible players: {len(eligible)}")
     print(f"  Selected: {len(selected)}")
@@ -895,9 +2646,8 @@ def filter_and_output(
     for p in selected:
         # Teammates: only include those in our selected set
         teammates = sorted([
-            id_map[tid]
-            for tid in p.teammates_set
-            if tid in selected_ids and tid in id_map
+            id_map[players.ids[k]]
+            for k in iter_bits(p.teammates_mask & selected_mask)
         ])
 
         # Apply full-name override if available
@@ -914,16 +2664,16 @@ def filter_and_output(
             "stats": {
                 "testRuns":      p.test_runs,
                 "testWickets":   p.test_wickets,
-                "testMatches":   len(p.test_matches),
+                "testMatches":   p.test_matches,
                 "odiRuns":       p.odi_runs,
                 "odiWickets":    p.odi_wickets,
-                "odiMatches":    len(p.odi_matches),
+                "odiMatches":    p.odi_matches,
                 "t20iRuns":      p.t20i_runs,
                 "t20iWickets":   p.t20i_wickets,
-                "t20iMatches":   len(p.t20i_matches),
+                "t20iMatches":   p.t20i_matches,
                 "iplRuns":       p.ipl_runs,
                 "iplWickets":    p.ipl_wickets,
-                "iplMatches":    len(p.ipl_matches),
+                "iplMatches":    p.ipl_matches,
                 "totalRuns":     p.total_runs,
                 "totalWickets":  p.total_wickets,
                 "centuries":     p.centuries,
@@ -936,9 +2686,15 @@ def filter_and_output(
 
     # Write JSON
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
+    with _timed("write_json_s"), open(output_path, "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2, ensure_ascii=False)
 
+    with _timed("write_contexts_s"):
+        write_teammate_contexts(players, selected, output,
+                                output_path.with_name(TEAMMATE_CONTEXTS_FILE))
+    with _timed("write_bin_s"):
+        write_players_bin(output, output_path.with_suffix(".bin"))
+
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
     print(f"\n  ✓ Wrote {len(output)} players to {output_path}")
     print(f"    File size: {file_size_mb:.1f} MB")
@@ -964,6 +2720,128 @@ def filter_and_output(
     print(f"    Avg teammates per player: {avg_teammates:.0f}")
 
 
+# ════════════════════════════════════════════════════════════════
+#  PROFILING (--profile)
+# ════════════════════════════════════════════════════════════════
+
+PROFILE_PHASES = ("download_all", "load_people_register", "process_all_matches",
+                  "classify_roles", "assign_trophies", "enrich_from_espncricinfo",
+                  "filter_and_output")
+
+
+class PhaseProfiler:
+    """
+    Per-phase metrics for --profile: wall time, CPU time (pool workers'
+    CPU separately, as `child_cpu_s`), the tracemalloc peak, and whatever
+    landed in `_counters` — work counters (deliveries, wickets, teammate
+    pairs, ...) and sub-phase timers (ZIP read, json.loads, delivery loop,
+    ...). Timers from pool workers are summed over processes and reported
+    apart, as `worker_timers_s_summed`. One phase can also be run under
+    cProfile and dumped as pstats.
+
+    tracemalloc and cProfile only see the main process and both slow it
+    down, so compare profiled runs with profiled runs.
+    """
+
+    def __init__(self, enabled: bool = False, pstats_phase: str | None = None,
+                 pstats_path: Path | None = None):
+        self.enabled = enabled
+        self.pstats_phase = pstats_phase
+        self.pstats_path = pstats_path
+        self.phases: dict[str, dict] = {}
+        self.stats = None
+        if enabled:
+            import tracemalloc
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        import tracemalloc
+        global _counters
+        _counters = defaultdict(int)
+        tracemalloc.reset_peak()
+        profiler = None
+        if name == self.pstats_phase:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        t0, cpu0, times0 = time.perf_counter(), time.process_time(), os.times()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            # Also on failure: stop cProfile and the counters, record what ran
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - t0
+            cpu = time.process_time() - cpu0
+            times1 = os.times()
+            peak = tracemalloc.get_traced_memory()[1]
+            counters, _counters = dict(_counters), None
+            self._record(name, wall, cpu, times0, times1, peak, counters, profiler)
+
+    def _record(self, name, wall, cpu, times0, times1, peak, counters, profiler):
+        self.phases[name] = {
+            "wall_s":              round(wall, 4),
+            "cpu_s":               round(cpu, 4),
+            "child_cpu_s":         round((times1.children_user - times0.children_user)
+                                         + (times1.children_system - times0.children_system), 4),
+            "tracemalloc_peak_mb": round(peak / (1024 * 1024), 2),
+            "counters": {k: v for k, v in sorted(counters.items()) if not k.endswith("_s")},
+            "timers_s": {k[:-2]: round(v, 4) for k, v in sorted(counters.items())
+                         if k.endswith("_s") and not k.startswith("workers:")},
+            # Summed over pool processes: worker CPU-seconds, not phase time
+            "worker_timers_s_summed": {k[len("workers:"):-2]: round(v, 4)
+                                       for k, v in sorted(counters.items())
+                                       if k.startswith("workers:")},
+        }
+        if profiler:
+            import pstats
+            self.pstats_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(self.pstats_path)
+            self.stats = pstats.Stats(profiler)
+            self.phases[name]["pstats"] = str(self.pstats_path)
+
+    def report(self, path: Path, wall: float):
+        """Print the per-phase table and write the summary JSON to `path`."""
+        if not self.enabled:
+            return
+
+        print(f"\n>> Profile (wall / CPU / worker CPU / tracemalloc peak)")
+        for name, m in self.phases.items():
+            print(f"  {name:<26} {m['wall_s']:>8.2f}s {m['cpu_s']:>8.2f}s "
+                  f"{m['child_cpu_s']:>8.2f}s {m['tracemalloc_peak_mb']:>8.1f} MB")
+            if m["counters"]:
+                print("      " + " · ".join(f"{k} {v:,}" for k, v in m["counters"].items()))
+            if m["timers_s"]:
+                print("      " + " · ".join(f"{k} {v:.2f}s" for k, v in m["timers_s"].items()))
+            if m["worker_timers_s_summed"]:
+                print("      workers, summed CPU-s: " + " · ".join(
+                    f"{k} {v:.2f}" for k, v in m["worker_timers_s_summed"].items()))
+
+        if self.stats is not None:
+            print(f"\n  Top functions in {self.pstats_phase} (by own time):")
+            self.stats.sort_stats("tottime").print_stats(15)
+            print(f"  ✓ Wrote cProfile stats to {self.pstats_path}")
+
+        summary = {
+            "version": 1,
+            "argv":    sys.argv[1:],
+            "python":  sys.version.split()[0],
+            "wall_s":  round(wall, 4),
+            "phases":  self.phases,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"  ✓ Wrote profile summary to {path}")
+
+
 # ════════════════════════════════════════════════════════════════
 #  MAIN
 # ════════════════════════════════════════════════════════════════
@@ -977,6 +2855,10 @@ Examples:
   python collect_data.py                  Full run
   python collect_data.py --skip-download  Re-process cached data
   python collect_data.py --quick          Dev mode (200 matches/format)
+  python collect_data.py --workers 8      Parse matches on 8 processes
+  python collect_data.py --engine numpy   Aggregate deliveries with NumPy
+  python collect_data.py --profile --pstats
+                                          Per-phase metrics + cProfile of phase 3
   python collect_data.py --min-players 600
         """,
     )
@@ -988,13 +2870,64 @@ Examples:
         "--quick", action="store_true",
         help="Dev mode: process only 200 matches per format",
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes to use for match parsing (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Walk match files over by over instead of loading each one whole (flat memory)",
+    )
+    parser.add_argument(
+        "--engine", choices=("python", "numpy"), default="python",
+        help="Phase 3 aggregation: per-delivery counters, or a NumPy delivery table "
+             "(serial, no cache)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-parse every match instead of reusing the per-match cache",
+    )
     parser.add_argument(
         "--min-players", type=int, default=500,
         help="Minimum number of players to include (default: 500)",
     )
     parser.add_argument(
         "--enrich", action="store_true",
-        help="Enrich player names/roles from ESPNcricinfo API (adds ~5-10 min)",
+        help="Enrich player names/roles from ESPNcricinfo API (responses cached in <data-dir>/espn_cache)",
+    )
+    parser.add_argument(
+        "--enrich-rate", type=float, default=2.0,
+        help="Max ESPNcricinfo requests per second (default: 2)",
+    )
+    parser.add_argument(
+        "--enrich-workers", type=int, default=8,
+        help="Concurrent ESPNcricinfo requests (default: 8)",
+    )
+    parser.add_argument(
+        "--enrich-ttl-days", type=float, default=30,
+        help="Reuse cached ESPNcricinfo responses up to this age (default: 30)",
+    )
+    parser.add_argument(
+        "--espn-url", type=str, default=ESPN_API_URL,
+        help=argparse.SUPPRESS,  # point --enrich at a local stub server
+    )
+    parser.add_argument(
+        "--cricsheet-url", type=str, default=None,
+        help=argparse.SUPPRESS,  # download from a mirror / local test server
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Record per-phase time, memory and work counters (summary in <data-dir>/profile.json)",
+    )
+    parser.add_argument(
+        "--profile-out", type=str, default=None,
+        help="Profile summary path (default: <data-dir>/profile.json; implies --profile)",
+    )
+    parser.add_argument(
+        "--pstats", nargs="?", const="process_all_matches", choices=PROFILE_PHASES,
+        metavar="PHASE",
+        help="Also run PHASE (default: process_all_matches) under cProfile and dump "
+             "<profile-out>.PHASE.pstats; implies --profile",
     )
     parser.add_argument(
         "--data-dir", type=str, default=None,
@@ -1005,9 +2938,17 @@ Examples:
         help=f"Output JSON path (default: {OUTPUT_FILE})",
     )
     args = parser.parse_args()
+    if args.engine == "numpy" and (args.workers > 1 or args.stream):
+        parser.error("--engine numpy does not combine with --workers or --stream")
 
     data_dir = Path(args.data_dir) if args.data_dir else DATA_DIR
     output_path = Path(args.output) if args.output else OUTPUT_FILE
+    profile_path = Path(args.profile_out) if args.profile_out else data_dir / "profile.json"
+    profiler = PhaseProfiler(
+        enabled=args.profile or bool(args.profile_out) or bool(args.pstats),
+        pstats_phase=args.pstats,
+        pstats_path=profile_path.with_name(f"{profile_path.stem}.{args.pstats}.pstats"),
+    )
 
     print("=" * 60)
     print("  Cricket Bingo — Player Data Collector")
@@ -1017,34 +2958,48 @@ Examples:
     t_start = time.time()
 
     # Phase 1: Download
-    download_all(data_dir, skip=args.skip_download)
+    with profiler.phase("download_all"):
+        download_all(data_dir, skip=args.skip_download, base_url=args.cricsheet_url)
 
     # Phase 2: Load people register
-    people = load_people_register(data_dir)
+    with profiler.phase("load_people_register"):
+        people = load_people_register(data_dir)
 
     # Phase 3: Process matches
-    players, finals = process_all_matches(data_dir, people, quick=args.quick)
+    cache_dir = None if args.no_cache else data_dir / "match_cache"
+    with profiler.phase("process_all_matches"):
+        players, finals = process_all_matches(data_dir, people, quick=args.quick,
+                                              workers=args.workers, cache_dir=cache_dir,
+                                              stream=args.stream, engine=args.engine)
 
     # Phase 4: Post-processing
-    classify_roles(players)
-    assign_trophies(players, finals)
+    with profiler.phase("classify_roles"):
+        classify_roles(players)
+    with profiler.phase("assign_trophies"):
+        assign_trophies(players, finals)
 
     # Phase 4c (optional): Enrich from ESPNcricinfo
     if args.enrich:
         # Pre-filter to get the top players we'll include, then enrich only those
         eligible = [
             p for p in players.values()
-            if (p.total_intl_matches >= 5 or len(p.ipl_matches) >= 10)
+            if (p.total_intl_matches >= 5 or p.ipl_matches >= 10)
             and p.country
         ]
-        eligible.sort(key=lambda p: p.total_intl_matches + len(p.ipl_matches), reverse=True)
+        eligible.sort(key=lambda p: p.total_intl_matches + p.ipl_matches, reverse=True)
         top_pids = [p.cricsheet_id for p in eligible[:args.min_players + 100]]
-        enrich_from_espncricinfo(players, people, top_pids, throttle=0.5)
+        with profiler.phase("enrich_from_espncricinfo"):
+            enrich_from_espncricinfo(players, people, top_pids, rate=args.enrich_rate,
+                                     workers=args.enrich_workers,
+                                     cache_dir=data_dir / "espn_cache",
+                                     ttl_days=args.enrich_ttl_days, base_url=args.espn_url)
 
     # Phase 5: Filter & Output
-    filter_and_output(players, people, args.min_players, output_path)
+    with profiler.phase("filter_and_output"):
+        filter_and_output(players, people, args.min_players, output_path)
 
     elapsed = time.time() - t_start
+    profiler.report(profile_path, elapsed)
     minutes = int(elapsed // 60)
     seconds = int(elapsed % 60)
     print(f"\n  Done in {minutes}m {seconds}s")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Precompute the daily grids and decks offline.
+
+A port of generateDailyGame() in src/lib/dailyGame.ts: the same date seed,
+mulberry32 RNG and Fisher-Yates shuffles, consumed in the same order, so
+each (date, size) comes out exactly as it does in the browser. The only
+difference is the solvability check. dailyGame.ts backtracks over cells ×
+players. Here each cell's candidates come from a CategoryIndex bitmap and
+Hopcroft–Karp finds a maximum matching of cells to distinct players. The
+answer is the same and the running time is polynomial.
+
+Output is a static schedule:
+
+    {"players": <sha256 of players.json>, "days": {
+        "2026-01-01": {"3": {"seed", "attempts", "solvable", "grid": [category id],
+                             "deck": [player id]}, "4": ..., "5": ...}, ...}}
+
+The schedule is only valid for the players.json it was built from (hence
+its hash). Regenerate it whenever that file changes.
+
+Usage:
+    python scripts/daily_grids.py [--start 2026-01-01] [--days 365] [--sizes 3,4,5]
+                                  [--workers 4] [--out public/data/schedule.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+from categories import CategoryIndex, load_pools
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = SCRIPT_DIR.parent / "public"
+PLAYERS_PATH = PUBLIC_DIR / "players.json"
+SCHEDULE_PATH = PUBLIC_DIR / "data" / "schedule.json"
+POOL_NAME = "FULL_CATEGORY_POOL"   # what useGameState passes to generateDailyGame
+
+MAX_ATTEMPTS = 50
+MIN_PER_CELL = 4
+U32 = 0xFFFFFFFF
+
+
+# ── Seeded randomness (bit-exact with dailyGame.ts) ──
+
+def date_seed(date_str):
+    """dateSeed(): 32-bit string hash of "cricket-bingo-" + date, as a signed int."""
+    h = 0
+    for ch in "cricket-bingo-" + date_str:
+        h = (h * 31 + ord(ch)) & U32
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+def create_rng(seed):
+    """mulberry32, returning floats in [0, 1) like createRng()."""
+    s = seed & U32
+
+    def rng():
+        nonlocal s
+        s = (s + 0x6D2B79F5) & U32
+        t = ((s ^ (s >> 15)) * (1 | s)) & U32
+        t = ((t + (((t ^ (t >> 7)) * (61 | t)) & U32)) & U32) ^ t
+        return ((t ^ (t >> 14)) & U32) / 4294967296
+
+    return rng
+
+
+def seeded_shuffle(items, rng):
+    a = list(items)
+    for i in range(len(a) - 1, 0, -1):
+        j = int(rng() * (i + 1))
+        a[i], a[j] = a[j], a[i]
+    return a
+
+
+# ── Solvability ──
+
+def max_matching(adj):
+    """Hopcroft–Karp: size of a maximum matching of left vertices to adj[u]'s right vertices."""
+    inf = len(adj) + 1
+    match_l = [None] * len(adj)
+    match_r = {}
+    dist = [0] * len(adj)
+
+    def bfs():
+        queue = deque()
+        for u in range(len(adj)):
+            if match_l[u] is None:
+                dist[u] = 0
+                queue.append(u)
+            else:
+                dist[u] = inf
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                w = match_r.get(v)
+                if w is None:
+                    found = True
+                elif dist[w] == inf:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        return found
+
+    def dfs(u):
+        for v in adj[u]:
+            w = match_r.get(v)
+            if w is None or (dist[w] == dist[u] + 1 and dfs(w)):
+                match_l[u] = v
+                match_r[v] = u
+                return True
+        dist[u] = inf
+        return False
+
+    size = 0
+    while bfs():
+        for u in range(len(adj)):
+            if match_l[u] is None and dfs(u):
+                size += 1
+    return size
+
+
+class GridGenerator:
+    """generateDailyGame() over one player list and category pool."""
+
+    def __init__(self, players, pool):
+        self.players = players
+        self.pool = pool
+        self.index = CategoryIndex(players, [cat["validatorKey"] for cat in pool])
+        self._positions = {}
+
+    def candidates(self, key):
+        """Positions of the players fitting a cell, in players.json order."""
+        positions = self._positions.get(key)
+        if positions is None:
+            positions = self._positions[key] = self.index.positions(self.index.members(key))
+        return positions
+
+    def is_solvable(self, grid):
+        masks = [self.index.members(cat["validatorKey"]) for cat in grid]
+        if not all(masks):
+            return False
+        union = 0
+        for mask in masks:
+            union |= mask
+        if union.bit_count() < len(grid):
+            return False
+        adj = [self.candidates(cat["validatorKey"]) for cat in grid]
+        return max_matching(adj) == len(grid)
+
+    def build_cover_deck(self, grid, deck_size, shuffle, min_per_cell=MIN_PER_CELL):
+        """buildCoverDeck(): player positions, in deck order."""
+        per_cell = [shuffle(self.candidates(cat["validatorKey"])) for cat in grid]
+
+        # 1. Guarantee minimum coverage per cell (dict keeps JS Set order)
+        picked = {}
+        for candidates in per_cell:
+            count = 0
+            for i in candidates:
+                if count >= min_per_cell:
+                    break
+                if i not in picked:
+                    picked[i] = True
+                    count += 1
+
+        # 2. Fill remaining slots with other relevant players
+        relevant = 0
+        for cat in grid:
+            relevant |= self.index.members(cat["validatorKey"])
+        remaining = shuffle([i for i in range(len(self.players))
+                             if relevant >> i & 1 and i not in picked])
+        for i in remaining:
+            if len(picked) >= deck_size:
+                break
+            picked[i] = True
+
+        # 3. If still under deckSize, pad with distractors
+        if len(picked) < deck_size:
+            distractors = shuffle([i for i in range(len(self.players)) if not relevant >> i & 1])
+            for i in distractors:
+                if len(picked) >= deck_size:
+                    break
+                picked[i] = True
+
+        return shuffle(list(picked))
+
+    def daily_game(self, date_str, grid_size):
+        seed = date_seed(f"{date_str}-{grid_size}")
+        rng = create_rng(seed)
+        cell_count = grid_size * grid_size
+
+        grid = []
+        attempts = 0
+        solvable = False
+        while attempts < MAX_ATTEMPTS:
+            grid = seeded_shuffle(self.pool, rng)[:cell_count]
+            if self.is_solvable(grid):
+                solvable = True
+                break
+            attempts += 1
+
+        deck_size = max(40, cell_count * 5)
+        deck = self.build_cover_deck(grid, deck_size, lambda items: seeded_shuffle(items, rng))
+        return {
+            "seed": seed,
+            "attempts": attempts,
+            "solvable": solvable,
+            "grid": [cat["id"] for cat in grid],
+            "deck": [self.players[i]["id"] for i in deck],
+        }
+
+
+# ── Schedule (dates fan out over a process pool) ──
+
+_generator = None
+
+
+def _init_worker(players, pool):
+    global _generator
+    _generator = GridGenerator(players, pool)
+
+
+def _day(job):
+    date_str, sizes = job
+    return date_str, {str(n): _generator.daily_game(date_str, n) for n in sizes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute daily grids and decks")
+    parser.add_argument("--start", default=date.today().isoformat(),
+                        help="First date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=365, help="Number of days (default: 365)")
+    parser.add_argument("--sizes", default="3,4,5", help="Grid sizes (default: 3,4,5)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Worker processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--players", type=Path, default=PLAYERS_PATH,
+                        help="Player file (default: public/players.json)")
+    parser.add_argument("--out", type=Path, default=SCHEDULE_PATH,
+                        help="Schedule file (default: public/data/schedule.json)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    start = date.fromisoformat(args.start)
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(args.days)]
+
+    print(f"Loading players from {args.players}")
+    raw = args.players.read_bytes()
+    players = json.loads(raw)
+    pool = load_pools()[POOL_NAME]
+    print(f"  {len(players)} players, {len(pool)} categories in {POOL_NAME}")
+    print(f"  {dates[0]} .. {dates[-1]} × sizes {sizes}")
+
+    t0 = time.time()
+    jobs = [(d, sizes) for d in dates]
+    if args.workers <= 1:
+        _init_worker(players, pool)
+        days = dict(map(_day, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(players, pool)) as ex:
+            days = dict(ex.map(_day, jobs, chunksize=8))
+    elapsed = time.time() - t0
+
+    games = [g for day in days.values() for g in day.values()]
+    unsolvable = [(d, n) for d, day in days.items() for n, g in day.items() if not g["solvable"]]
+    schedule = {"players": hashlib.sha256(raw).hexdigest(), "days": days}
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.out.with_name(args.out.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(schedule, f, separators=(",", ":"))
+    tmp.replace(args.out)
+
+    print(f"\n{'='*40}")
+    print(f"Games:           {len(games)} in {elapsed:.1f}s")
+    print(f"Rejected grids:  {sum(g['attempts'] for g in games)}")
+    print(f"Unsolvable:      {len(unsolvable)}")
+    for d, n in unsolvable[:10]:
+        print(f"  {d} {n}x{n}")
+    print(f"Output:          {args.out} ({args.out.stat().st_size / 1024:.0f} KB)")
+    print(f"{'='*40}")
+
+
+if __name__ == "__main__":
+    main()
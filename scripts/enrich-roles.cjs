@@ -7,7 +7,9 @@
  * Usage:
  *   node scripts/enrich-roles.cjs
  *
- * Resumes from scripts/role_checkpoint.json if interrupted.
+ * Resumes from scripts/role_checkpoint.json if interrupted. The checkpoint
+ * is an append-only JSON-lines log (`[playerId, result]` per line, the same
+ * format enrich_stats.py uses), compacted to one line per player at the end.
  */
 
 const fs = require("fs");
@@ -18,7 +20,7 @@ const CHECKPOINT_PATH = path.join(__dirname, "./role_checkpoint.json");
 const OUTPUT_PATH = path.join(__dirname, "./role_suggestions.json");
 
 const DELAY_MS = 300; // polite rate limit for Wikipedia API
-const BATCH_SIZE = 50; // players per run before saving checkpoint
+const BATCH_SIZE = 50; // players between checkpoint fsyncs / progress lines
 
 // ── Role mapping from Wikipedia infobox text → our roles ──────────────────
 const ROLE_MAP = {
@@ -122,17 +124,54 @@ function parseRoleFromInfobox(wikitext) {
   return null;
 }
 
+// ── Checkpoint log ─────────────────────────────────────────────────────────
+// Later lines win; a torn last line from a crash is skipped. The older
+// single-object checkpoint format is still read.
+function loadCheckpoint(file) {
+  if (!fs.existsSync(file)) return {};
+  const text = fs.readFileSync(file, "utf-8");
+  try {
+    const data = JSON.parse(text);
+    if (data && !Array.isArray(data) && typeof data === "object") return data;
+  } catch {
+    // not a single JSON document: a log
+  }
+  const entries = {};
+  for (const line of text.split("\n")) {
+    try {
+      const [key, entry] = JSON.parse(line);
+      entries[key] = entry;
+    } catch {
+      // torn write from an interrupted run
+    }
+  }
+  return entries;
+}
+
+// Atomically replace the checkpoint with one line per entry
+function writeCheckpoint(file, entries) {
+  const tmp = `${file}.tmp`;
+  const fd = fs.openSync(tmp, "w");
+  for (const [key, entry] of Object.entries(entries)) {
+    fs.writeSync(fd, JSON.stringify([key, entry]) + "\n");
+  }
+  fs.fsyncSync(fd);
+  fs.closeSync(fd);
+  fs.renameSync(tmp, file);
+}
+
 async function main() {
   const players = JSON.parse(fs.readFileSync(PLAYERS_PATH, "utf-8"));
 
   // Load checkpoint
-  let checkpoint = {};
-  if (fs.existsSync(CHECKPOINT_PATH)) {
-    checkpoint = JSON.parse(fs.readFileSync(CHECKPOINT_PATH, "utf-8"));
+  const checkpoint = loadCheckpoint(CHECKPOINT_PATH);
+  if (Object.keys(checkpoint).length) {
     console.log(`Resuming from checkpoint (${Object.keys(checkpoint).length} done)`);
   }
 
   const results = { ...checkpoint };
+  writeCheckpoint(CHECKPOINT_PATH, results); // start from a clean, compacted log
+  const log = fs.openSync(CHECKPOINT_PATH, "a");
   let processed = 0;
   let found = 0;
   let notFound = 0;
@@ -167,16 +206,18 @@ async function main() {
     }
 
     processed++;
+    fs.writeSync(log, JSON.stringify([player.id, results[player.id]]) + "\n");
 
-    // Save checkpoint every BATCH_SIZE players
+    // Sync the checkpoint every BATCH_SIZE players
     if (processed % BATCH_SIZE === 0) {
-      fs.writeFileSync(CHECKPOINT_PATH, JSON.stringify(results, null, 2));
+      fs.fsyncSync(log);
       console.log(`Progress: ${processed} processed, ${found} roles found, ${notFound} not found`);
     }
   }
 
-  // Final save
-  fs.writeFileSync(CHECKPOINT_PATH, JSON.stringify(results, null, 2));
+  // Final save: compact the log
+  fs.closeSync(log);
+  writeCheckpoint(CHECKPOINT_PATH, results);
 
   // Build output: only players where suggested role differs from current
   const suggestions = {};
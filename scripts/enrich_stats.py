@@ -35,12 +35,19 @@ TYPICAL WORKFLOW:
   # 1. Test with 5 players first
   python enrich_stats.py --provider gemini --api-key YOUR_KEY --dry-run
 
-  # 2. Fix only the obviously wrong players (~400, takes ~30 min)
+  # 2. Fix only the obviously wrong players (~400; bounded by the provider's
+  #    rate limit — ~30 min at Gemini's 15 req/min)
   python enrich_stats.py --provider gemini --api-key YOUR_KEY --only-suspicious
 
+  #    ...or ask about 10 players per request (~10x fewer requests)
+  python enrich_stats.py --provider gemini --api-key YOUR_KEY --only-suspicious --batch-size 10
+
   # 3. If it gets interrupted, resume where you left off
   python enrich_stats.py --provider gemini --api-key YOUR_KEY --only-suspicious --resume
 
+  # 3b. Tweaked validate_stats? Re-run it over the saved replies, no API calls
+  python enrich_stats.py --provider gemini --only-suspicious --offline
+
   # 4. Check what changed
   python check_enriched.py
 
@@ -50,10 +57,15 @@ TYPICAL WORKFLOW:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
 
 try:
@@ -71,32 +83,44 @@ SCRIPT_DIR   = Path(__file__).resolve().parent
 PLAYERS_FILE = SCRIPT_DIR.parent / "public" / "players.json"
 CHECKPOINT   = SCRIPT_DIR / "enrich_checkpoint.json"
 OUTPUT_FILE  = SCRIPT_DIR / "players_enriched.json"
+CACHE_DIR    = SCRIPT_DIR / "enrich_cache"
 
 # ── Provider configs ─────────────────────────────────────────────────────────
+# rpm / tpm are the free-tier budgets the scheduler paces itself to
+# (tpm None = no token budget).
 PROVIDERS = {
     "gemini": {
-        # Free: 15 req/min, 1M tokens/day  — aistudio.google.com
+        # Free: 15 req/min, 1M tokens/min  — aistudio.google.com
         "url":       "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent",
         "model":     "gemini-1.5-flash",
-        "delay":     4.1,   # 15 RPM → 4s between calls (slightly over to be safe)
+        "rpm":       15,
+        "tpm":       1_000_000,
         "auth":      "query",   # key goes in ?key= param
     },
     "groq": {
-        # Free: 30 req/min, 14400 req/day  — console.groq.com
+        # Free: 30 req/min, 12K tokens/min, 14400 req/day  — console.groq.com
         "url":       "https://api.groq.com/openai/v1/chat/completions",
         "model":     "llama-3.3-70b-versatile",
-        "delay":     2.1,   # 30 RPM
+        "rpm":       30,
+        "tpm":       12_000,
         "auth":      "bearer",
     },
     "openrouter": {
         # Free models: add :free suffix  — openrouter.ai
         "url":       "https://openrouter.ai/api/v1/chat/completions",
         "model":     "meta-llama/llama-3.3-70b-instruct:free",
-        "delay":     3.0,   # free tier is rate-limited
+        "rpm":       20,    # free tier is rate-limited
+        "tpm":       None,
         "auth":      "bearer",
     },
 }
 
+CHECKPOINT_SYNC = 20    # fsync the checkpoint log every N results
+
+MAX_TOKENS  = 400   # completion budget per request
+MAX_RETRIES = 5     # per request, on 429
+BACKOFF     = 5.0   # seconds before the first 429 retry, doubled each time
+
 
 # ── Detection: which players need fixing ─────────────────────────────────────
 
@@ -154,31 +178,169 @@ Rules:
 - Return ONLY the raw JSON — no explanation, no markdown"""
 
 
-# ── API callers ───────────────────────────────────────────────────────────────
+def build_batch_prompt(batch: list[dict]) -> str:
+    """One prompt covering several players, answered as a JSON array keyed by id."""
+    lines = "\n".join(
+        f"- id: {p['id']} | {p['name']} | {p['country']} | {p.get('primaryRole', 'Cricketer')}"
+        for p in batch
+    )
+    return f"""You are a cricket statistics expert. Give the complete official international career statistics for each of these {len(batch)} players (id | name | country | role):
 
-def call_gemini(prompt: str, api_key: str, model: str) -> dict | None:
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-    try:
-        resp = requests.post(
-            url,
-            params={"key": api_key},
-            json={"contents": [{"parts": [{"text": prompt}]}],
-                  "generationConfig": {"temperature": 0.1, "maxOutputTokens": 400}},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        content = resp.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
-        content = re.sub(r"^```(?:json)?\s*", "", content)
-        content = re.sub(r"\s*```$", "", content)
-        m = re.search(r"\{[\s\S]*?\}", content)
-        return json.loads(m.group() if m else content)
-    except Exception as e:
-        print(f"ERR({type(e).__name__}:{e})", end=" ")
-        return None
+{lines}
+
+Return ONLY a JSON array with one object per player, in any order, each with exactly these fields (use 0 for formats they never played):
+{{
+  "id": "<the id given above>",
+  "testRuns": <int>,
+  "testWickets": <int>,
+  "testMatches": <int>,
+  "odiRuns": <int>,
+  "odiWickets": <int>,
+  "odiMatches": <int>,
+  "t20iRuns": <int>,
+  "t20iWickets": <int>,
+  "t20iMatches": <int>,
+  "centuries": <int>,
+  "confident": <true or false>
+}}
+
+Rules:
+- International stats ONLY (Tests / ODIs / T20Is) — not IPL, not domestic
+- "centuries" = total international 100s across all formats
+- "confident" = true if you are sure, false if you don't recognise this player
+- If unknown, return all zeros and confident=false for that player
+- Return ONLY the raw JSON array — no explanation, no markdown"""
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+
+class RateLimited(Exception):
+    """The provider answered 429; retry_after is its hint in seconds, if any."""
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__("HTTP 429 Too Many Requests")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Request- and token-per-minute budget shared by all workers.
+
+    Two token buckets refilled continuously at rpm/60 and tpm/60 per second.
+    By default each holds one minute's budget, so bursts up to the provider's
+    per-minute limit go straight through; burst=1 spaces requests evenly.
+    A 429 pauses every worker.
+    """
+
+    def __init__(self, rpm: float, tpm: float | None = None, burst: float | None = None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst = burst or rpm
+        self.requests = float(self.burst)
+        self.tokens = float(tpm or 0)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.updated
+                self.updated = now
+                self.requests = min(self.burst, self.requests + elapsed * self.rpm / 60)
+                if self.tpm:
+                    self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+                    tokens = min(tokens, self.tpm)
+
+                wait = self.paused_until - now
+                if wait <= 0:
+                    need_req = 1 - self.requests
+                    need_tok = tokens - self.tokens if self.tpm else 0
+                    if need_req <= 0 and need_tok <= 0:
+                        self.requests -= 1
+                        if self.tpm:
+                            self.tokens -= tokens
+                        return
+                    wait = max(need_req * 60 / self.rpm,
+                               need_tok * 60 / self.tpm if need_tok > 0 else 0)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.requests = 0
+
+
+def estimate_tokens(prompt: str, max_tokens: int = MAX_TOKENS) -> int:
+    """Rough request size for the TPM budget: ~4 chars/token plus the completion."""
+    return len(prompt) // 4 + max_tokens
+
+
+# ── API callers ───────────────────────────────────────────────────────────────
+# Callers raise on any failure (RateLimited for 429) and reuse one
+# keep-alive requests.Session per worker thread.
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def _check(resp: requests.Response):
+    if resp.status_code == 429:
+        retry_after = resp.headers.get("Retry-After", "")
+        try:
+            raise RateLimited(float(retry_after))
+        except ValueError:
+            raise RateLimited() from None
+    resp.raise_for_status()
+
+
+def _strip_fences(content: str) -> str:
+    content = content.strip()
+    content = re.sub(r"^```(?:json)?\s*", "", content)
+    return re.sub(r"\s*```$", "", content)
+
+
+def parse_reply(content: str) -> dict:
+    """The JSON object in a single-player reply."""
+    content = _strip_fences(content)
+    m = re.search(r"\{[\s\S]*?\}", content)
+    return json.loads(m.group() if m else content)
+
+
+def parse_batch_reply(content: str) -> dict[str, dict]:
+    """The JSON array in a batch reply → {id: result} (malformed elements dropped)."""
+    content = _strip_fences(content)
+    m = re.search(r"\[[\s\S]*\]", content)
+    items = json.loads(m.group() if m else content)
+    if not isinstance(items, list):
+        raise ValueError("reply is not a JSON array")
+    return {item["id"]: item for item in items
+            if isinstance(item, dict) and isinstance(item.get("id"), str)}
+
+
+def call_gemini(prompt: str, api_key: str, model: str, url: str | None = None,
+                max_tokens: int = MAX_TOKENS) -> str:
+    url = (url or PROVIDERS["gemini"]["url"]).format(model=model)
+    resp = _session().post(
+        url,
+        params={"key": api_key},
+        json={"contents": [{"parts": [{"text": prompt}]}],
+              "generationConfig": {"temperature": 0.1, "maxOutputTokens": max_tokens}},
+        timeout=30 + max_tokens // 100,
+    )
+    _check(resp)
+    return resp.json()["candidates"][0]["content"]["parts"][0]["text"]
 
 
 def call_openai_compat(prompt: str, api_key: str, url: str, model: str,
-                        extra_headers: dict | None = None) -> dict | None:
+                        extra_headers: dict | None = None, max_tokens: int = MAX_TOKENS) -> str:
     """Works for Groq and OpenRouter (both use OpenAI-compatible endpoints)."""
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -186,40 +348,136 @@ def call_openai_compat(prompt: str, api_key: str, url: str, model: str,
     }
     if extra_headers:
         headers.update(extra_headers)
-    try:
-        resp = requests.post(
-            url,
-            headers=headers,
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.1,
-                "max_tokens": 400,
-            },
-            timeout=30,
-        )
-        resp.raise_for_status()
-        content = resp.json()["choices"][0]["message"]["content"].strip()
-        content = re.sub(r"^```(?:json)?\s*", "", content)
-        content = re.sub(r"\s*```$", "", content)
-        m = re.search(r"\{[\s\S]*?\}", content)
-        return json.loads(m.group() if m else content)
-    except Exception as e:
-        print(f"ERR({type(e).__name__})", end=" ")
-        return None
-
-
-def call_api(prompt: str, provider: str, api_key: str, model: str) -> dict | None:
+    resp = _session().post(
+        url,
+        headers=headers,
+        json={
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,
+            "max_tokens": max_tokens,
+        },
+        timeout=30 + max_tokens // 100,
+    )
+    _check(resp)
+    return resp.json()["choices"][0]["message"]["content"]
+
+
+def call_api(prompt: str, provider: str, api_key: str, model: str,
+             url: str | None = None, max_tokens: int = MAX_TOKENS) -> str:
+    """Send one prompt to the provider (optionally at a different endpoint URL); returns the reply text."""
     if provider == "gemini":
-        return call_gemini(prompt, api_key, model)
+        return call_gemini(prompt, api_key, model, url, max_tokens)
     elif provider == "groq":
-        return call_openai_compat(prompt, api_key, PROVIDERS["groq"]["url"], model)
+        return call_openai_compat(prompt, api_key, url or PROVIDERS["groq"]["url"], model,
+                                  max_tokens=max_tokens)
     elif provider == "openrouter":
         return call_openai_compat(
-            prompt, api_key, PROVIDERS["openrouter"]["url"], model,
-            extra_headers={"HTTP-Referer": "https://cricket-bingo.in", "X-Title": "Cricket Bingo"}
+            prompt, api_key, url or PROVIDERS["openrouter"]["url"], model,
+            extra_headers={"HTTP-Referer": "https://cricket-bingo.in", "X-Title": "Cricket Bingo"},
+            max_tokens=max_tokens,
         )
-    return None
+    raise ValueError(f"unknown provider {provider!r}")
+
+
+# ── Response cache ────────────────────────────────────────────────────────────
+
+NOT_CACHED = "not cached"
+
+
+class ResponseCache:
+    """
+    Raw provider replies on disk, addressed by a sha256 of
+    (provider, model, prompt). Replies are kept before validation, so a
+    change to validate_stats can be replayed over them with --offline.
+    Concurrent requests for the same prompt wait for one API call.
+    """
+
+    def __init__(self, root: Path, read: bool = True):
+        self.root = root
+        self.read = read
+        self.lock = threading.Lock()
+        self.key_locks: dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str) -> str:
+        blob = json.dumps([provider, model, prompt], ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def key_lock(self, key: str) -> threading.Lock:
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> str | None:
+        if not self.read:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)["reply"]
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, key: str, provider: str, model: str, prompt: str, reply: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"provider": provider, "model": model, "prompt": prompt,
+                       "reply": reply, "fetched": time.time()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def batch_prompt(batch: list[dict]) -> str:
+    return build_prompt(batch[0]) if len(batch) == 1 else build_batch_prompt(batch)
+
+
+def fetch_stats(batch: list[dict], provider: str, api_key: str, model: str,
+                limiter: RateLimiter, url: str | None = None,
+                cache: ResponseCache | None = None,
+                offline: bool = False) -> tuple[dict[str, dict] | None, str | None]:
+    """
+    Ask the provider about one player, or several in one batch prompt,
+    pacing through the shared limiter and backing off on 429. Replies
+    come from / go to `cache` if given; offline never calls the API.
+    Returns ({player id: result}, None) or (None, error message).
+    """
+    prompt = batch_prompt(batch)
+    max_tokens = MAX_TOKENS * len(batch)
+
+    def parse(reply: str) -> dict[str, dict]:
+        if len(batch) == 1:
+            return {batch[0]["id"]: parse_reply(reply)}
+        return parse_batch_reply(reply)
+
+    key = cache.key(provider, model, prompt) if cache else None
+    with cache.key_lock(key) if cache else nullcontext():
+        reply = cache.get(key) if cache else None
+        if reply is not None:
+            try:
+                return parse(reply), None
+            except Exception as e:
+                return None, f"cached reply: {type(e).__name__}: {e}"
+        if offline:
+            return None, NOT_CACHED
+
+        for attempt in range(MAX_RETRIES + 1):
+            limiter.acquire(estimate_tokens(prompt, max_tokens))
+            try:
+                reply = call_api(prompt, provider, api_key, model, url, max_tokens)
+                results = parse(reply)
+            except RateLimited as e:
+                limiter.pause(max(e.retry_after or 0, BACKOFF * 2 ** attempt))
+                continue
+            except Exception as e:
+                return None, f"{type(e).__name__}: {e}"
+            # Only replies that parse are kept, so a garbled one is asked again
+            if cache:
+                cache.put(key, provider, model, prompt, reply)
+            return results, None
+    return None, "rate limited"
 
 
 # ── Validation ────────────────────────────────────────────────────────────────
@@ -267,6 +525,129 @@ def validate_stats(new: dict, old: dict) -> bool:
     return True
 
 
+# ── Checkpoint log ────────────────────────────────────────────────────────────
+# The checkpoint is JSON lines, one `[player_id, entry]` per result, appended
+# as results land; a later line for the same id replaces an earlier one. A
+# crash can at worst leave a torn last line, which replay skips. At the end
+# of a run the log is compacted to one line per player. The older
+# single-object checkpoint format is still read.
+
+def load_checkpoint(path: Path) -> dict:
+    """Replay a checkpoint log into { id: entry }."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError:
+        pass
+
+    entries = {}
+    for line in text.splitlines():
+        try:
+            key, entry = json.loads(line)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue            # torn write from an interrupted run
+        entries[key] = entry
+    return entries
+
+
+def write_checkpoint(path: Path, entries: dict):
+    """Atomically replace the checkpoint with one line per entry."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for key, entry in entries.items():
+            f.write(json.dumps([key, entry], ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class CheckpointLog:
+    """
+    Append-only writer for a checkpoint log. Every line is flushed to the
+    OS as it is written (so a killed process loses nothing); fsync is
+    batched to once every `sync_every` lines.
+    """
+
+    def __init__(self, path: Path, entries: dict, sync_every: int = CHECKPOINT_SYNC):
+        self.path = path
+        self.entries = entries
+        self.sync_every = sync_every
+        self.unsynced = 0
+        write_checkpoint(path, entries)     # start from a clean, compacted file
+        self.f = open(path, "a", encoding="utf-8")
+
+    def append(self, key: str, entry: dict):
+        self.entries[key] = entry
+        self.f.write(json.dumps([key, entry], ensure_ascii=False) + "\n")
+        self.f.flush()
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            os.fsync(self.f.fileno())
+            self.unsynced = 0
+
+    def close(self):
+        """Close the log and compact it to one line per id."""
+        if self.f.closed:
+            return
+        self.f.close()
+        write_checkpoint(self.path, self.entries)
+
+
+# ── Applying results ──────────────────────────────────────────────────────────
+
+def apply_result(players: list[dict], player_index: dict[str, int], player: dict,
+                 result: dict | None, err: str | None, done: dict) -> tuple[str, str]:
+    """
+    Record one player's answer in `done` (and in `players` if it is usable).
+    Returns (outcome, status line).
+    """
+    pid = player["id"]
+
+    if result is None:
+        done[pid] = {"status": "error"}
+        return "error", f"ERR({err}) ERROR — skipping"
+
+    if not result.get("confident", True):
+        done[pid] = {"status": "not_confident"}
+        return "not_confident", "UNKNOWN — skipping"
+
+    if not validate_stats(result, player["stats"]):
+        done[pid] = {"status": "invalid", "raw": result}
+        return "invalid", "INVALID — skipping"
+
+    orig = player_index[pid]
+    old_runs = players[orig]["stats"]["totalRuns"]
+
+    stats = {
+        "testRuns":     int(result["testRuns"]),
+        "testWickets":  int(result["testWickets"]),
+        "testMatches":  int(result["testMatches"]),
+        "odiRuns":      int(result["odiRuns"]),
+        "odiWickets":   int(result["odiWickets"]),
+        "odiMatches":   int(result["odiMatches"]),
+        "t20iRuns":     int(result["t20iRuns"]),
+        "t20iWickets":  int(result["t20iWickets"]),
+        "t20iMatches":  int(result["t20iMatches"]),
+        "centuries":    int(result["centuries"]),
+        "totalRuns":    int(result["testRuns"]) + int(result["odiRuns"]) + int(result["t20iRuns"]),
+        "totalWickets": (int(result["testWickets"]) + int(result["odiWickets"])
+                         + int(result["t20iWickets"])),
+    }
+    players[orig]["stats"].update(stats)
+
+    new_runs = stats["totalRuns"]
+    diff = new_runs - old_runs
+    sign = "+" if diff >= 0 else ""
+    # Keep the applied stats so --resume can replay them into the output
+    done[pid] = {"status": "updated", "old": old_runs, "new": new_runs, "stats": stats}
+    return "updated", f"OK   {old_runs:>6,} → {new_runs:>6,}  ({sign}{diff:,} runs)"
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main():
@@ -280,8 +661,8 @@ FREE API KEYS:
   OpenRouter→ https://openrouter.ai            (Settings → API Keys)
         """,
     )
-    parser.add_argument("--api-key",  required=True,
-                        help="Your free API key")
+    parser.add_argument("--api-key",  default=None,
+                        help="Your free API key (not needed with --offline)")
     parser.add_argument("--provider", default="gemini",
                         choices=["gemini", "groq", "openrouter"],
                         help="Which free API to use (default: gemini)")
@@ -292,14 +673,32 @@ FREE API KEYS:
     parser.add_argument("--resume",   action="store_true",
                         help="Resume from previous checkpoint")
     parser.add_argument("--delay",    type=float, default=None,
-                        help="Override delay between API calls (seconds)")
+                        help="Pace requests at least this many seconds apart "
+                             "(overrides the provider's requests/min budget)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Requests kept in flight at once (default: 4)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Players per request; failed items are retried one by one (default: 1)")
+    parser.add_argument("--base-url", default=None,
+                        help="Override the provider endpoint URL (e.g. a local test server)")
+    parser.add_argument("--offline",  action="store_true",
+                        help="Make no API calls: re-validate cached replies only "
+                             "(players without one are left for a later run)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached replies and ask the provider again "
+                             "(fresh replies are still cached)")
     parser.add_argument("--dry-run",  action="store_true",
                         help="Test with first 5 players, don't write output")
     args = parser.parse_args()
+    if not args.api_key and not args.offline:
+        parser.error("--api-key is required unless --offline")
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the cache; drop --no-cache")
 
     cfg   = PROVIDERS[args.provider]
     model = args.model or cfg["model"]
-    delay = args.delay or cfg["delay"]
+    rpm   = 60 / args.delay if args.delay else cfg["rpm"]
+    limiter = RateLimiter(rpm, cfg["tpm"], burst=1 if args.delay else None)
 
     # ── Load players ──────────────────────────────────────────────────────
     print(f"\nLoading {PLAYERS_FILE} ...")
@@ -307,13 +706,23 @@ FREE API KEYS:
         players: list[dict] = json.load(f)
     print(f"  {len(players)} players loaded")
 
+    player_index = {p["id"]: i for i, p in enumerate(players)}
+
     # ── Load checkpoint ───────────────────────────────────────────────────
     done: dict = {}
-    if args.resume and CHECKPOINT.exists():
-        with open(CHECKPOINT, encoding="utf-8") as f:
-            done = json.load(f)
+    if args.resume:
+        done = load_checkpoint(CHECKPOINT)
         print(f"  Resuming: {len(done)} players already done")
 
+        # Re-apply earlier updates so the output keeps them
+        replayed = 0
+        for pid, entry in done.items():
+            if entry.get("status") == "updated" and "stats" in entry and pid in player_index:
+                players[player_index[pid]]["stats"].update(entry["stats"])
+                replayed += 1
+        if replayed:
+            print(f"  Replayed {replayed} earlier updates")
+
     # ── Select players ────────────────────────────────────────────────────
     to_process = [
         p for p in players
@@ -325,73 +734,87 @@ FREE API KEYS:
         print(f"\n[DRY RUN] Only 5 players")
 
     total = len(to_process)
-    est_min = total * delay / 60
+    batch_size = max(1, args.batch_size)
+    batches = [to_process[start:start + batch_size] for start in range(0, total, batch_size)]
+    n_requests = len(batches)
+
+    cache = ResponseCache(CACHE_DIR, read=not args.no_cache)
+    n_cached = sum(
+        1 for batch in batches
+        if cache.get(cache.key(args.provider, model, batch_prompt(batch))) is not None
+    )
+    est_min = 0 if args.offline else max(n_requests - n_cached - limiter.burst, 0) / rpm
 
     print(f"\nPlayers to process : {total}")
     print(f"Provider           : {args.provider}  ({model})")
-    print(f"Delay between calls: {delay}s")
+    print(f"Rate limit         : {rpm:g} req/min"
+          + (f", {cfg['tpm']:,} tokens/min" if cfg["tpm"] else "")
+          + f"  ({args.concurrency} in flight)")
+    if batch_size > 1:
+        print(f"Batching           : {batch_size} players/request ({n_requests} requests)")
+    print(f"Cached replies     : {n_cached} / {n_requests}"
+          + ("  (offline: no API calls)" if args.offline else ""))
     print(f"Estimated time     : ~{est_min:.0f} minutes")
     print(f"Cost               : FREE ✓\n")
 
     # ── Process ───────────────────────────────────────────────────────────
-    player_index = {p["id"]: i for i, p in enumerate(players)}
-    updated = skipped = errors = not_confident = 0
-
-    for idx, player in enumerate(to_process, 1):
-        pid  = player["id"]
-        name = player["name"]
-        print(f"[{idx:4d}/{total}] {name:<35} ...", end=" ", flush=True)
-
-        result = call_api(build_prompt(player), args.provider, args.api_key, model)
-
-        if result is None:
-            print("ERROR — skipping")
-            errors += 1
-            done[pid] = {"status": "error"}
-
-        elif not result.get("confident", True):
-            print("UNKNOWN — skipping")
-            not_confident += 1
-            done[pid] = {"status": "not_confident"}
-
-        elif not validate_stats(result, player["stats"]):
-            print(f"INVALID — skipping")
-            skipped += 1
-            done[pid] = {"status": "invalid", "raw": result}
-
-        else:
-            orig = player_index[pid]
-            old_runs = players[orig]["stats"]["totalRuns"]
-
-            players[orig]["stats"]["testRuns"]     = int(result["testRuns"])
-            players[orig]["stats"]["testWickets"]  = int(result["testWickets"])
-            players[orig]["stats"]["testMatches"]  = int(result["testMatches"])
-            players[orig]["stats"]["odiRuns"]      = int(result["odiRuns"])
-            players[orig]["stats"]["odiWickets"]   = int(result["odiWickets"])
-            players[orig]["stats"]["odiMatches"]   = int(result["odiMatches"])
-            players[orig]["stats"]["t20iRuns"]     = int(result["t20iRuns"])
-            players[orig]["stats"]["t20iWickets"]  = int(result["t20iWickets"])
-            players[orig]["stats"]["t20iMatches"]  = int(result["t20iMatches"])
-            players[orig]["stats"]["centuries"]    = int(result["centuries"])
-            players[orig]["stats"]["totalRuns"]    = (
-                int(result["testRuns"]) + int(result["odiRuns"]) + int(result["t20iRuns"])
-            )
-            players[orig]["stats"]["totalWickets"] = (
-                int(result["testWickets"]) + int(result["odiWickets"]) + int(result["t20iWickets"])
-            )
-
-            new_runs = players[orig]["stats"]["totalRuns"]
-            diff = new_runs - old_runs
-            sign = "+" if diff >= 0 else ""
-            print(f"OK   {old_runs:>6,} → {new_runs:>6,}  ({sign}{diff:,} runs)")
-            updated += 1
-            done[pid] = {"status": "updated", "old": old_runs, "new": new_runs}
-
-        # Save checkpoint every player (safe to interrupt)
-        with open(CHECKPOINT, "w", encoding="utf-8") as f:
-            json.dump(done, f, indent=2)
-
-        time.sleep(delay)
+    counts = {"updated": 0, "not_confident": 0, "invalid": 0, "error": 0, "uncached": 0}
+    requeued = 0
+    finished = 0
+
+    log = CheckpointLog(CHECKPOINT, done)
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    pending = {}
+
+    def submit(batch: list[dict]):
+        fut = pool.submit(fetch_stats, batch, args.provider, args.api_key, model,
+                          limiter, args.base_url, cache, args.offline)
+        pending[fut] = batch
+
+    for batch in batches:
+        submit(batch)
+
+    try:
+        while pending:
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in completed:
+                batch = pending.pop(fut)
+                results, err = fut.result()
+                for player in batch:
+                    result = results.get(player["id"]) if results else None
+
+                    # A batch answer that is missing or fails validation may be
+                    # the batch's fault: ask about that player on their own
+                    if len(batch) > 1 and (
+                            result is None
+                            or (result.get("confident", True)
+                                and not validate_stats(result, player["stats"]))):
+                        requeued += 1
+                        submit([player])
+                        continue
+
+                    finished += 1
+                    if err == NOT_CACHED:
+                        # Offline and never asked: leave it for an online run
+                        counts["uncached"] += 1
+                        print(f"[{finished:4d}/{total}] {player['name']:<35} ... NOT CACHED — skipping")
+                        continue
+
+                    if result is None and err is None:
+                        err = "no answer for this player"
+                    outcome, status = apply_result(players, player_index, player, result, err, done)
+                    counts[outcome] += 1
+                    print(f"[{finished:4d}/{total}] {player['name']:<35} ... {status}", flush=True)
+
+                    # Checkpoint every result as it lands (safe to interrupt)
+                    log.append(player["id"], done[player["id"]])
+    except KeyboardInterrupt:
+        print("\nInterrupted — progress is checkpointed, rerun with --resume")
+        pool.shutdown(wait=False, cancel_futures=True)
+        log.close()
+        sys.exit(130)
+    pool.shutdown()
+    log.close()
 
     # ── Save output ───────────────────────────────────────────────────────
     if not args.dry_run:
@@ -400,13 +823,17 @@ FREE API KEYS:
         print(f"\nSaved → {OUTPUT_FILE}")
 
     print(f"\n{'='*55}")
-    print(f"  Updated        : {updated}")
-    print(f"  Not recognised : {not_confident}")
-    print(f"  Invalid resp   : {skipped}")
-    print(f"  API errors     : {errors}")
+    print(f"  Updated        : {counts['updated']}")
+    print(f"  Not recognised : {counts['not_confident']}")
+    print(f"  Invalid resp   : {counts['invalid']}")
+    print(f"  API errors     : {counts['error']}")
+    if requeued:
+        print(f"  Retried singly : {requeued}")
+    if counts["uncached"]:
+        print(f"  Not cached     : {counts['uncached']}")
     print(f"{'='*55}")
 
-    if not args.dry_run and updated > 0:
+    if not args.dry_run and counts["updated"] > 0:
         print("""
 Next steps:
   1. Review:    python scripts/check_enriched.py
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Mirror player headshots as small, same-origin images.
+
+For every player with a headshot_url (ESPN CDN / Wikimedia, or one of the
+hand-collected /headshots/*.jpg files) the source is fetched once, then cut
+to fixed-size squares in public/headshots/mirror/:
+
+    {id}-{size}.jpg    always
+    {id}-{size}.webp   if Pillow was built with WebP
+    {id}-{size}.avif   if Pillow was built with AVIF
+
+Sources are hashed: a player whose source bytes and sizes haven't changed
+since the last run (see scripts/headshot_mirror.json) is not re-encoded.
+The player record then points headshot_url at the largest JPEG, keeps the
+original in headshot_source, and lists every file in headshot_variants
+({url, type, width, height, bytes}).
+
+Requirements:
+    python3 -m pip install requests Pillow
+
+Usage:
+    python scripts/mirror_headshots.py [--sizes 96,192] [--workers 8] [--refresh]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import requests
+except ImportError:
+    print("ERROR: 'requests' not installed. Run: python3 -m pip install requests")
+    sys.exit(1)
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    print("ERROR: 'Pillow' not installed. Run: python3 -m pip install Pillow")
+    sys.exit(1)
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PUBLIC_DIR = SCRIPT_DIR.parent / "public"
+PLAYERS_PATH = PUBLIC_DIR / "players.json"
+MIRROR_DIR = PUBLIC_DIR / "headshots" / "mirror"
+MIRROR_URL = "/headshots/mirror"
+MANIFEST_PATH = SCRIPT_DIR / "headshot_mirror.json"
+SOURCES_DIR = SCRIPT_DIR / "headshot_sources"      # downloaded originals (git-ignored)
+
+DEFAULT_SIZES = (96, 192)      # card cell and its 2x
+CROP_CENTER = (0.5, 0.3)       # headshots frame the face high: crop toward the top
+BACKGROUND = (255, 255, 255)   # JPEG has no alpha; ESPN PNGs are transparent
+
+# (type, extension, Pillow format, save options)
+FORMATS = [
+    ("image/avif", "avif", "AVIF", {"quality": 55}),
+    ("image/webp", "webp", "WEBP", {"quality": 80, "method": 6}),
+    ("image/jpeg", "jpg",  "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+]
+
+
+def available_formats():
+    """The FORMATS this Pillow build can write (JPEG always)."""
+    have = {"AVIF": features.check("avif"), "WEBP": features.check("webp"), "JPEG": True}
+    return [fmt for fmt in FORMATS if have[fmt[2]]]
+
+
+# ── Sources ───────────────────────────────────────────────────────────────
+
+_local = threading.local()
+
+
+def _session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.headers["User-Agent"] = "CricketBingo/1.0"
+    return session
+
+
+def source_url(player):
+    """The original image for a player, or None (already-mirrored URLs map back)."""
+    url = player.get("headshot_url") or ""
+    if url and not url.startswith(MIRROR_URL + "/"):
+        return url
+    return player.get("headshot_source") or None
+
+
+def fetch_source(url, refresh=False):
+    """Bytes of a source image: local files from public/, remote ones downloaded once."""
+    if url.startswith("/"):
+        return (PUBLIC_DIR / url.lstrip("/")).read_bytes()
+
+    path = SOURCES_DIR / hashlib.sha256(url.encode("utf-8")).hexdigest()
+    if path.exists() and not refresh:
+        return path.read_bytes()
+    r = _session().get(url, timeout=20)
+    r.raise_for_status()
+    SOURCES_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(r.content)
+    os.replace(tmp, path)
+    return r.content
+
+
+# ── Transcoding (runs in worker processes) ────────────────────────────────
+
+def transcode(pid, data, sizes, formats):
+    """Write every size × format of one headshot; returns its variant list."""
+    with Image.open(io.BytesIO(data)) as im:
+        im = ImageOps.exif_transpose(im)
+        im = im.convert("RGBA")
+
+    variants = []
+    for size in sizes:
+        square = ImageOps.fit(im, (size, size), Image.LANCZOS, centering=CROP_CENTER)
+        flat = Image.new("RGB", square.size, BACKGROUND)
+        flat.paste(square, mask=square.getchannel("A"))
+        for mime, ext, pil_format, options in formats:
+            name = f"{pid}-{size}.{ext}"
+            out = flat if pil_format == "JPEG" else square
+            path = MIRROR_DIR / name
+            tmp = path.with_name(name + ".tmp")
+            out.save(tmp, pil_format, **options)
+            os.replace(tmp, path)
+            variants.append({
+                "url":    f"{MIRROR_URL}/{name}",
+                "type":   mime,
+                "width":  size,
+                "height": size,
+                "bytes":  path.stat().st_size,
+            })
+    return variants
+
+
+def _transcode_job(job):
+    pid, data, sizes, formats = job
+    try:
+        return pid, transcode(pid, data, sizes, formats), None
+    except Exception as e:
+        return pid, None, f"{type(e).__name__}: {e}"
+
+
+# ── Main ──────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror player headshots as small local images")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Square output sizes in px (default: 96,192)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Transcoding processes (default: CPU count)")
+    parser.add_argument("--download-workers", type=int, default=8,
+                        help="Concurrent source downloads (default: 8)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Download sources again even if already fetched")
+    args = parser.parse_args()
+
+    sizes = sorted({int(s) for s in args.sizes.split(",") if s.strip()})
+    formats = available_formats()
+    print(f"Sizes: {sizes} | Formats: {', '.join(ext for _, ext, _, _ in formats)}")
+
+    print(f"Loading players from {PLAYERS_PATH}")
+    with open(PLAYERS_PATH, "r", encoding="utf-8") as f:
+        players = json.load(f)
+    manifest = {}
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    todo = [(p, source_url(p)) for p in players]
+    todo = [(p, url) for p, url in todo if url]
+    print(f"  {len(players)} players, {len(todo)} with a headshot")
+
+    # 1. Fetch sources (I/O bound: threads)
+    def fetch(item):
+        player, url = item
+        try:
+            return fetch_source(url, args.refresh), None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, args.download_workers)) as pool:
+        fetched = list(pool.map(fetch, todo))
+
+    # 2. Skip sources that are unchanged since the last run
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    fmt_names = [ext for _, ext, _, _ in formats]
+    jobs = []
+    results = {}
+    errors = 0
+    for (player, url), (data, err) in zip(todo, fetched):
+        pid = player["id"]
+        if data is None:
+            errors += 1
+            print(f"  [ERR] {pid}: {err}")
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        entry = manifest.get(pid)
+        if (entry and entry["sha256"] == digest and entry["sizes"] == sizes
+                and entry["formats"] == fmt_names
+                and all((PUBLIC_DIR / v["url"].lstrip("/")).exists() for v in entry["variants"])):
+            results[pid] = entry
+            continue
+        manifest[pid] = {"source": url, "sha256": digest, "sizes": sizes,
+                         "formats": fmt_names, "variants": []}
+        jobs.append((pid, data, sizes, formats))
+    skipped = len(results)
+    print(f"  Unchanged: {skipped} | To transcode: {len(jobs)} | Fetch errors: {errors}")
+
+    # 3. Transcode (CPU bound: processes)
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for i, (pid, variants, err) in enumerate(pool.map(_transcode_job, jobs, chunksize=4)):
+            if variants is None:
+                errors += 1
+                del manifest[pid]
+                print(f"  [ERR] {pid}: {err}")
+                continue
+            manifest[pid]["variants"] = variants
+            results[pid] = manifest[pid]
+            if (i + 1) % 100 == 0:
+                print(f"  ... {i + 1} / {len(jobs)} transcoded")
+
+    # 4. Point players at the mirror
+    for player in players:
+        entry = results.get(player["id"])
+        if entry is None:
+            continue
+        jpegs = [v for v in entry["variants"] if v["type"] == "image/jpeg"]
+        player["headshot_source"] = entry["source"]
+        player["headshot_url"] = jpegs[-1]["url"]
+        player["headshot_variants"] = entry["variants"]
+
+    with open(PLAYERS_PATH, "w", encoding="utf-8") as f:
+        json.dump(players, f, indent=2, ensure_ascii=False)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+
+    total = sum(v["bytes"] for e in results.values() for v in e["variants"])
+    print(f"\n{'='*40}")
+    print(f"Mirrored:        {len(results)} players ({skipped} unchanged)")
+    print(f"Errors:          {errors}")
+    print(f"Mirror size:     {total / (1024 * 1024):.1f} MB in {MIRROR_DIR}")
+    print(f"{'='*40}")
+
+
+if __name__ == "__main__":
+    main()
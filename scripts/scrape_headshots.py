@@ -4,27 +4,43 @@ Maps player names -> cricinfo IDs via Cricsheet register, then builds ESPN CDN U
 
 URL pattern: https://a.espncdn.com/i/headshots/cricket/players/full/{cricinfo_id}.png
 
-Usage: python scripts/scrape_headshots.py
+Usage: python scripts/scrape_headshots.py [--fuzzy] [--workers N] [--rate R] [--recheck]
+
+HEAD results are cached in scripts/headshot_cache.json; reruns only
+re-check IDs whose entry is missing or older than --ttl-days (sending the
+cached ETag, so unchanged images come back as a cheap 304).
 """
 
+import argparse
 import csv
 import io
 import json
+import os
+import re
 import sys
+import threading
 import time
+import unicodedata
 import requests
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # Force unbuffered output
 sys.stdout.reconfigure(line_buffering=True)
 
 PLAYERS_PATH = Path(__file__).parent.parent / "public" / "players.json"
+NAME_MAP_PATH = Path(__file__).parent / "name_map.json"
+VERIFY_CACHE_PATH = Path(__file__).parent / "headshot_cache.json"
 REPORT_PATH = Path(__file__).parent.parent / "headshot_report.csv"
 CRICSHEET_REGISTER_URL = "https://cricsheet.org/register/people.csv"
 ESPN_CDN_URL = "https://a.espncdn.com/i/headshots/cricket/players/full/{pid}.png"
 
 # Manual overrides: our player_id -> cricinfo ID
-# For the 14 unmatched players (mostly Sri Lankan name spelling differences)
+# For the 14 players the plain name lookups missed (mostly Sri Lankan name
+# spelling differences). NameResolver now finds most of these by itself;
+# main() reports any override it agrees with.
 MANUAL_CRICINFO_IDS = {
     "sl_mahela_jayawardene": 49234,
     "ind_dinesh_karthik": 30045,
@@ -43,10 +59,10 @@ MANUAL_CRICINFO_IDS = {
 }
 
 
-def download_cricsheet_register():
+def download_cricsheet_register(url=CRICSHEET_REGISTER_URL):
     """Download and parse the Cricsheet people register."""
     print("Downloading Cricsheet register...")
-    r = requests.get(CRICSHEET_REGISTER_URL, timeout=30)
+    r = requests.get(url, timeout=30)
     r.raise_for_status()
     reader = csv.DictReader(io.StringIO(r.text))
     rows = list(reader)
@@ -54,68 +70,381 @@ def download_cricsheet_register():
     return rows
 
 
-def build_name_lookup(register):
-    """Build a name -> cricinfo_id lookup from the register."""
-    lookup = {}
-    for row in register:
-        cricinfo_id = row.get("key_cricinfo", "").strip()
-        if cricinfo_id:
-            name = row["name"].strip().lower()
-            unique_name = row.get("unique_name", "").strip().lower()
-            lookup[name] = cricinfo_id
-            if unique_name and unique_name != name:
-                lookup[unique_name] = cricinfo_id
-    return lookup
-
-
-def find_cricinfo_id(player, name_lookup):
-    """Find the ESPNcricinfo ID for a player."""
+# ── Name resolution ────────────────────────────────────────────────────────
+# Register names are mostly "initials surname" ("DPMD Jayawardene"), ours
+# are full names ("Mahela Jayawardene"). Names are compared after folding
+# accents, punctuation and common transliteration variants, so
+# "Jayawardena" / "Jayawardene" or "Chamira" / "Chameera" meet.
+
+# Applied in order to every non-initials token
+TRANSLITERATIONS = [
+    (re.compile(r"([bdgkpt])h"), r"\1"),     # aspirates: th → t, dh → d, bh → b
+    (re.compile(r"w"), "v"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ee|ie"), "i"),
+    (re.compile(r"oo|ou"), "u"),
+    (re.compile(r"y"), "i"),
+    (re.compile(r"(.)\1+"), r"\1"),          # doubled letters
+    (re.compile(r"(?<=..)[ae]$"), "a"),       # -ena / -ene
+]
+
+FUZZY_THRESHOLD = 0.75    # trigram Dice similarity for --fuzzy matches
+
+
+def _ascii_tokens(name):
+    """Lowercase ASCII tokens of a name, accents and punctuation dropped."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r"['\-.]", "", name)
+    return re.sub(r"[^A-Za-z0-9 ]", " ", name).split()
+
+
+def _is_initials(token):
+    return token.isupper() and len(token) <= 5
+
+
+def _fold_token(token):
+    token = token.lower()
+    for pattern, repl in TRANSLITERATIONS:
+        token = pattern.sub(repl, token)
+    return token
+
+
+def fold_name(name):
+    """Comparison key for a name: folded tokens joined by spaces."""
+    return " ".join(_fold_token(t) for t in _ascii_tokens(name))
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolver:
+    """
+    Register names -> cricinfo IDs, indexed so each lookup is a handful of
+    dict probes rather than a scan of the register:
+
+        full      folded full name (register name, unique name, and the
+                  display name name_map.json gives it)
+        short     folded "first last" of each of those
+        initial   (surname, first initial)
+        any       (surname, any initial) — Sri Lankan registers put
+                  the name a player goes by anywhere in the initials
+        grams     trigram -> names, for --fuzzy
+
+    initial and any hold each name under its plain (unfolded) surname and
+    its folded one. The plain surname is tried first, so folding only
+    bridges spellings that don't match as written ("D Smit" doesn't take
+    "Dwayne Smith" from "DR Smith"). A folded-only hit with several IDs is
+    too loose to pick from: it resolves to nothing and is recorded in
+    `ambiguous`.
+
+    The any-initial index also matches middle initials ("Gautam Sharma" →
+    "RG Sharma"), so resolve() only falls back to it when asked to. Every
+    hit it gives is recorded in `loose`, even a unique one.
+
+    Every index keeps candidate IDs in register order. When a key has more
+    than one, the name is recorded in `ambiguous`. Name and first-last
+    lookups use the last row with that name, like the plain name dict they
+    replace. The other lookups use the first candidate.
+    """
+
+    def __init__(self, register, aliases=None, fuzzy=False):
+        aliases = aliases or {}
+        self.full = defaultdict(list)
+        self.short = defaultdict(list)
+        self.initial = defaultdict(list)
+        self.any = defaultdict(list)
+        self.fuzzy = fuzzy
+        self.keys = []                  # fuzzy entries: (trigram count, id)
+        self.grams = defaultdict(list)
+        self.ambiguous = []
+        self.loose = []
+
+        for row in register:
+            cricinfo_id = row.get("key_cricinfo", "").strip()
+            if not cricinfo_id:
+                continue
+            names = {row["name"].strip(), row.get("unique_name", "").strip()}
+            names |= {aliases[n] for n in list(names) if n in aliases}
+            for name in filter(None, names):
+                self._add(name, cricinfo_id)
+
+    @staticmethod
+    def _put(index, key, cricinfo_id, last_wins=False):
+        ids = index[key]
+        if cricinfo_id not in ids:
+            ids.append(cricinfo_id)
+        elif last_wins:
+            ids.remove(cricinfo_id)
+            ids.append(cricinfo_id)
+
+    def _add(self, name, cricinfo_id):
+        tokens = _ascii_tokens(name)
+        if not tokens:
+            return
+        folded = [_fold_token(t) for t in tokens]
+        full = " ".join(folded)
+        if self.fuzzy and cricinfo_id not in self.full.get(full, ()):
+            grams = _trigrams(full)
+            for gram in grams:
+                self.grams[gram].append(len(self.keys))
+            self.keys.append((len(grams), cricinfo_id))
+        self._put(self.full, full, cricinfo_id, last_wins=True)
+        if len(tokens) < 2:
+            return
+        self._put(self.short, f"{folded[0]} {folded[-1]}", cricinfo_id, last_wins=True)
+        for surname in (tokens[-1].lower(), "~" + folded[-1]):
+            self._put(self.initial, (surname, tokens[0][0].lower()), cricinfo_id)
+            for token in tokens[:-1]:
+                letters = token.lower() if _is_initials(token) else token[0].lower()
+                for letter in letters:
+                    self._put(self.any, (surname, letter), cricinfo_id)
+
+    def _pick(self, name, how, ids, last=False):
+        used = ids[-1] if last else ids[0]
+        if len(ids) > 1:
+            self.ambiguous.append((name, how, ids, used))
+        return used, how
+
+    @staticmethod
+    def _surname_ids(index, keys):
+        """
+        IDs under the plain surname key, else the folded one. An empty list
+        means only the folded key matched, with several IDs.
+        """
+        ids = index.get(keys[0])
+        if ids:
+            return ids
+        ids = index.get(keys[1])
+        if ids and len(ids) > 1:
+            return []
+        return ids
+
+    def _fuzzy(self, folded):
+        grams = _trigrams(folded)
+        shared = Counter(k for gram in grams for k in self.grams.get(gram, ()))
+        scores = {}
+        for k, n in shared.items():
+            size, cricinfo_id = self.keys[k]
+            score = 2 * n / (len(grams) + size)
+            scores[cricinfo_id] = max(score, scores.get(cricinfo_id, 0))
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return [cid for cid, score in ranked if score >= FUZZY_THRESHOLD]
+
+    def resolve(self, name, any_initial=False):
+        """
+        Return (cricinfo_id, how it matched), or (None, None). With
+        any_initial, (surname, any initial) is tried after the first initial.
+        """
+        tokens = _ascii_tokens(name)
+        if not tokens:
+            return None, None
+        folded = [_fold_token(t) for t in tokens]
+
+        ids = self.full.get(" ".join(folded))
+        if ids:
+            return self._pick(name, "name", ids, last=True)
+        if len(tokens) < 2:
+            return None, None
+
+        ids = self.short.get(f"{folded[0]} {folded[-1]}")
+        if ids:
+            return self._pick(name, "first_last", ids, last=True)
+
+        # Surname as written first, then folded ("~" keeps the two apart)
+        initial = tokens[0][0].lower()
+        keys = [(tokens[-1].lower(), initial), ("~" + folded[-1], initial)]
+        ids = self._surname_ids(self.initial, keys)
+        if ids:
+            return self._pick(name, "surname_initial", ids)
+        if ids is not None:
+            self.ambiguous.append((name, "surname_initial", self.initial[keys[1]], None))
+            return None, None
+
+        ids = self._surname_ids(self.any, keys) if any_initial else None
+        if ids is not None and not ids:
+            self.ambiguous.append((name, "surname_any_initial", self.any[keys[1]], None))
+            return None, None
+        if ids:
+            cricinfo_id, how = self._pick(name, "surname_any_initial", ids)
+            self.loose.append((name, cricinfo_id))
+            return cricinfo_id, how
+
+        if self.fuzzy:
+            ids = self._fuzzy(" ".join(folded))
+            if ids:
+                return self._pick(name, "fuzzy", ids)
+        return None, None
+
+
+def load_name_map():
+    """Register name -> display name overrides shared with collect_data.py."""
+    if not NAME_MAP_PATH.exists():
+        return {}
+    with open(NAME_MAP_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_cricinfo_id(player, resolver):
+    """Find the ESPNcricinfo ID for a player; returns (id, how it matched)."""
     pid = player["id"]
-    name = player["name"].strip()
 
     # 1. Check manual overrides first
     if pid in MANUAL_CRICINFO_IDS:
-        return str(MANUAL_CRICINFO_IDS[pid])
-
-    # 2. Exact name match
-    cricinfo_id = name_lookup.get(name.lower())
-    if cricinfo_id:
-        return cricinfo_id
-
-    # 3. Try first + last name only
-    parts = name.split()
-    if len(parts) >= 2:
-        short = f"{parts[0]} {parts[-1]}".lower()
-        cricinfo_id = name_lookup.get(short)
-        if cricinfo_id:
-            return cricinfo_id
-
-    # 4. Try matching by last name + first initial
-    if len(parts) >= 2:
-        last = parts[-1].lower()
-        first_initial = parts[0][0].lower()
-        for key, cid in name_lookup.items():
-            key_parts = key.split()
-            if len(key_parts) >= 2:
-                if key_parts[-1] == last and key_parts[0].startswith(first_initial):
-                    return cid
-
-    return None
-
-
-def verify_image_exists(cricinfo_id):
-    """Check if the ESPN CDN has a headshot for this player ID."""
-    url = ESPN_CDN_URL.format(pid=cricinfo_id)
-    try:
-        r = requests.head(url, timeout=5)
-        content_length = int(r.headers.get("content-length", 0))
+        return str(MANUAL_CRICINFO_IDS[pid]), "manual"
+
+    # 2. Indexed register lookups (any initial only for Sri Lankan names)
+    return resolver.resolve(player["name"].strip(),
+                            any_initial=player.get("country") == "Sri Lanka")
+
+
+# ── Verification ───────────────────────────────────────────────────────────
+
+class HostRateLimiter:
+    """Token bucket per host: at most `rate` requests/second to each."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.buckets = {}           # host -> [tokens, last refill]
+
+    def acquire(self, host):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens, updated = self.buckets.get(host, (1.0, now))
+                tokens = min(1.0, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self.buckets[host] = [tokens - 1, now]
+                    return
+                self.buckets[host] = [tokens, now]
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+class HeadshotVerifier:
+    """
+    HEAD-checks CDN headshots on a bounded thread pool, reusing one
+    keep-alive session per worker and pacing each host through a shared
+    rate limiter. Results are cached by cricinfo ID as
+    {status, length, etag, checked_at}; entries younger than `ttl` seconds
+    are trusted, older ones are revalidated with If-None-Match. Only
+    definitive answers are cached; a 429 or 5xx that outlasts the retries
+    leaves any existing entry as it was.
+    """
+
+    RETRIES = 2
+    DEFINITIVE = (200, 304, 403, 404)   # the only answers worth caching
+
+    def __init__(self, cdn_url=ESPN_CDN_URL, cache_path=None, rate=10.0, workers=8,
+                 ttl=7 * 86400, recheck=False):
+        self.cdn_url = cdn_url
+        self.cache_path = cache_path
+        self.limiter = HostRateLimiter(rate)
+        self.workers = workers
+        self.ttl = ttl
+        self.recheck = recheck
+        self.cache = self._load()
+        self.checked = 0
+        self._local = threading.local()
+
+    def _load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def fresh(self, cricinfo_id):
+        entry = self.cache.get(cricinfo_id)
+        return (entry is not None and not self.recheck
+                and time.time() - entry.get("checked_at", 0) < self.ttl)
+
+    def _head(self, cricinfo_id):
+        url = self.cdn_url.format(pid=cricinfo_id)
+        entry = self.cache.get(cricinfo_id)
+        headers = {}
+        if entry and entry.get("etag") and not self.recheck:
+            headers["If-None-Match"] = entry["etag"]
+
+        for attempt in range(self.RETRIES + 1):
+            self.limiter.acquire(urlsplit(url).netloc)
+            try:
+                r = self._session().head(url, headers=headers, timeout=5)
+            except requests.RequestException:
+                if attempt == self.RETRIES:
+                    return None
+                time.sleep(0.5 * 2 ** attempt)
+                continue
+            if (r.status_code == 429 or r.status_code >= 500) and attempt < self.RETRIES:
+                time.sleep(0.5 * 2 ** attempt)
+                continue
+            break
+
+        if r.status_code not in self.DEFINITIVE:
+            return None     # still rate-limited / failing (or unexpected): retry next run
+        self.checked += 1
+        if r.status_code == 304 and entry:
+            return dict(entry, checked_at=time.time())
+        return {
+            "status":     r.status_code,
+            "length":     int(r.headers.get("content-length", 0)),
+            "etag":       r.headers.get("etag", ""),
+            "checked_at": time.time(),
+        }
+
+    def verify_all(self, cricinfo_ids):
+        """Check every ID that has no fresh cache entry; returns how many were checked."""
+        stale = sorted({cid for cid in cricinfo_ids if not self.fresh(cid)})
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            for cid, entry in zip(stale, pool.map(self._head, stale)):
+                if entry is not None:       # network / server failures aren't cached
+                    self.cache[cid] = entry
+        return len(stale)
+
+    def exists(self, cricinfo_id):
+        """True if the CDN has a real headshot for this player ID."""
+        entry = self.cache.get(cricinfo_id)
         # Valid images are > 1KB (tiny responses are placeholder/error images)
-        return r.status_code == 200 and content_length > 1000
-    except Exception:
-        return False
+        return entry is not None and entry["status"] == 200 and entry["length"] > 1000
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Find ESPN CDN headshots for players.json")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="Fall back to trigram fuzzy name matching")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Concurrent HEAD requests (default: 8)")
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="Max requests per second to each host (default: 10)")
+    parser.add_argument("--ttl-days", type=float, default=7,
+                        help="Trust cached checks up to this age (default: 7)")
+    parser.add_argument("--recheck", action="store_true",
+                        help="Ignore the check cache and verify every image again")
+    parser.add_argument("--cdn-url", default=ESPN_CDN_URL,
+                        help=argparse.SUPPRESS)     # point at a local stub server
+    parser.add_argument("--register-url", default=CRICSHEET_REGISTER_URL,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
     # Load players
     print(f"Loading players from {PLAYERS_PATH}")
     with open(PLAYERS_PATH, "r", encoding="utf-8") as f:
@@ -123,36 +452,55 @@ def main():
     print(f"  {len(players)} players loaded")
 
     # Download cricsheet register and build lookup
-    register = download_cricsheet_register()
-    name_lookup = build_name_lookup(register)
-    print(f"  {len(name_lookup)} name->cricinfo mappings")
+    register = download_cricsheet_register(args.register_url)
+    resolver = NameResolver(register, load_name_map(), fuzzy=args.fuzzy)
+    print(f"  {len(resolver.full)} name->cricinfo mappings")
+
+    # Manual overrides the resolver now gets right on its own
+    redundant = [
+        pid for pid, cid in MANUAL_CRICINFO_IDS.items()
+        for player in players if player["id"] == pid
+        if resolver.resolve(player["name"], any_initial=True)[0] == str(cid)
+    ]
+    resolver.ambiguous.clear()
+    resolver.loose.clear()
+    if redundant:
+        print(f"  {len(redundant)} manual overrides also resolve by name: {', '.join(redundant)}")
+
+    # Find cricinfo IDs, then verify their images concurrently
+    matches = [find_cricinfo_id(player, resolver) for player in players]
+    verifier = HeadshotVerifier(args.cdn_url, VERIFY_CACHE_PATH, rate=args.rate,
+                                workers=args.workers, ttl=args.ttl_days * 86400,
+                                recheck=args.recheck)
+    ids = [cid for cid, _ in matches if cid]
+    t0 = time.time()
+    stale = verifier.verify_all(ids)
+    verifier.save()
+    print(f"Verified {stale} images in {time.time() - t0:.1f}s "
+          f"({len(set(ids)) - stale} fresh in cache, {verifier.checked} answered)")
 
     # Process each player
     updated = 0
     verified = 0
     no_id = 0
     no_image = 0
-    report_lines = ["id,name,country,cricinfo_id,status,headshot_url"]
+    report_lines = ["id,name,country,cricinfo_id,status,headshot_url,match"]
 
     for i, player in enumerate(players):
         pid = player["id"]
         name = player["name"]
         country = player.get("country", "")
-
-        # Find cricinfo ID
-        cricinfo_id = find_cricinfo_id(player, name_lookup)
+        cricinfo_id, how = matches[i]
 
         if not cricinfo_id:
             no_id += 1
             print(f"[{i+1}/{len(players)}] {name} ({country}) — NO CRICINFO ID")
-            report_lines.append(f'{pid},"{name}",{country},,no_id,')
+            report_lines.append(f'{pid},"{name}",{country},,no_id,,')
             continue
 
         # Build ESPN CDN URL
         espn_url = ESPN_CDN_URL.format(pid=cricinfo_id)
-
-        # Verify image exists
-        exists = verify_image_exists(cricinfo_id)
+        exists = verifier.exists(cricinfo_id)
 
         if exists:
             player["headshot_url"] = espn_url
@@ -165,10 +513,7 @@ def main():
             status = "no_image"
             print(f"[{i+1}/{len(players)}] {name} — NO IMAGE on ESPN CDN ({cricinfo_id})")
 
-        report_lines.append(f'{pid},"{name}",{country},{cricinfo_id},{status},"{espn_url if exists else ""}"')
-
-        # Rate limit: ~10 requests/sec (just HEAD requests)
-        time.sleep(0.1)
+        report_lines.append(f'{pid},"{name}",{country},{cricinfo_id},{status},"{espn_url if exists else ""}",{how}')
 
     # Save updated players
     print(f"\nSaving to {PLAYERS_PATH}...")
@@ -186,6 +531,12 @@ def main():
     print(f"Updated with image:  {verified}")
     print(f"No image on ESPN:    {no_image}")
     print(f"No cricinfo ID:      {no_id}")
+    print(f"Ambiguous matches:   {len(resolver.ambiguous)}")
+    for name, how, ids, used in resolver.ambiguous:
+        print(f"  {name}: {how} -> {', '.join(ids)} (used {used or 'none'})")
+    print(f"Any-initial matches: {len(resolver.loose)} (check these)")
+    for name, cricinfo_id in resolver.loose:
+        print(f"  {name} -> {cricinfo_id}")
     print(f"Report saved to:     {REPORT_PATH}")
 
 
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Estimate how hard each daily grid is by playing it many times.
+
+Every (date, size) grid comes from daily_grids.GridGenerator, exactly as
+the browser builds it. Playouts then follow the rules in useGameState.ts:
+
+  - one card per turn: place it, skip it or play the wildcard on it
+  - a wrong placement or a skip costs one of the 20 / 25 / 30 lives
+    (3x3 / 4x4 / 5x5); a valid placement costs nothing
+  - after each turn the deck skips cards that fit no open cell
+  - the game is won when every cell is filled and lost when lives or
+    playable cards run out
+  - scoring as in calculateScore(), +50 per wildcard, +500 for the win
+
+For each card, the simulated player believes it fits each open cell it
+really fits with probability --recall × TYPE_RECALL[type] (countries are
+easier to place than stat thresholds or combos). It also wrongly believes
+it fits each other open cell with probability --mistake. If several
+believed cells are open it picks one by --policy: "greedy" takes the
+highest getRecommendedCell() priority (combo > teammate > trophy > stat >
+role > team > country), "random" any of them. A wrong pick costs a life,
+like a skip. If it believes no cell fits, it guesses an open cell with
+probability --guess and otherwise skips. The wildcard goes on the current
+card once at most --wildcard-at cells are open and it believes no cell
+fits it. Of the open cells, it takes the one with the fewest matching
+cards left in the deck.
+
+Calibration of the defaults (recall 0.7, mistake 0.12): the 40 daily grids
+from 2026-03-01 on, 2,000 playouts over 8 decks each, on the current
+players.json. Win rates (min / median / max) came out as:
+
+  3x3  0.78 / 0.95 / 1.00
+  4x4  0.50 / 0.85 / 0.98
+  5x5  0.26 / 0.52 / 0.87
+
+--min-win 0.3 and --max-win 0.97 sit near the 5th and 95th percentiles
+across all sizes. Recalibrate when players.json or the pool changes
+shape.
+
+Each grid is played with its real deck plus --decks - 1 extra decks dealt
+by buildCoverDeck() from derived seeds, so the results describe the grid
+as well as that day's draw. Per deck, a card is an int whose bit c is set
+if it fits cell c, so all playouts of a deck advance together as NumPy
+arrays. Grids fan out over a process pool.
+
+Requirements:
+    python3 -m pip install numpy
+
+Usage:
+    python scripts/simulate_grids.py [--start 2026-01-01] [--days 30] [--sizes 3,4,5]
+                                     [--playouts 10000] [--policy greedy|random]
+                                     [--recall 0.7] [--mistake 0.12] [--guess 0.1]
+                                     [--out report.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("ERROR: 'numpy' not installed. Run: python3 -m pip install numpy")
+    sys.exit(1)
+
+from categories import load_pools
+from daily_grids import POOL_NAME, GridGenerator, create_rng, date_seed, seeded_shuffle
+
+# Force unbuffered output
+sys.stdout.reconfigure(line_buffering=True)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PLAYERS_PATH = SCRIPT_DIR.parent / "public" / "players.json"
+
+LIVES = {3: 20, 4: 25, 5: 30}      # remainingPlayers in createInitialState()
+WILDCARDS = 1
+WILDCARD_SCORE = 50
+BINGO_BONUS = 500
+
+# Default player model (see the module docstring for the calibration)
+RECALL = 0.7
+MISTAKE = 0.12
+GUESS = 0.1
+MIN_WIN = 0.3
+MAX_WIN = 0.97
+
+# getRecommendedCell() / calculateScore()
+PRIORITY_ORDER = {"combo": 1, "teammate": 2, "trophy": 3, "stat": 4, "role": 5, "team": 6, "country": 7}
+SCORE_BONUS = {"combo": 50, "teammate": 30, "trophy": 20}
+
+# How much of --recall carries over to each category type: a country is
+# easy to place, a stat threshold or a teammate link much less so
+TYPE_RECALL = {"country": 1.0, "team": 0.9, "role": 0.9, "trophy": 0.7, "achievement": 0.6,
+               "stat": 0.6, "teammate": 0.5, "combo": 0.5}
+
+
+def cell_masks(gen, grid, deck):
+    """For each card in `deck` (player positions), the bitmask of grid cells it fits."""
+    members = [gen.index.members(cat["validatorKey"]) for cat in grid]
+    return np.array([sum(1 << c for c, m in enumerate(members) if m >> i & 1) for i in deck],
+                    dtype=np.int64)
+
+
+def _bits(x, cells):
+    """(n,) bitmasks → (n, cells) booleans."""
+    return (x[:, None] >> np.arange(cells)) & 1 == 1
+
+
+def playout(masks, grid, n, rng, policy="greedy", recall=RECALL, mistake=MISTAKE, guess=GUESS,
+            wildcard_at=1):
+    """Play `n` games of one grid + deck at once; returns per-game result arrays."""
+    cells = len(grid)
+    size = int(round(cells ** 0.5))
+    full = (1 << cells) - 1
+    deck_len = len(masks)
+    # Tie-break by grid order, like the stable sort in getRecommendedCell()
+    rank = np.array([PRIORITY_ORDER.get(cat["type"], 99) * cells + c
+                     for c, cat in enumerate(grid)], dtype=np.float64)
+    base = np.array([100 + SCORE_BONUS.get(cat["type"], 0) for cat in grid])
+    cell_recall = np.array([recall * TYPE_RECALL.get(cat["type"], 1.0) for cat in grid])
+    # left[d, c]: cards from position d on that fit cell c
+    left = np.zeros((deck_len + 1, cells), dtype=np.int64)
+    left[:deck_len] = np.cumsum(_bits(masks, cells)[::-1], axis=0)[::-1]
+
+    pos = np.zeros(n, dtype=np.int64)
+    filled = np.zeros(n, dtype=np.int64)
+    lives = np.full(n, LIVES[size])
+    wild = np.full(n, WILDCARDS)
+    streak = np.zeros(n, dtype=np.int64)
+    score = np.zeros(n, dtype=np.int64)
+    turns = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+    won = np.zeros(n, dtype=bool)
+
+    def advance():
+        """postTurn(): move each live game to its next playable card, or lose it."""
+        while True:
+            at = np.minimum(pos, deck_len - 1)
+            stuck = active & (pos < deck_len) & (masks[at] & ~filled == 0)
+            if not stuck.any():
+                break
+            pos[stuck] += 1
+        active[pos >= deck_len] = False
+
+    advance()
+    while active.any():
+        g = np.flatnonzero(active)
+        k = len(g)
+        fits = masks[pos[g]]
+        open_ = full & ~filled[g]
+        eligible = fits & open_
+        open_bits = _bits(open_, cells)
+
+        # Open cells the player believes the card fits: each true fit with
+        # the cell's recall, each other open cell with probability mistake
+        draw = rng.random((k, cells))
+        believed = np.where(_bits(eligible, cells), draw < cell_recall,
+                            open_bits & (draw < mistake))
+
+        # Place in a believed cell, chosen by policy
+        keys = np.broadcast_to(rank, (k, cells)) if policy == "greedy" else rng.random((k, cells))
+        has_belief = believed.any(axis=1)
+        target = np.where(believed, keys, np.inf).argmin(axis=1)
+
+        # Otherwise wildcard (late in the game), guess, or skip
+        n_open = open_bits.sum(axis=1)
+        use_wild = ~has_belief & (wild[g] > 0) & (n_open <= wildcard_at)
+        hardest = np.where(open_bits, left[pos[g] + 1], np.iinfo(np.int64).max).argmin(axis=1)
+        guessing = ~has_belief & ~use_wild & (rng.random(k) < guess)
+        guessed = np.where(open_bits, rng.random((k, cells)), np.inf).argmin(axis=1)
+        target = np.where(use_wild, hardest, np.where(guessing, guessed, target))
+
+        # A skip or a wrong placement costs a life; the card is used up either way
+        bit = np.left_shift(1, target)
+        valid = (has_belief | guessing) & (eligible & bit != 0)
+        lost_life = ~(valid | use_wild)
+
+        gs = g[valid | use_wild]
+        filled[gs] |= bit[valid | use_wild]
+        streak[gs] += 1
+        mult = np.minimum(1 + streak[g[valid]] * 0.5, 3.0)
+        score[g[valid]] += np.round(base[target[valid]] * mult).astype(np.int64)
+        score[g[use_wild]] += WILDCARD_SCORE
+        wild[g[use_wild]] -= 1
+        streak[g[lost_life]] = 0
+        lives[g[lost_life]] -= 1
+        turns[g] += 1
+        pos[g] += 1
+
+        done = filled[g] == full
+        won[g[done]] = True
+        score[g[done]] += BINGO_BONUS
+        active[g[done | (lives[g] <= 0)]] = False
+        advance()
+
+    return {"won": won, "turns": turns, "cards": pos, "score": score,
+            "lives_lost": LIVES[size] - lives, "filled": _bits(filled, cells).sum(axis=1)}
+
+
+# ── Grids (fan out over a process pool) ──
+
+_generator = None
+
+
+def _init_worker(players, pool):
+    global _generator
+    _generator = GridGenerator(players, pool)
+
+
+def deal_decks(gen, date_str, size, day, grid, extra):
+    """The day's deck plus `extra` more buildCoverDeck() deals from derived seeds."""
+    cells = size * size
+    by_id = {p["id"]: i for i, p in enumerate(gen.players)}
+    decks = [[by_id[pid] for pid in day["deck"]]]
+    for k in range(extra):
+        rng = create_rng(date_seed(f"{date_str}-{size}-deal{k}"))
+        decks.append(gen.build_cover_deck(grid, max(40, cells * 5),
+                                          lambda items: seeded_shuffle(items, rng)))
+    return decks
+
+
+def _simulate(job):
+    date_str, size, opts = job
+    gen = _generator
+    by_cat = {cat["id"]: cat for cat in gen.pool}
+    day = gen.daily_game(date_str, size)
+    grid = [by_cat[cid] for cid in day["grid"]]
+    decks = deal_decks(gen, date_str, size, day, grid, opts["decks"] - 1)
+
+    rng = np.random.default_rng([opts["seed"], day["seed"] & 0xFFFFFFFF, size])
+    per_deck = -(-opts["playouts"] // len(decks))
+    runs = [playout(cell_masks(gen, grid, deck), grid, per_deck, rng, opts["policy"],
+                    opts["recall"], opts["mistake"], opts["guess"], opts["wildcard_at"])
+            for deck in decks]
+    res = {key: np.concatenate([r[key] for r in runs]) for key in runs[0]}
+    win_turns = res["turns"][res["won"]]
+
+    return {
+        "date": date_str,
+        "size": size,
+        "grid": day["grid"],
+        "solvable": day["solvable"],
+        "playouts": len(res["won"]),
+        "win_rate": round(float(res["won"].mean()), 4),
+        "turns_to_bingo": round(float(win_turns.mean()), 2) if len(win_turns) else None,
+        "turns_to_bingo_p90": int(np.percentile(win_turns, 90)) if len(win_turns) else None,
+        "mean_score": round(float(res["score"].mean()), 1),
+        "mean_lives_lost": round(float(res["lives_lost"].mean()), 2),
+        "mean_filled": round(float(res["filled"].mean()), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo difficulty estimate for daily grids")
+    parser.add_argument("--start", default=date.today().isoformat(),
+                        help="First date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=30, help="Number of days (default: 30)")
+    parser.add_argument("--sizes", default="3,4,5", help="Grid sizes (default: 3,4,5)")
+    parser.add_argument("--playouts", type=int, default=10000,
+                        help="Playouts per grid (default: 10000)")
+    parser.add_argument("--decks", type=int, default=8,
+                        help="Decks per grid: the day's deck + extra deals (default: 8)")
+    parser.add_argument("--policy", choices=["greedy", "random"], default="greedy",
+                        help="Which known cell to place in (default: greedy priority)")
+    parser.add_argument("--recall", type=float, default=RECALL,
+                        help=f"Chance the player knows a card fits a cell (default: {RECALL})")
+    parser.add_argument("--mistake", type=float, default=MISTAKE,
+                        help="Chance the player wrongly believes a card fits an open cell "
+                             f"(default: {MISTAKE})")
+    parser.add_argument("--guess", type=float, default=GUESS,
+                        help=f"Chance of guessing a cell instead of skipping (default: {GUESS})")
+    parser.add_argument("--wildcard-at", type=int, default=1,
+                        help="Use the wildcard once this few cells are open (default: 1)")
+    parser.add_argument("--min-win", type=float, default=MIN_WIN,
+                        help=f"Flag grids won less often than this (default: {MIN_WIN})")
+    parser.add_argument("--max-win", type=float, default=MAX_WIN,
+                        help=f"Flag grids won more often than this (default: {MAX_WIN})")
+    parser.add_argument("--seed", type=int, default=0, help="Simulation seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Worker processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--players", type=Path, default=PLAYERS_PATH,
+                        help="Player file (default: public/players.json)")
+    parser.add_argument("--out", type=Path, help="Write per-grid results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    start = date.fromisoformat(args.start)
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(args.days)]
+    opts = {"playouts": args.playouts, "decks": max(1, args.decks), "policy": args.policy,
+            "recall": args.recall, "mistake": args.mistake, "guess": args.guess, "wildcard_at": args.wildcard_at,
+            "seed": args.seed}
+
+    print(f"Loading players from {args.players}")
+    with open(args.players, "r", encoding="utf-8") as f:
+        players = json.load(f)
+    pool = load_pools()[POOL_NAME]
+    print(f"  {len(dates)} days × sizes {sizes}, {args.playouts} playouts each "
+          f"({args.policy}, recall {args.recall}, mistake {args.mistake}, guess {args.guess})")
+
+    t0 = time.time()
+    jobs = [(d, n, opts) for d in dates for n in sizes]
+    if args.workers <= 1:
+        _init_worker(players, pool)
+        results = list(map(_simulate, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(players, pool)) as ex:
+            results = list(ex.map(_simulate, jobs))
+    elapsed = time.time() - t0
+
+    print(f"\n{'date':<12}{'size':>5}{'win':>8}{'turns':>8}{'score':>9}{'lives':>8}")
+    for r in results:
+        flag = ""
+        if r["win_rate"] < args.min_win:
+            flag = "  [HARD]"
+        elif r["win_rate"] > args.max_win:
+            flag = "  [EASY]"
+        turns = f"{r['turns_to_bingo']:.1f}" if r["turns_to_bingo"] is not None else "-"
+        print(f"{r['date']:<12}{r['size']:>5}{r['win_rate']:>8.1%}{turns:>8}"
+              f"{r['mean_score']:>9.0f}{r['mean_lives_lost']:>8.1f}{flag}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"options": opts, "grids": results}, f, indent=2)
+
+    total = sum(r["playouts"] for r in results)
+    print(f"\n{'='*40}")
+    for n in sizes:
+        rates = [r["win_rate"] for r in results if r["size"] == n]
+        print(f"{n}x{n} win rate:    {min(rates):.1%} .. {max(rates):.1%} "
+              f"(mean {sum(rates) / len(rates):.1%})")
+    hard = sum(r["win_rate"] < args.min_win for r in results)
+    easy = sum(r["win_rate"] > args.max_win for r in results)
+    print(f"Flagged:         {hard} hard, {easy} easy")
+    print(f"Playouts:        {total} in {elapsed:.1f}s ({total / elapsed:.0f}/s)")
+    if args.out:
+        print(f"Output:          {args.out}")
+    print(f"{'='*40}")
+
+
+if __name__ == "__main__":
+    main()
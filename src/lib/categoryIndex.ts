@@ -0,0 +1,102 @@
+/**
+ * Reader for the category index written by scripts/build_bundles.py
+ * (public/data/index.{hash}.json, listed as "index" in data/bundles.json).
+ *
+ * Players are numbered by their position in `ids`. A bitmap is a bitset
+ * over those positions: bit i is byte i >> 3, bit i & 7. Pooled validator
+ * keys and every team/country/role/trophy/category are stored; other stat
+ * thresholds come from the sorted `stats` columns and combos are intersected
+ * from their parts.
+ */
+import { splitCombo } from "./gameEngine";
+
+export interface CategoryIndexFile {
+  version: number;
+  ids: string[];
+  bitmaps: Record<string, string>; // validatorKey → base64 bitset
+  stats: Record<string, { values: number[]; players: number[] }>; // values ascending
+}
+
+const STAT_KEY = /^stat:(\w+)>=(\d+)$/;
+
+export class CategoryIndex {
+  readonly ids: string[];
+  private readonly size: number;
+  private readonly encoded: Record<string, string>;
+  private readonly stats: CategoryIndexFile["stats"];
+  private readonly cache = new Map<string, Uint8Array>();
+
+  constructor(file: CategoryIndexFile) {
+    if (file.version !== 1) throw new Error(`Unsupported category index v${file.version}`);
+    this.ids = file.ids;
+    this.size = (file.ids.length + 7) >> 3;
+    this.encoded = file.bitmaps;
+    this.stats = file.stats;
+  }
+
+  /** Bitmap of players with stats[field] >= threshold, or null for an unknown field. */
+  atLeast(field: string, threshold: number): Uint8Array | null {
+    const column = this.stats[field];
+    if (!column) return null;
+    const { values, players } = column;
+    let lo = 0;
+    let hi = values.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (values[mid] < threshold) lo = mid + 1;
+      else hi = mid;
+    }
+    const bits = new Uint8Array(this.size);
+    for (let k = lo; k < players.length; k++) bits[players[k] >> 3] |= 1 << (players[k] & 7);
+    return bits;
+  }
+
+  /** Bitmap of players fitting a validatorKey, or null if the index can't answer it. */
+  members(key: string): Uint8Array | null {
+    const cached = this.cache.get(key);
+    if (cached) return cached;
+
+    let bits: Uint8Array | null = null;
+    if (key in this.encoded) {
+      bits = Uint8Array.from(atob(this.encoded[key]), (c) => c.charCodeAt(0));
+    } else if (key.startsWith("combo:")) {
+      for (const part of splitCombo(key.slice("combo:".length))) {
+        const partBits = this.members(part);
+        if (!partBits) return null;
+        bits = bits ? intersect(bits, partBits) : partBits;
+      }
+    } else {
+      const stat = key.match(STAT_KEY);
+      if (stat) bits = this.atLeast(stat[1], parseInt(stat[2], 10));
+    }
+
+    if (bits) this.cache.set(key, bits);
+    return bits;
+  }
+
+  /** Player ids set in a bitmap, in index order. */
+  toIds(bits: Uint8Array): string[] {
+    const out: string[] = [];
+    for (let i = 0; i < this.ids.length; i++) {
+      if (bits[i >> 3] & (1 << (i & 7))) out.push(this.ids[i]);
+    }
+    return out;
+  }
+}
+
+export function intersect(a: Uint8Array, b: Uint8Array): Uint8Array {
+  const out = new Uint8Array(a.length);
+  for (let i = 0; i < a.length; i++) out[i] = a[i] & b[i];
+  return out;
+}
+
+export function countBits(bits: Uint8Array): number {
+  let n = 0;
+  for (let b of bits) {
+    while (b) {
+      b &= b - 1;
+      n++;
+    }
+  }
+  return n;
+}
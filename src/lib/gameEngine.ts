@@ -69,7 +69,7 @@ export function validate(player: CricketPlayer, category: GridCategory): boolean
 
 // Split combo key like "team:MI+country:India" into ["team:MI", "country:India"]
 // Handles stat keys like "stat:totalWickets>=300"
-function splitCombo(combo: string): string[] {
+export function splitCombo(combo: string): string[] {
   const parts: string[] = [];
   const depth = 0;
   let current = "";
@@ -0,0 +1,126 @@
+/**
+ * Decoder for players.bin — the compact columnar twin of players.json
+ * written by scripts/collect_data.py (see encode_players_bin there).
+ *
+ * Every integer is an unsigned LEB128 varint unless noted:
+ *
+ *   file     "CBPL"  version:u8  P  strings  C  column × C
+ *   strings  n  (byte length, UTF-8 bytes) × n
+ *   column   name:str  kind:u8  body      (name is a dotted path: "stats.testRuns")
+ *   str      index into strings
+ *
+ *   1 STRING     P × (str + 1), 0 = field absent
+ *   2 INT32      zero-pad to a 4-byte file offset, then P × int32 LE
+ *   3 BITSET     n  str × n (names),  P × mask; bit i set → names[i]
+ *   4 STRLIST    P × (count, str × count)
+ *   5 ADJACENCY  P × rank (player's position in sorted id order), then
+ *                P × (count, first rank, rank deltas …); ranks decode to ids
+ */
+import type { CricketPlayer } from "@/types/game";
+
+const MAGIC = "CBPL";
+const VERSION = 1;
+
+const STRING = 1;
+const INT32 = 2;
+const BITSET = 3;
+const STRLIST = 4;
+const ADJACENCY = 5;
+
+type Value = string | number | string[] | undefined;
+
+export function decodePlayersBin(buffer: ArrayBuffer): CricketPlayer[] {
+  const bytes = new Uint8Array(buffer);
+  const view = new DataView(buffer);
+  let pos = 0;
+
+  const varint = (): number => {
+    let n = 0;
+    let shift = 0;
+    for (;;) {
+      const b = bytes[pos++];
+      n += (b & 0x7f) * 2 ** shift;
+      if (b < 0x80) return n;
+      shift += 7;
+    }
+  };
+
+  if (String.fromCharCode(...bytes.subarray(0, 4)) !== MAGIC || bytes[4] !== VERSION) {
+    throw new Error("Not a players.bin v1 file");
+  }
+  pos = 5;
+  const count = varint();
+
+  const utf8 = new TextDecoder();
+  const strings: string[] = new Array(varint());
+  for (let i = 0; i < strings.length; i++) {
+    const size = varint();
+    strings[i] = utf8.decode(bytes.subarray(pos, pos + size));
+    pos += size;
+  }
+
+  const records: Record<string, unknown>[] = Array.from({ length: count }, () => ({}));
+  // Adjacency lists hold ranks until every column (including "id") is read
+  const adjacency: { ranks: number[]; lists: (number | string)[][] }[] = [];
+
+  const columns = varint();
+  for (let c = 0; c < columns; c++) {
+    const path = strings[varint()].split(".");
+    const kind = bytes[pos++];
+    const values: Value[] = new Array(count);
+
+    if (kind === STRING) {
+      for (let i = 0; i < count; i++) {
+        const s = varint();
+        values[i] = s ? strings[s - 1] : undefined;
+      }
+    } else if (kind === INT32) {
+      pos += (4 - (pos % 4)) % 4;
+      for (let i = 0; i < count; i++) values[i] = view.getInt32(pos + 4 * i, true);
+      pos += 4 * count;
+    } else if (kind === BITSET) {
+      const names = Array.from({ length: varint() }, () => strings[varint()]);
+      for (let i = 0; i < count; i++) {
+        const mask = varint();
+        values[i] = names.filter((_, bit) => (mask >>> bit) & 1);
+      }
+    } else if (kind === STRLIST) {
+      for (let i = 0; i < count; i++) {
+        values[i] = Array.from({ length: varint() }, () => strings[varint()]);
+      }
+    } else if (kind === ADJACENCY) {
+      const ranks = Array.from({ length: count }, () => varint());
+      const lists: (number | string)[][] = [];
+      for (let i = 0; i < count; i++) {
+        const list: number[] = new Array(varint());
+        let rank = 0;
+        for (let k = 0; k < list.length; k++) list[k] = rank += varint();
+        lists.push(list);
+        values[i] = list as unknown as string[];
+      }
+      adjacency.push({ ranks, lists });
+    } else {
+      throw new Error(`players.bin: unknown column kind ${kind}`);
+    }
+
+    const leaf = path[path.length - 1];
+    for (let i = 0; i < count; i++) {
+      if (values[i] === undefined) continue;
+      let target = records[i];
+      for (let k = 0; k < path.length - 1; k++) {
+        target = (target[path[k]] ??= {}) as Record<string, unknown>;
+      }
+      target[leaf] = values[i];
+    }
+  }
+
+  for (const { ranks, lists } of adjacency) {
+    const byRank: string[] = new Array(count);
+    ranks.forEach((rank, i) => (byRank[rank] = records[i].id as string));
+    for (const list of lists) {
+      for (let k = 0; k < list.length; k++) list[k] = byRank[list[k] as number];
+    }
+  }
+
+  return records as unknown as CricketPlayer[];
+}
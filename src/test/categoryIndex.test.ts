@@ -0,0 +1,48 @@
+import { describe, it, expect } from "vitest";
+import { readFileSync } from "fs";
+import path from "path";
+import { CategoryIndex, countBits, intersect } from "../lib/categoryIndex";
+import { validate } from "../lib/gameEngine";
+import { FULL_CATEGORY_POOL, IPL_CATEGORY_POOL } from "../data/categories";
+import type { CricketPlayer, GridCategory } from "../types/game";
+
+// index.sample.json is players.sample.json run through index_payload in
+// scripts/build_bundles.py; regenerate both together.
+const fixtures = path.join(__dirname, "fixtures");
+const players: CricketPlayer[] = JSON.parse(
+  readFileSync(path.join(fixtures, "players.sample.json"), "utf-8")
+);
+const index = new CategoryIndex(
+  JSON.parse(readFileSync(path.join(fixtures, "index.sample.json"), "utf-8"))
+);
+
+function scan(key: string): string[] {
+  const cat = { validatorKey: key } as GridCategory;
+  return players.filter((p) => validate(p, cat)).map((p) => p.id);
+}
+
+describe("CategoryIndex", () => {
+  it("agrees with validate() on every pooled category", () => {
+    for (const cat of [...FULL_CATEGORY_POOL, ...IPL_CATEGORY_POOL]) {
+      const bits = index.members(cat.validatorKey);
+      expect(bits, cat.validatorKey).not.toBeNull();
+      expect(index.toIds(bits!), cat.validatorKey).toEqual(scan(cat.validatorKey));
+    }
+  });
+
+  it("answers unindexed stat thresholds and combos", () => {
+    for (const key of ["stat:iplRuns>=1234", "stat:testWickets>=0", "combo:country:India+stat:odiRuns>=500"]) {
+      expect(index.toIds(index.members(key)!), key).toEqual(scan(key));
+    }
+    expect(index.members("stat:notAStat>=1")).toBeNull();
+  });
+
+  it("counts and intersects bitmaps", () => {
+    const india = index.members("country:India")!;
+    const batters = index.members("role:Batsman")!;
+    expect(countBits(india)).toBe(scan("country:India").length);
+    expect(index.toIds(intersect(india, batters))).toEqual(
+      scan("combo:country:India+role:Batsman")
+    );
+  });
+});
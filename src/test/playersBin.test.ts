@@ -0,0 +1,34 @@
+import { describe, it, expect } from "vitest";
+import { readFileSync } from "fs";
+import path from "path";
+import { decodePlayersBin } from "../lib/playersBin";
+
+// players.sample.bin is players.sample.json run through encode_players_bin
+// in scripts/collect_data.py; regenerate both together.
+const fixtures = path.join(__dirname, "fixtures");
+
+function loadBin(): ArrayBuffer {
+  const buf = readFileSync(path.join(fixtures, "players.sample.bin"));
+  return buf.buffer.slice(buf.byteOffset, buf.byteOffset + buf.byteLength);
+}
+
+describe("decodePlayersBin", () => {
+  const expected = JSON.parse(readFileSync(path.join(fixtures, "players.sample.json"), "utf-8"));
+
+  it("round-trips to the JSON records", () => {
+    const players = decodePlayersBin(loadBin());
+    expect(players).toEqual(expected);
+    // Same key order too, so JSON.stringify output is identical
+    expect(JSON.stringify(players)).toBe(JSON.stringify(expected));
+  });
+
+  it("leaves absent optional fields out", () => {
+    const players = decodePlayersBin(loadBin());
+    expect("headshot_url" in players[3]).toBe(false);
+    expect(players[0].headshot_url).toBe(expected[0].headshot_url);
+  });
+
+  it("rejects other files", () => {
+    expect(() => decodePlayersBin(new TextEncoder().encode("[{}]").buffer)).toThrow();
+  });
+});
@@ -10,10 +10,20 @@ export interface CricketPlayer {
   stats: PlayerStats;
   trophies: string[];
   teammates: string[]; // flat array of player IDs
-  headshot_url?: string; // Headshot image URL from Wikimedia Commons
+  headshot_url?: string; // Headshot image URL (local mirror JPEG once scripts/mirror_headshots.py has run)
+  headshot_source?: string; // Original headshot URL the mirror was made from
+  headshot_variants?: HeadshotVariant[]; // Mirrored sizes / formats of the headshot
   categories?: string[]; // Achievement categories (Captains, World Cup Winners, etc)
 }
 
+export interface HeadshotVariant {
+  url: string;
+  type: string; // image/avif | image/webp | image/jpeg
+  width: number;
+  height: number;
+  bytes: number;
+}
+
 export interface PlayerStats {
   testRuns: number;
   testWickets: number;